@@ -0,0 +1,92 @@
+# benchmarks/bench_ai_advisor.py
+# 로컬 대체 서버(OpenAI 호환, 스트리밍)를 띄워 AI 자문의 첫 토큰 지연과 초당 토큰 수를 측정합니다.
+#   python benchmarks/bench_ai_advisor.py [첫_토큰_지연_ms] [토큰_간격_ms]
+# 실제 서버로 재려면: SECUDECK_AI_BASE_URL / OPENAI_API_KEY를 설정하고 --real 옵션
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from ai_advisor import AnswerCache, SecurityAdvisor, compact_context
+
+ANSWER = ("시작프로그램에 새로 등록된 항목이 있다면 먼저 경로를 확인하세요. "
+          "모르는 프로그램이면 승인하지 말고 작업 관리자에서 시작프로그램을 끄는 것이 안전합니다. ") * 3
+
+
+class FakeChatHandler(BaseHTTPRequestHandler):
+    """/v1/chat/completions 스트리밍만 흉내 내는 대체 서버"""
+
+    first_delay = 0.2
+    token_delay = 0.01
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        time.sleep(self.first_delay)
+        self._send({"role": "assistant", "content": ""}, request["model"])
+        for word in ANSWER.split(" "):
+            self._send({"content": word + " "}, request["model"])
+            time.sleep(self.token_delay)
+        self._send({}, request["model"], finish="stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _send(self, delta, model, finish=None):
+        chunk = {"id": "chatcmpl-local", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                 "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(first_delay, token_delay):
+    FakeChatHandler.first_delay, FakeChatHandler.token_delay = first_delay, token_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def run(advisor, question, context):
+    text = "".join(advisor.ask(question, context))
+    stats = advisor.last_stats.snapshot()
+    source = "캐시" if stats["cached"] else "서버"
+    print(f"[{source}] {question!r}: 첫 토큰 {stats['first_token_ms']}ms  ·  {stats['tokens']}토큰  ·  "
+          f"{stats['tokens_per_sec']}토큰/초  ·  전체 {stats['elapsed'] * 1000:.0f}ms  ({len(text)}자)")
+
+
+def main(first_delay_ms=200, token_delay_ms=10, real=False):
+    server = None
+    if real:
+        base_url = None  # 환경변수 사용
+    else:
+        server, base_url = start_server(first_delay_ms / 1000, token_delay_ms / 1000)
+    context = compact_context(
+        startup=("WARNING", [{"name": "Updater", "change": "added", "path": r"C:\Users\me\AppData\upd.exe"}]),
+        scan={"scanned": True, "files_with_pii": 12, "matches": 40, "by_kind": {"rrn": 30, "phone": 10}},
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        advisor = SecurityAdvisor(base_url=base_url, cache=AnswerCache(os.path.join(tmp, "ai_cache.db")))
+        started = time.perf_counter()
+        advisor.warm_up()  # 앱에서는 AI 화면을 열 때 작업 스레드에서 미리 함
+        print(f"[준비] openai 불러오기 + 클라이언트 생성 {(time.perf_counter() - started) * 1000:.0f}ms")
+        # 앱과 같이 대화 기록을 지우지 않고 이어서 물음
+        run(advisor, "내 PC 안전한가요?", context)
+        run(advisor, "내 PC 안전한가요?", context)      # 같은 질문
+        run(advisor, "내 pc   안전한가요??", context)   # 거의 같은 질문
+        run(advisor, "Updater는 지워야 하나요?", context)  # 새 질문
+        run(advisor, "그럼 그건 어떻게 지워요?", context)  # 앞 대화를 가리키는 질문 (캐시를 나눔)
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--real"]
+    main(*(float(arg) for arg in args), real="--real" in sys.argv)
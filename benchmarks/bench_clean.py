@@ -0,0 +1,52 @@
+# benchmarks/bench_clean.py
+# 중복/임시 파일이 섞인 가짜 트리로 청소 분석 시간을 측정합니다. (처음 vs 해시 캐시 재사용)
+#   python benchmarks/bench_clean.py [파일_수]
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from clean_analyzer import CleanAnalyzer
+
+
+def build_tree(root, file_count, seed=0):
+    rng = random.Random(seed)
+    originals = []
+    for i in range(file_count):
+        folder = os.path.join(root, f"dir{i % 40}", f"sub{i % 5}")
+        os.makedirs(folder, exist_ok=True)
+        roll = rng.random()
+        if roll < 0.1 and originals:
+            data = rng.choice(originals)           # 중복 파일
+            name = f"copy{i}.bin"
+        elif roll < 0.15:
+            data = os.urandom(rng.randint(10, 4096))  # 임시 파일
+            name = f"~$draft{i}.tmp"
+        else:
+            # 크기가 같고 내용만 다른 파일도 섞어서 부분 해시 단계가 일하게 함
+            size = rng.choice([64 * 1024, 256 * 1024, 1024 * 1024, rng.randint(70_000, 2_000_000)])
+            data = os.urandom(size)
+            name = f"file{i}.bin"
+            if len(originals) < 50:
+                originals.append(data)
+        with open(os.path.join(folder, name), "wb") as f:
+            f.write(data)
+
+
+def main(file_count=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "tree")
+        build_tree(tree, file_count)
+        analyzer = CleanAnalyzer(cache_path=os.path.join(tmp, "clean_cache.db"))
+        for label in ("cold", "warm"):
+            summary = [payload for kind, payload in analyzer.analyze([tree]) if kind == "done"][0]
+            stats = summary["stats"]
+            print(f"[{label}] {stats['elapsed']:.3f}초  ·  파일 {stats['files']}개 ({summary['total_size'] / 1e6:.0f}MB)  ·  "
+                  f"해시로 읽은 양 {stats['hashed_bytes'] / 1e6:.1f}MB  ·  캐시 재사용 {stats['cached_hashes']}건  ·  "
+                  f"중복 묶음 {summary['duplicate_groups']}개")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
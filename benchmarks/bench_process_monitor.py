@@ -0,0 +1,76 @@
+# benchmarks/bench_process_monitor.py
+# 프로세스 500개 이상인 상태에서 1초 주기 감시의 CPU 사용률을 측정합니다. (목표: 1% 미만)
+#   python benchmarks/bench_process_monitor.py [추가로_띄울_프로세스_수] [측정_초]
+# 측정 중에도 일부 프로세스를 끝내고 새로 띄워 차이 계산이 실제로 일하게 합니다.
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import psutil
+from process_monitor import ProcessWatcher
+
+
+def spawn():
+    # 가벼운 대기 프로세스 (리눅스는 sleep, 없으면 파이썬)
+    sleep = shutil.which("sleep")
+    command = [sleep, "600"] if sleep else [sys.executable, "-c", "import time; time.sleep(600)"]
+    return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main(extra=500, seconds=20):
+    procs = [spawn() for _ in range(extra)]
+    rng = random.Random(0)
+    try:
+        print(f"실행 중인 프로세스 {len(psutil.pids()):,}개")
+        watcher = ProcessWatcher(interval=1.0)
+        events = {"new": 0, "exited": 0}
+
+        def on_change(diff, _):
+            events["new"] += len(diff["new"])
+            events["exited"] += len(diff["exited"])
+
+        # 첫 읽기(모든 프로세스를 한 번씩 읽음)는 시작할 때 한 번뿐이므로 따로 잼
+        watcher.sample()
+        initial = watcher.cpu_time
+        print(f"첫 읽기 {initial * 1000:.0f}ms")
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        watcher.start(on_change)
+        for _ in range(seconds):
+            time.sleep(1)
+            # 매초 몇 개는 끝내고 새로 띄움
+            for _ in range(5):
+                victim = procs.pop(rng.randrange(len(procs)))
+                victim.kill()
+                victim.wait()
+                procs.append(spawn())
+        watcher.stop()
+        wall = time.perf_counter() - wall_started
+        # 벤치마크 자체(프로세스 생성/종료)에 쓴 CPU가 섞이지 않도록 감시 스레드의 CPU 시간만 따로 봄
+        summary = watcher.summary()
+        steady, samples = watcher.cpu_time - initial, watcher.samples - 1
+        print(f"{samples}회 읽기, {wall:.1f}초: 감시 CPU {steady * 1000:.0f}ms = {steady / wall * 100:.2f}%  "
+              f"(회당 {steady / max(1, samples) * 1000:.1f}ms, 첫 읽기 포함 {summary['cpu_percent']:.2f}%)")
+        print(f"감지한 새 프로세스 {events['new']}개, 종료 {events['exited']}개  ·  리슨 포트 {summary['listening']}개  ·  "
+              f"프로세스 전체(벤치 포함) CPU {(time.process_time() - cpu_started) / wall * 100:.2f}%")
+
+        # 비교: 매번 전체 목록을 다시 만드는 단순한 방식
+        started = time.process_time()
+        for _ in range(5):
+            [p.info for p in psutil.process_iter(["pid", "name", "exe", "create_time"])]
+            psutil.net_connections(kind="inet")
+        naive = (time.process_time() - started) / 5
+        print(f"단순 방식(매번 전체 목록 + 연결): 회당 {naive * 1000:.1f}ms = 1초 주기면 약 {naive * 100:.1f}%")
+    finally:
+        for proc in procs:
+            proc.kill()
+        for proc in procs:
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
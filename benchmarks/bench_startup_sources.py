@@ -0,0 +1,45 @@
+# benchmarks/bench_startup_sources.py
+# 가짜 소스에 대량(기본 1만 개)의 시작 프로그램을 넣고 검사 비용을 측정합니다. (리눅스에서 실행 가능)
+#   python benchmarks/bench_startup_sources.py [항목_수]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from startup_checker import StartupMonitor
+from startup_sources import FakeStartupSource
+
+
+def timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main(entry_count=10000, source_count=8):
+    sources = [FakeStartupSource(f"Fake{s}") for s in range(source_count)]
+    for i in range(entry_count):
+        sources[i % source_count].set(f"Program_{i}", rf"C:\Program Files\Vendor{i}\app{i}.exe --minimized")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 작업 폴더의 실제 스냅샷/허용 목록을 건드리지 않도록 모두 임시 폴더 안으로
+        monitor = StartupMonitor(db_file=os.path.join(tmp, "startup.db"), sources=sources,
+                                 legacy_file=os.path.join(tmp, "none.json"), reputation_file=os.path.join(tmp, "reputation.txt"))
+
+        first_ms, (status, _) = timed(monitor.check_for_changes)
+        print(f"최초 검사 ({entry_count}개)       : {first_ms:8.2f}ms  [{status}]")
+        full_ms, (status, _) = timed(monitor.check_for_changes)
+        print(f"두 번째 검사                    : {full_ms:8.2f}ms  [{status}]")
+        warm_ms, (status, _) = timed(monitor.check_for_changes, repeat=1000)
+        print(f"변동 없음 (1000회 평균)         : {warm_ms:8.4f}ms  [{status}]")
+
+        sources[0].set("MyTestVirus", r"C:\Windows\System32\calc.exe")
+        changed_ms, (status, items) = timed(monitor.check_for_changes)
+        print(f"소스 1개 변경                   : {changed_ms:8.2f}ms  [{status}, {len(items)}개]")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,132 @@
+# benchmarks/bench_virtual_list.py
+# 결과 목록 10만 줄을 스트리밍으로 넣었을 때의 처리 시간과 메모리를 측정합니다.
+#   python benchmarks/bench_virtual_list.py [줄_수]
+# 화면(디스플레이)이 있으면 실제 위젯 그리기 시간도 재고, 예전 방식(줄마다 위젯 생성)과 비교합니다.
+# 리눅스 서버에서는 xvfb-run python benchmarks/bench_virtual_list.py 로 실행하세요.
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from list_model import ListModel
+
+KINDS = ["rrn", "phone", "card", "email", "password"]
+BATCH = 500        # 스캔 작업 스레드가 0.2초마다 보내는 정도의 묶음
+NAIVE_ROWS = 2000  # 예전 방식은 이 정도만 재고 비례해서 추정
+
+
+def make_results(count, seed=0):
+    rng = random.Random(seed)
+    return [{"path": f"C:\\Users\\me\\Documents\\folder{i % 300}\\file{i}.txt",
+             "counts": {kind: rng.randint(1, 20) for kind in rng.sample(KINDS, rng.randint(1, 3))}}
+            for i in range(count)]
+
+
+def new_model():
+    return ListModel(key=lambda r: r["path"], sort_key=lambda r: sum(r["counts"].values()), reverse=True)
+
+
+def fill(model, results):
+    for i in range(0, len(results), BATCH):
+        model.extend(results[i:i + BATCH])
+
+
+def bench_model(results):
+    model = new_model()
+    started = time.perf_counter()
+    fill(model, results)
+    append = time.perf_counter() - started
+
+    # 메모리는 따로 한 번 더 채우면서 측정 (tracemalloc은 시간 측정을 느리게 하므로)
+    tracemalloc.start()
+    fill(new_model(), results)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    model.set_filter(lambda r: "card" in r["counts"])
+    filtered = time.perf_counter() - started
+    started = time.perf_counter()
+    model.set_sort(lambda r: r["path"])
+    resorted = time.perf_counter() - started
+    started = time.perf_counter()
+    window = [model[i] for i in range(0, len(model), max(1, len(model) // 1000))]
+    lookup = (time.perf_counter() - started) / max(1, len(window))
+
+    print(f"[모델] {len(results):,}줄 추가 (정렬 유지, {BATCH}개씩) {append * 1000:.0f}ms  ·  "
+          f"필터 {filtered * 1000:.0f}ms  ·  다시 정렬 {resorted * 1000:.0f}ms  ·  "
+          f"줄 조회 {lookup * 1e6:.1f}µs  ·  모델 메모리 {peak / 1e6:.1f}MB (항목 제외)")
+
+
+def bench_widget(results):
+    try:
+        import customtkinter as ctk
+        from virtual_list import VirtualList
+        root = ctk.CTk()
+    except Exception as e:  # customtkinter 미설치, 디스플레이 없음 등
+        print(f"[위젯] 건너뜀: {e}")
+        return
+    root.geometry("900x650")
+
+    def make_row(parent):
+        row = ctk.CTkFrame(parent, height=52)
+        row.lbl = ctk.CTkLabel(row, text="", anchor="w", justify="left")
+        row.lbl.pack(side="left", padx=10)
+        row.btn = ctk.CTkButton(row, text="삭제", width=60)
+        row.btn.pack(side="right", padx=5)
+        return row
+
+    def bind_row(row, result):
+        row.lbl.configure(text=f"{result['path']}\n({result['counts']})")
+
+    # 1. 가상 리스트: 스트리밍으로 넣고 idle마다 그리기
+    tracemalloc.start()
+    vlist = VirtualList(root, make_row, bind_row, model=new_model(), row_height=56, label_text="검출된 파일 목록")
+    vlist.pack(fill="both", expand=True)
+    root.update()
+    started = time.perf_counter()
+    first_paint = None
+    for i in range(0, len(results), BATCH):
+        vlist.extend(results[i:i + BATCH])
+        root.update()
+        if first_paint is None:
+            first_paint = time.perf_counter() - started
+    total = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(300):
+        vlist.yview("scroll", 3, "units")
+        root.update()
+    scroll = (time.perf_counter() - started) / 300
+    print(f"[위젯] 가상 리스트 {len(results):,}줄: 첫 표시 {first_paint * 1000:.0f}ms  ·  전체 {total * 1000:.0f}ms  ·  "
+          f"스크롤 1회 {scroll * 1000:.1f}ms  ·  행 위젯 {len(vlist._rows)}개  ·  최대 메모리 {peak / 1e6:.1f}MB")
+    vlist.destroy()
+
+    # 2. 예전 방식: 줄마다 CTkFrame + 라벨 + 버튼
+    count = min(NAIVE_ROWS, len(results))
+    scroll_frame = ctk.CTkScrollableFrame(root)
+    scroll_frame.pack(fill="both", expand=True)
+    started = time.perf_counter()
+    for result in results[:count]:
+        row = make_row(scroll_frame)
+        bind_row(row, result)
+        row.pack(fill="x", pady=5)
+    root.update()
+    naive = time.perf_counter() - started
+    print(f"[위젯] 예전 방식 {count:,}줄: {naive * 1000:.0f}ms  ->  {len(results):,}줄이면 약 {naive * len(results) / count:.0f}초")
+    root.destroy()
+
+
+def main(count=100_000):
+    results = make_results(count)
+    bench_model(results)
+    bench_widget(results)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
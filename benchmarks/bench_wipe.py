@@ -0,0 +1,50 @@
+# benchmarks/bench_wipe.py
+# 블록 크기/동시 작업 수에 따른 덮어쓰기 처리량(MB/s)을 측정합니다.
+# tmpfs(/dev/shm)가 있으면 거기서, 없으면 임시 폴더에서 실행합니다. (루프 파일 경로를 인자로 줘도 됨)
+#   python benchmarks/bench_wipe.py [대상_폴더] [파일_크기_MB]
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from wipe_engine import WipeJob
+
+BLOCK_SIZES = [64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024]
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def make_file(folder, name, size_mb):
+    path = os.path.join(folder, name)
+    chunk = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(chunk)
+    return path
+
+
+def wipe_speed(paths, scheme, block_size, workers):
+    job = WipeJob(paths, scheme=scheme, block_size=block_size, workers=workers)
+    return job.run()["mb_per_sec"]
+
+
+def main(base=None, size_mb=128):
+    if base is None:
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    with tempfile.TemporaryDirectory(dir=base) as tmp:
+        print(f"대상: {tmp}  (파일 {size_mb}MB)")
+        print("블록 크기별 (1파일, zero / random)")
+        for block_size in BLOCK_SIZES:
+            speeds = [wipe_speed([make_file(tmp, "single.bin", size_mb)], scheme, block_size, 1)
+                      for scheme in ("zero", "random")]
+            print(f"  {block_size // 1024:>6}KB : {speeds[0]:8.1f} MB/s   {speeds[1]:8.1f} MB/s")
+
+        print("동시 작업 수별 (8파일, zero, 1MB 블록)")
+        per_file = max(1, size_mb // 8)
+        for workers in WORKER_COUNTS:
+            paths = [make_file(tmp, f"multi{i}.bin", per_file) for i in range(8)]
+            print(f"  작업 {workers}개 : {wipe_speed(paths, 'zero', 1024 * 1024, workers):8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] or None if len(sys.argv) > 1 else None, int(sys.argv[2]) if len(sys.argv) > 2 else 128)
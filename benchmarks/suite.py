@@ -0,0 +1,298 @@
+# benchmarks/suite.py
+# 모든 엔진을 가짜 데이터로 한 번에 측정하고 JSON 기준값과 비교합니다. (리눅스에서 실행)
+#   python benchmarks/suite.py                      # 측정 (결과: benchmarks/results/latest.json)
+#   python benchmarks/suite.py --save-baseline      # 이번 결과를 기준값으로 저장 (benchmarks/baselines/<호스트>.json)
+#   python benchmarks/suite.py --compare [기준.json] [--tolerance 0.2]   # 기준보다 나빠진 항목이 있으면 종료 코드 1
+#   python benchmarks/suite.py --only startup,scan --quick --repeat 1
+# GUI 첫 화면 시간은 customtkinter와 화면(DISPLAY 또는 xvfb-run)이 있을 때만 잽니다.
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, "..", "src")
+sys.path.insert(0, SRC)
+sys.path.insert(0, HERE)
+
+import bench_clean
+import bench_pii_scan
+import bench_wipe
+
+GROUPS = ("startup", "scan", "clean", "wipe", "gui")
+SIZES = {
+    "full": {"startup_entries": 5000, "scan_files": 5000, "large_mb": 64, "clean_files": 2000, "wipe_mb": 256},
+    "quick": {"startup_entries": 1000, "scan_files": 1000, "large_mb": 16, "clean_files": 500, "wipe_mb": 64},
+}
+DEFAULT_TOLERANCE = 0.2
+PAINT_PROBE_ENV = "SECUDECK_PAINT_PROBE"  # main.py와 같은 이름
+
+
+class Results:
+    """측정값 모음. better는 "lower"/"higher"/None(비교하지 않는 참고값)"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.skipped = {}
+
+    def add(self, name, value, unit, better="lower", tolerance=None):
+        metric = {"value": round(value, 3), "unit": unit, "better": better}
+        if tolerance is not None:
+            metric["tolerance"] = tolerance  # 원래 흔들림이 큰 값은 허용 폭을 따로 둠
+        old = self.metrics.get(name)
+        # 여러 번 잰 경우 가장 좋은 값만 남김 (다른 프로세스 때문에 튄 값을 걸러냄)
+        if old is None or (better == "lower" and value < old["value"]) or (better == "higher" and value > old["value"]):
+            self.metrics[name] = metric
+
+    def skip(self, group, reason):
+        self.skipped[group] = reason
+
+
+def timed_ms(func, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) * 1000 / repeat, result
+
+
+# --- 측정 ---
+
+def bench_startup(results, tmp, size):
+    """가짜 소스 8개에 수천 개 항목 (실행 파일도 실제로 만들어 해시까지 포함)"""
+    from startup_checker import StartupMonitor
+    from startup_sources import FakeStartupSource
+
+    exe_dir = os.path.join(tmp, "exes")
+    os.makedirs(exe_dir)
+    sources = [FakeStartupSource(f"Fake{s}") for s in range(8)]
+    exes = []
+    for i in range(size["startup_entries"]):
+        path = os.path.join(exe_dir, f"app{i}.exe")
+        with open(path, "wb") as f:
+            f.write(b"MZ" + i.to_bytes(4, "little") * 4096)
+        exes.append(path)
+        sources[i % 8].set(f"Program_{i}", f'"{path}" --minimized')
+    monitor = StartupMonitor(db_file=os.path.join(tmp, "startup.db"), sources=sources,
+                             legacy_file=os.path.join(tmp, "none.json"), reputation_file=os.path.join(tmp, "reputation.txt"))
+
+    first_ms, (status, _) = timed_ms(monitor.check_for_changes)
+    assert status == "FIRST_RUN", status
+    results.add("startup_first_check_ms", first_ms, "ms")
+    unchanged_ms, (status, _) = timed_ms(monitor.check_for_changes, repeat=20)
+    results.add("startup_unchanged_ms", unchanged_ms, "ms", tolerance=0.5)
+
+    sources[0].set("MyTestVirus", f'"{exes[0]}"')  # docs/developer/startup_test.reg와 같은 항목
+    diff_ms, (status, items) = timed_ms(monitor.check_for_changes)
+    assert status == "WARNING" and len(items) == 1, (status, len(items))
+    results.add("startup_diff_ms", diff_ms, "ms")
+    monitor.approve_programs(items)
+
+    with open(exes[5], "ab") as f:
+        f.write(b"patched")
+    swap_ms, (status, items) = timed_ms(monitor.check_for_changes)
+    assert status == "WARNING" and [item["change"] for item in items] == ["binary"], (status, items)
+    results.add("startup_binary_swap_ms", swap_ms, "ms")
+
+
+def plant_large_files(root, total_mb):
+    """큰 텍스트 파일 두 개 (개인정보는 맨 끝에 있어 끝까지 읽어야 찾음)"""
+    folder = os.path.join(root, "large")
+    os.makedirs(folder, exist_ok=True)
+    line = bench_pii_scan._FILLER.encode("utf-8")
+    block = line * (1024 * 1024 // len(line))
+    for i in range(2):
+        with open(os.path.join(folder, f"export{i}.csv"), "wb") as f:
+            for _ in range(max(1, total_mb // 2)):
+                f.write(block)
+            f.write(bench_pii_scan._PLANTED[i].encode("utf-8"))
+    return 2
+
+
+def bench_scan(results, tmp, size):
+    from pii_scanner import PIIScanner
+    from scan_index import ScanIndex
+
+    tree = os.path.join(tmp, "tree")
+    planted = bench_pii_scan.build_tree(tree, size["scan_files"])
+    planted += plant_large_files(tree, size["large_mb"])
+    index = ScanIndex(os.path.join(tmp, "scan_index.db"))
+
+    scanner = PIIScanner()
+    found = sum(1 for result in scanner.scan([tree], index=index) if result["counts"])
+    stats = scanner.stats.snapshot()
+    results.add("scan_cold_s", stats["elapsed"], "s")
+    results.add("scan_files_per_sec", stats["files_per_sec"], "files/s", better="higher")
+    results.add("scan_mb_per_sec", stats["mb_per_sec"], "MB/s", better="higher")
+    results.add("scan_missed_files", planted - found, "files")  # 0이어야 함
+
+    scanner = PIIScanner()
+    sum(1 for _ in scanner.scan([tree], index=index))
+    results.add("scan_warm_s", scanner.stats.elapsed, "s")
+
+
+def bench_clean_analysis(results, tmp, size):
+    from clean_analyzer import CleanAnalyzer
+
+    tree = os.path.join(tmp, "tree")
+    bench_clean.build_tree(tree, size["clean_files"])
+    plant_large_files(tree, size["large_mb"])
+    analyzer = CleanAnalyzer(cache_path=os.path.join(tmp, "clean_cache.db"))
+    for label in ("cold", "warm"):
+        summary = [payload for kind, payload in analyzer.analyze([tree]) if kind == "done"][0]
+        results.add(f"clean_{label}_s", summary["stats"]["elapsed"], "s")
+    results.add("clean_duplicate_groups", summary["duplicate_groups"], "groups", better=None)
+
+
+def bench_wipe_throughput(results, tmp, size):
+    # tmpfs에서 재면 디스크가 아니라 덮어쓰기 코드 자체의 속도를 봄
+    from wipe_engine import WipeJob
+
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tmp
+    with tempfile.TemporaryDirectory(dir=base) as target:
+        per_file = max(1, size["wipe_mb"] // 8)
+        for scheme in ("zero", "random"):
+            paths = [bench_wipe.make_file(target, f"{scheme}{i}.bin", per_file) for i in range(8)]
+            snap = WipeJob(paths, scheme=scheme).run()
+            assert snap["done"] == len(paths), snap
+            results.add(f"wipe_{scheme}_mb_per_sec", snap["mb_per_sec"], "MB/s", better="higher")
+
+
+def bench_gui(results, tmp, size):
+    """main.py를 새 프로세스로 띄워 첫 화면까지 걸린 시간 (빈 작업 폴더 = 처음 실행하는 PC)"""
+    if importlib.util.find_spec("customtkinter") is None:
+        return "customtkinter가 설치되어 있지 않음"
+    command = [sys.executable, os.path.join(SRC, "main.py")]
+    if not os.environ.get("DISPLAY"):
+        xvfb = shutil.which("xvfb-run")
+        if xvfb is None:
+            return "화면(DISPLAY)과 xvfb-run이 없음"
+        command = [xvfb, "-a"] + command
+    env = dict(os.environ, **{PAINT_PROBE_ENV: "1"})
+    proc = subprocess.run(command, cwd=tmp, env=env, capture_output=True, text=True, timeout=120)
+    for line in proc.stdout.splitlines():
+        if line.startswith(PAINT_PROBE_ENV + " "):
+            probe = json.loads(line[len(PAINT_PROBE_ENV) + 1:])
+            results.add("gui_first_paint_ms", probe["first_paint_ms"], "ms")
+            results.add("gui_import_ms", probe["totals"].get("import", 0.0), "ms")
+            return None
+    return f"측정값을 받지 못함 (종료 코드 {proc.returncode}): {proc.stderr.strip()[-300:]}"
+
+
+BENCHES = {"startup": bench_startup, "scan": bench_scan, "clean": bench_clean_analysis,
+           "wipe": bench_wipe_throughput, "gui": bench_gui}
+
+
+def run_suite(groups, size, repeat):
+    results = Results()
+    for group in groups:
+        for _ in range(1 if group == "gui" else repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                started = time.perf_counter()
+                reason = BENCHES[group](results, tmp, size)
+                if reason:
+                    results.skip(group, reason)
+                    print(f"[{group}] 건너뜀: {reason}")
+                    break
+                print(f"[{group}] {time.perf_counter() - started:.1f}초")
+    return results
+
+
+# --- 저장 / 비교 ---
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def to_document(results, args):
+    return {
+        "meta": {"host": socket.gethostname(), "platform": platform.platform(), "python": platform.python_version(),
+                 "cpu_count": os.cpu_count(), "commit": git_commit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "size": "quick" if args.quick else "full", "repeat": args.repeat},
+        "metrics": results.metrics,
+        "skipped": results.skipped,
+    }
+
+
+def write_json(path, document):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    print(f"저장: {path}")
+
+
+def compare(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """기준보다 허용 폭 이상 나빠진 항목 이름 목록을 반환하고 비교표를 출력합니다."""
+    if baseline["meta"].get("size") != current["meta"].get("size"):
+        print(f"주의: 데이터 크기가 다름 (기준 {baseline['meta'].get('size')}, 지금 {current['meta'].get('size')})")
+    if baseline["meta"].get("host") != current["meta"].get("host"):
+        print(f"주의: 다른 PC의 기준값 ({baseline['meta'].get('host')})")
+    regressions = []
+    print(f"{'항목':<26}{'기준':>12}{'지금':>12}{'변화':>9}")
+    for name, metric in current["metrics"].items():
+        base = baseline["metrics"].get(name)
+        if base is None or metric["better"] is None:
+            continue
+        old, new = base["value"], metric["value"]
+        limit = metric.get("tolerance", tolerance)
+        if old == 0:
+            change = None
+            worse = new > 0 if metric["better"] == "lower" else False
+        else:
+            change = (new - old) / old
+            worse = change > limit if metric["better"] == "lower" else change < -limit
+        if worse:
+            regressions.append(name)
+        change_text = f"{change:+.1%}" if change is not None else "-"
+        print(f"{name:<26}{old:>12,.2f}{new:>12,.2f}{change_text:>9}  {metric['unit']}{'  << 나빠짐' if worse else ''}")
+    for name in baseline["metrics"].keys() - current["metrics"].keys():
+        print(f"{name:<26}  (이번에 측정 안 됨)")
+    return regressions
+
+
+def main(argv=None):
+    default_baseline = os.path.join(HERE, "baselines", f"{socket.gethostname()}.json")
+    parser = argparse.ArgumentParser(description="SecuDeck 성능 측정 모음")
+    parser.add_argument("--only", help=f"쉼표로 구분 ({','.join(GROUPS)})")
+    parser.add_argument("--quick", action="store_true", help="작은 데이터로 빠르게")
+    parser.add_argument("--repeat", type=int, default=3, help="그룹마다 반복해서 가장 좋은 값 사용 (기본 3)")
+    parser.add_argument("--output", default=os.path.join(HERE, "results", "latest.json"))
+    parser.add_argument("--save-baseline", nargs="?", const=default_baseline, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", const=default_baseline, metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용 폭 (기본 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    groups = args.only.split(",") if args.only else list(GROUPS)
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"알 수 없는 그룹: {', '.join(sorted(unknown))}")
+    results = run_suite(groups, SIZES["quick" if args.quick else "full"], max(1, args.repeat))
+    document = to_document(results, args)
+    for name, metric in document["metrics"].items():
+        print(f"  {name:<26}{metric['value']:>12,.2f} {metric['unit']}")
+    write_json(args.output, document)
+    if args.save_baseline:
+        write_json(args.save_baseline, document)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, document, args.tolerance)
+        if regressions:
+            print(f"성능이 나빠진 항목 {len(regressions)}개: {', '.join(regressions)}")
+            return 1
+        print("기준값 대비 나빠진 항목 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+# src/ai_advisor.py
+import difflib
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing
+
+DEFAULT_MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = (
+    "당신은 개인 PC 보안 도우미입니다. 사용자의 PC 상태 요약을 참고해 "
+    "초보자도 따라 할 수 있게 짧고 구체적으로 한국어로 답하세요."
+)
+
+# 환경변수로 접속 대상을 바꿀 수 있음 (로컬 대체 서버로 테스트할 때)
+#   SECUDECK_AI_BASE_URL=http://127.0.0.1:8000/v1  SECUDECK_AI_MODEL=...  OPENAI_API_KEY=...
+ENV_BASE_URL = "SECUDECK_AI_BASE_URL"
+ENV_MODEL = "SECUDECK_AI_MODEL"
+
+# 시작프로그램 변경 종류 -> 요약에 쓰는 이름
+CHANGE_LABELS = {"added": "새 항목", "modified": "경로 변경", "binary": "실행 파일 변경", "denied": "차단 목록"}
+
+# 앞 대화를 가리키는 말. 이런 말이 든 질문만 앞 대화까지 캐시 키에 넣음
+FOLLOW_UP_MARKERS = ("그거", "그것", "그건", "그걸", "그게", "그럼", "그러면", "그래서", "방금", "아까", "위에서", "앞에서",
+                     "이전 답", "더 자세히")
+
+_PUNCT = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_question(text):
+    """비슷한 질문을 같은 것으로 보기 위해 대소문자/문장부호/공백 차이를 없앰"""
+    return _SPACES.sub(" ", _PUNCT.sub(" ", text.lower())).strip()
+
+
+def is_follow_up(question):
+    """앞 대화를 이어서 묻는 질문인지 (그럼/그거/방금 등). 아니면 앞 대화와 상관없이 같은 답을 재사용해도 됨"""
+    text = normalize_question(question)
+    return any(marker in text for marker in FOLLOW_UP_MARKERS)  # 조사가 붙으므로 부분 문자열로 찾음
+
+
+def compact_context(startup=None, scan=None, clean=None):
+    """
+    PC 상태를 짧은 텍스트 몇 줄로 묶습니다. (프롬프트에 넣는 용도)
+    원격 서버로 가는 내용이므로 건수와 종류만 넣습니다. (검출된 값, 프로그램 이름, 경로는 넣지 않음)
+      startup: (상태, 변경_항목_리스트)   scan: ScanIndex.summary()   clean: CleanAnalyzer.last_summary()
+    """
+    lines = []
+    if startup is not None:
+        status, items = startup
+        line = f"시작프로그램: {status}"
+        if items:
+            kinds = {}
+            for item in items:
+                label = CHANGE_LABELS["denied"] if item.get("reputation") == "deny" else CHANGE_LABELS.get(item["change"], "새 항목")
+                kinds[label] = kinds.get(label, 0) + 1
+            line += f", 승인 대기 {len(items)}개 (" + ", ".join(f"{label} {count}" for label, count in kinds.items()) + ")"
+        lines.append(line)
+    if scan is not None:
+        if not scan["scanned"]:
+            lines.append("개인정보 스캔: 아직 안 함")
+        else:
+            kinds = ", ".join(f"{kind} {count}" for kind, count in sorted(scan["by_kind"].items(), key=lambda kv: -kv[1]))
+            lines.append(f"개인정보 스캔: 노출 파일 {scan['files_with_pii']}개, {scan['matches']}건" + (f" ({kinds})" if kinds else ""))
+    if clean is not None:
+        top = sorted(clean["by_category"].items(), key=lambda kv: -kv[1])[:3]
+        detail = ", ".join(f"{category} {size / 1e6:.0f}MB" for category, size in top)
+        lines.append(f"디지털 청소: 정리 가능 {clean['reclaimable'] / 1e6:.0f}MB" + (f" ({detail})" if detail else ""))
+    return "\n".join(lines)
+
+
+class ConversationMemory:
+    """최근 대화만 유지 (턴 수와 글자 수 둘 다 제한해서 프롬프트가 끝없이 길어지지 않게)"""
+
+    def __init__(self, max_turns=6, max_chars=6000):
+        self.max_chars = max_chars
+        self.turns = deque(maxlen=max_turns)  # (질문, 답변)
+
+    def add(self, question, answer):
+        self.turns.append((question, answer))
+
+    def clear(self):
+        self.turns.clear()
+
+    def messages(self):
+        # 최근 턴부터 글자 수 한도 안에서 거꾸로 채움
+        selected, used = [], 0
+        for question, answer in reversed(self.turns):
+            used += len(question) + len(answer)
+            if used > self.max_chars and selected:
+                break
+            selected.append((question, answer))
+        messages = []
+        for question, answer in reversed(selected):
+            messages.append({"role": "user", "content": question})
+            messages.append({"role": "assistant", "content": answer})
+        return messages
+
+    def fingerprint(self):
+        """마지막 대화 턴의 해시 (이어지는 질문은 앞 대화에 따라 답이 달라지므로 캐시 키에 포함)"""
+        if not self.turns:
+            return ""
+        question, answer = self.turns[-1]
+        return hashlib.blake2b(f"{question}\0{answer}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key         TEXT PRIMARY KEY,
+    scope       TEXT NOT NULL,
+    question    TEXT NOT NULL,
+    answer      TEXT NOT NULL,
+    created     REAL NOT NULL,
+    last_used   REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS answers_scope ON answers (scope, last_used);
+CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used);
+"""
+
+
+class AnswerCache:
+    """
+    답변 캐시 (디스크, LRU + 유효기간).
+    같은 범위(모델 + PC 상태, 앞 대화를 이어서 묻는 질문이면 앞 대화까지)에서 같은 질문이면 그대로, 거의 같은 질문이면 유사도로 찾아 재사용합니다.
+    """
+
+    SIMILAR_CANDIDATES = 200  # 유사 질문을 찾을 때 비교할 최근 항목 수
+
+    def __init__(self, db_path="ai_cache.db", max_entries=500, ttl=7 * 24 * 3600, similarity=0.92):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_CACHE_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def scope(model, context, history_fingerprint=""):
+        return hashlib.blake2b(f"{model}\0{context}\0{history_fingerprint}".encode("utf-8"), digest_size=12).hexdigest()
+
+    @staticmethod
+    def _key(scope, question):
+        return hashlib.blake2b(f"{scope}\0{question}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, scope, question):
+        """저장된 답변 또는 None. 찾으면 최근 사용 시각을 갱신합니다."""
+        question = normalize_question(question)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT key, answer FROM answers WHERE key = ? AND created >= ?",
+                               (self._key(scope, question), now - self.ttl)).fetchone()
+            if row is None:
+                row = self._find_similar(conn, scope, question, now)
+            if row is None:
+                return None
+            conn.execute("UPDATE answers SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, row[0]))
+            return row[1]
+
+    def _find_similar(self, conn, scope, question, now):
+        candidates = conn.execute(
+            "SELECT key, answer, question FROM answers WHERE scope = ? AND created >= ? ORDER BY last_used DESC LIMIT ?",
+            (scope, now - self.ttl, self.SIMILAR_CANDIDATES),
+        ).fetchall()
+        matcher = difflib.SequenceMatcher(b=question, autojunk=False)
+        best, best_ratio = None, self.similarity
+        for key, answer, saved in candidates:
+            matcher.set_seq1(saved)
+            # 빠른 상한값부터 확인해서 명백히 다른 질문은 바로 건너뜀
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = (key, answer), ratio
+        return best
+
+    def put(self, scope, question, answer):
+        question = normalize_question(question)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO answers (key, scope, question, answer, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (self._key(scope, question), scope, question, answer, now, now),
+            )
+            # 유효기간이 지난 항목과, 오래 안 쓴 순서로 한도를 넘는 항목 정리
+            conn.execute("DELETE FROM answers WHERE created < ?", (now - self.ttl,))
+            conn.execute(
+                "DELETE FROM answers WHERE key IN (SELECT key FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM answers")
+
+
+class AdviceStats:
+    """답변 한 번의 속도 기록"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token = None  # 첫 토큰이 도착한 시각
+        self.finished = None
+        self.tokens = 0
+        self.cached = False
+
+    @property
+    def first_token_ms(self):
+        return (self.first_token - self.started) * 1000 if self.first_token else None
+
+    @property
+    def tokens_per_sec(self):
+        # 첫 토큰 이후 생성 속도 (대기 시간은 first_token_ms로 따로 봄)
+        if self.first_token is None or self.tokens < 2:
+            return 0.0
+        duration = (self.finished or time.perf_counter()) - self.first_token
+        return (self.tokens - 1) / duration if duration > 0 else 0.0
+
+    def snapshot(self):
+        first = self.first_token_ms
+        return {"cached": self.cached, "tokens": self.tokens,
+                "first_token_ms": round(first, 1) if first is not None else None,
+                "tokens_per_sec": round(self.tokens_per_sec, 1),
+                "elapsed": round((self.finished or time.perf_counter()) - self.started, 3)}
+
+
+class SecurityAdvisor:
+    """
+    AI 보안 자문. OpenAI 호환 API에 스트리밍으로 묻고, 답변 조각을 도착하는 대로 넘겨줍니다.
+    ask()는 작업 스레드에서 돌리는 제너레이터입니다. (UI 스레드를 막지 않도록)
+    """
+
+    def __init__(self, base_url=None, api_key=None, model=None, cache=None, memory=None, timeout=60):
+        self.base_url = base_url or os.environ.get(ENV_BASE_URL) or None  # None이면 OpenAI 기본 주소
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY") or ("local" if self.base_url else None)
+        self.model = model or os.environ.get(ENV_MODEL) or DEFAULT_MODEL
+        self.cache = cache
+        self.memory = memory or ConversationMemory()
+        self.timeout = timeout
+        self.last_stats = None
+        self._client = None
+        self._streams = set()  # 받고 있는 답변 스트림 (cancel()에서 닫음)
+        self._lock = threading.Lock()  # 대화 기록/스트림 목록 보호
+
+    def _get_client(self):
+        if self._client is None:
+            from openai import OpenAI  # 무거운 패키지라 처음 질문할 때 불러옴
+            self._client = OpenAI(base_url=self.base_url, api_key=self.api_key, timeout=self.timeout)
+        return self._client
+
+    def warm_up(self):
+        """openai 패키지를 불러오고 클라이언트를 만들어 둡니다. (첫 질문의 대기 시간을 줄이려고 미리 호출)"""
+        self._get_client()
+
+    def build_messages(self, question, context=""):
+        system = SYSTEM_PROMPT + (f"\n\n[현재 PC 상태]\n{context}" if context else "")
+        return [{"role": "system", "content": system}, *self.memory.messages(), {"role": "user", "content": question}]
+
+    def ask(self, question, context="", cancel_event=None):
+        """
+        답변 조각(str)을 순서대로 내보냅니다. 끝나면 self.last_stats에 속도 기록이 남습니다.
+        중간에 cancel_event가 켜지면 멈추고, 그때까지 받은 답변은 대화 기록/캐시에 넣지 않습니다.
+        답변이 멈춘 채 오지 않을 때도 바로 끝나도록 취소하는 쪽에서 cancel()을 함께 불러 주세요.
+        잠금은 캐시/대화 기록을 읽고 쓸 때만 잡습니다. (조각을 내보내는 동안에는 잡지 않음)
+        """
+        stats = self.last_stats = AdviceStats()
+        with self._lock:
+            # 앞 대화를 가리키는 질문만 앞 대화에 따라 캐시를 나눔 (단독 질문은 대화 중에 다시 물어도 재사용)
+            history = self.memory.fingerprint() if is_follow_up(question) else ""
+            scope = AnswerCache.scope(self.model, context, history)
+            cached = self.cache.get(scope, question) if self.cache else None
+            if cached is not None:
+                self.memory.add(question, cached)
+            else:
+                messages = self.build_messages(question, context)
+        if cached is not None:
+            stats.cached, stats.first_token, stats.tokens = True, time.perf_counter(), 1
+            stats.finished = stats.first_token
+            yield cached
+            return
+
+        parts = []
+        stream = self._get_client().chat.completions.create(model=self.model, messages=messages, stream=True)
+        with self._lock:
+            self._streams.add(stream)
+        try:
+            if self._is_cancelled(cancel_event):
+                return  # 연결하는 사이에 취소됨
+            for chunk in stream:
+                if self._is_cancelled(cancel_event):
+                    return
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if not text:
+                    continue
+                if stats.first_token is None:
+                    stats.first_token = time.perf_counter()
+                stats.tokens += 1  # 스트리밍 조각 하나가 대략 토큰 하나
+                parts.append(text)
+                yield text
+        except Exception:
+            if self._is_cancelled(cancel_event):
+                return  # cancel()이 스트림을 닫아서 난 오류
+            raise
+        finally:
+            stats.finished = time.perf_counter()
+            with self._lock:
+                self._streams.discard(stream)
+            stream.close()
+        if self._is_cancelled(cancel_event):
+            return  # 닫힌 스트림이 오류 없이 끝난 경우
+
+        answer = "".join(parts)
+        with self._lock:
+            self.memory.add(question, answer)
+        if self.cache and answer:
+            self.cache.put(scope, question, answer)
+
+    @staticmethod
+    def _is_cancelled(cancel_event):
+        return cancel_event is not None and cancel_event.is_set()
+
+    def cancel(self):
+        """받고 있는 답변 스트림을 모두 닫습니다. (다음 조각을 기다리며 멈춰 있는 ask()도 바로 끝남)"""
+        with self._lock:
+            streams = list(self._streams)
+        for stream in streams:
+            try:
+                stream.close()
+            except Exception as e:
+                print(f"AI 응답 스트림 닫기 오류: {e}")
@@ -0,0 +1,159 @@
+# src/binary_hasher.py
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from telemetry import TELEMETRY
+
+READ_BLOCK = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS binary_hashes (
+    path      TEXT PRIMARY KEY,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    sha256    TEXT NOT NULL,
+    hashed_at REAL NOT NULL
+);
+"""
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(READ_BLOCK)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stat_key(path):
+    """(크기, 수정시각) - 파일이 없거나 읽을 수 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class BinaryHasher:
+    """
+    실행 파일 SHA-256 계산기.
+    (경로, 크기, 수정시각)이 같으면 저장된 해시를 그대로 쓰고, 바뀐 파일/새 파일만 여러 스레드로 나눠 읽습니다.
+    해시 캐시는 SQLite에 두고, 처음 한 번 메모리로 올려 이후 조회는 디스크를 읽지 않습니다.
+    """
+
+    def __init__(self, db_path, workers=4):
+        self.db_path = db_path
+        self.workers = workers
+        self.hashed_files = 0  # 실제로 다시 읽은 파일 수 (캐시 효과 확인용)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._cache = {path: (size, mtime_ns, sha256) for path, size, mtime_ns, sha256
+                           in conn.execute("SELECT path, size, mtime_ns, sha256 FROM binary_hashes")}
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def stat_many(self, paths):
+        """{경로: (크기, 수정시각) 또는 None} - 변동 여부만 빠르게 볼 때"""
+        return {path: stat_key(path) for path in paths}
+
+    def hash_many(self, paths):
+        """
+        {경로: {"sha256", "size", "mtime_ns", "error"}}
+        바뀌지 않은 파일은 읽지 않고, 나머지는 병렬로 해시합니다.
+        """
+        results, todo = {}, []
+        for path in set(paths):
+            key = stat_key(path)
+            if key is None:
+                results[path] = {"sha256": None, "size": None, "mtime_ns": None, "error": "파일 없음"}
+                continue
+            cached = self._cache.get(path)
+            if cached is not None and cached[:2] == key:
+                results[path] = {"sha256": cached[2], "size": key[0], "mtime_ns": key[1], "error": None}
+            else:
+                todo.append((path, key))
+        if todo:
+            with TELEMETRY.span("startup.hash", files=len(todo)), \
+                    ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(todo)))) as pool:
+                hashed = list(pool.map(self._hash_one, todo))
+            self._store([result for result in hashed if result[1]["sha256"]])
+            results.update(hashed)
+        return results
+
+    def _hash_one(self, job):
+        path, (size, mtime_ns) = job
+        try:
+            sha256 = sha256_file(path)
+        except OSError as e:
+            return path, {"sha256": None, "size": size, "mtime_ns": mtime_ns, "error": str(e)}
+        return path, {"sha256": sha256, "size": size, "mtime_ns": mtime_ns, "error": None}
+
+    def _store(self, hashed):
+        if not hashed:
+            return
+        self.hashed_files += len(hashed)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO binary_hashes (path, size, mtime_ns, sha256, hashed_at) VALUES (?, ?, ?, ?, ?)",
+                [(path, info["size"], info["mtime_ns"], info["sha256"], now) for path, info in hashed],
+            )
+        for path, info in hashed:
+            self._cache[path] = (info["size"], info["mtime_ns"], info["sha256"])
+
+
+class ReputationList:
+    """
+    로컬 허용/차단 목록 파일. 한 줄에 하나씩:
+        allow <sha256>  [메모]
+        deny  <sha256>  [메모]
+        # 주석
+    reload()를 부를 때 파일 수정 시각이 바뀌었으면 다시 읽어 메모리 집합으로 보관하고,
+    verdict()는 그 집합만 봅니다. (검사 한 번에 reload() 한 번)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.allowed = frozenset()
+        self.denied = frozenset()
+        self._token = None
+
+    def token(self):
+        """목록 파일의 변경 토큰 (없으면 None)"""
+        return stat_key(self.path) if self.path else None
+
+    def reload(self):
+        """목록 파일이 바뀌었으면 다시 읽습니다. return: 변경 토큰"""
+        token = self.token()
+        if token == self._token:
+            return token
+        allowed, denied = set(), set()
+        if token is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        parts = line.split("#", 1)[0].split()
+                        if len(parts) >= 2 and parts[0].lower() in ("allow", "deny"):
+                            (allowed if parts[0].lower() == "allow" else denied).add(parts[1].lower())
+            except OSError as e:
+                print(f"평판 목록을 읽지 못했습니다: {e}")
+        self.allowed, self.denied, self._token = frozenset(allowed), frozenset(denied), token
+        return token
+
+    def verdict(self, sha256):
+        """ "deny" / "allow" / None (목록에 없음). 같은 해시가 양쪽에 있으면 차단이 우선합니다. (파일은 읽지 않음)"""
+        if not sha256:
+            return None
+        if sha256 in self.denied:
+            return "deny"
+        if sha256 in self.allowed:
+            return "allow"
+        return None
@@ -0,0 +1,386 @@
+# src/clean_analyzer.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+
+# --- 정리 후보 기준 ---
+TEMP_EXTENSIONS = {".tmp", ".temp", ".bak", ".old", ".dmp", ".chk", ".crdownload", ".part"}
+TEMP_DIR_NAMES = {"temp", "tmp"}
+CACHE_DIR_NAMES = {"cache", "caches", ".cache", "__pycache__", "inetcache", "code cache", "gpucache", "shadercache"}
+DEFAULT_STALE_DAYS = 365              # 이 기간 동안 수정되지 않은 큰 파일은 '오래된 파일'
+STALE_MIN_SIZE = 1024 * 1024
+DEFAULT_MIN_DUPLICATE_SIZE = 64 * 1024
+
+PARTIAL_BLOCK = 64 * 1024             # 부분 해시: 앞/뒤 64KB만 읽음
+HASH_CHUNK = 1024 * 1024
+CATEGORY_LABELS = {"temp": "임시 파일", "cache": "캐시", "stale": "오래된 파일", "duplicate": "중복 파일"}
+# 처음부터 체크해 두는 분류. '오래된 파일'은 크고 오래됐을 뿐 개인 문서일 수 있어 사용자가 직접 골라야 함
+AUTO_SELECT = {"temp", "cache", "duplicate"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path     TEXT PRIMARY KEY,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial  TEXT,
+    full     TEXT,
+    seen_run INTEGER NOT NULL DEFAULT 0
+);
+-- 예전 폴더 목록 캐시 (폴더 수정시각으로는 파일을 제자리에서 고친 것을 알 수 없어 없앰)
+DROP TABLE IF EXISTS dirs;
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def partial_hash(path, size):
+    """
+    파일 앞/뒤 블록만 읽은 해시 (크기가 같은 파일들을 빠르게 걸러내는 용도)
+    두 블록보다 작은 파일은 통째로 읽으므로 이 값이 곧 전체 내용의 해시입니다.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        if size <= PARTIAL_BLOCK * 2:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(PARTIAL_BLOCK))
+            f.seek(size - PARTIAL_BLOCK)
+            digest.update(f.read(PARTIAL_BLOCK))
+    return digest.hexdigest()
+
+
+def full_hash(path):
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _list_dir(path, category):
+    """폴더 하나를 읽습니다. (작업 스레드에서 실행 - scandir/stat 중에는 GIL이 풀림)"""
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        files.append((entry.path, entry.name, st.st_size, st.st_mtime_ns))
+                except OSError:
+                    continue
+    except OSError:
+        return path, category, files, subdirs, True
+    return path, category, files, subdirs, False
+
+
+def _dir_category(path, inherited):
+    """폴더 이름으로 임시/캐시 폴더인지 판단 (상위 폴더의 분류를 물려받음)"""
+    if inherited:
+        return inherited
+    name = os.path.basename(path).lower()
+    if name in TEMP_DIR_NAMES:
+        return "temp"
+    if name in CACHE_DIR_NAMES:
+        return "cache"
+    return None
+
+
+class CleanStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.dirs = 0
+        self.files = 0
+        self.total_size = 0
+        self.errors = 0
+        self.hashed_bytes = 0   # 실제로 디스크에서 읽은 바이트 (해시 계산용)
+        self.cached_hashes = 0  # 캐시 덕분에 읽지 않은 해시 수
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def snapshot(self):
+        return {"dirs": self.dirs, "files": self.files, "total_size": self.total_size, "errors": self.errors,
+                "hashed_bytes": self.hashed_bytes, "cached_hashes": self.cached_hashes,
+                "elapsed": round(self.elapsed, 3)}
+
+
+class CleanAnalyzer:
+    """
+    디지털 청소 분석 엔진.
+    1) 여러 스레드로 폴더를 동시에 훑으며 폴더별 크기를 모으고 임시/캐시/오래된 파일을 찾음
+    2) 중복 파일은 크기 -> 부분 해시(앞/뒤 블록) -> 전체 해시 순으로 좁혀서, 대부분의 파일은 끝까지 읽지 않음
+    해시는 (경로, 크기, 수정시각) 기준으로 캐시해 두어 다음 분석 때 다시 읽지 않습니다.
+    """
+
+    def __init__(self, cache_path="clean_cache.db", workers=8, hash_workers=4,
+                 stale_days=DEFAULT_STALE_DAYS, min_duplicate_size=DEFAULT_MIN_DUPLICATE_SIZE):
+        self.cache_path = cache_path
+        self.workers = workers
+        self.hash_workers = hash_workers
+        self.stale_days = stale_days
+        self.min_duplicate_size = min_duplicate_size
+        self.stats = CleanStats()
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.cache_path, timeout=10)
+
+    def last_summary(self):
+        """지난 분석 요약 (대시보드용, 디스크를 훑지 않고 즉시 반환). 분석한 적 없으면 None"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'last_summary'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def analyze(self, roots, cancel_event=None, progress_interval=0.2):
+        """
+        분석 결과를 하나씩 내보내는 제너레이터. 각 항목은 (종류, 내용):
+        - ("progress", 통계)
+        - ("candidate", {"path", "size", "mtime_ns", "category"})   임시/캐시/오래된 파일
+        - ("duplicate", {"size", "hash", "paths", "keep", "remove", "reclaimable"})   중복 파일 묶음
+        - ("done", 요약)
+        중복 묶음의 keep은 어느 분류의 정리 후보도 아닌 사본입니다. 모든 사본이 후보였다면 하나를 골라
+        후보에서 빼므로, 앞서 받은 candidate 중 keep과 같은 경로는 버려야 합니다.
+        """
+        self.stats = CleanStats()
+        roots = [os.path.abspath(root) for root in roots]
+        self._cancel_event = cancel_event
+        self._progress_interval = progress_interval
+        self._last_progress = 0.0
+        by_category = {}
+        dir_sizes = {}
+        size_groups = {}
+        candidates = {}  # 중복 후보 크기 이상인 정리 후보: 경로 -> 분류
+
+        # 1단계: 폴더 훑기
+        for event in self._walk(roots, dir_sizes, size_groups, candidates):
+            if event[0] == "candidate":
+                item = event[1]
+                by_category[item["category"]] = by_category.get(item["category"], 0) + item["size"]
+            yield event
+        if self._cancelled():
+            return
+
+        # 2단계: 중복 파일 찾기
+        duplicate_groups, duplicate_size = 0, 0
+        for event in self._find_duplicates(size_groups, roots):
+            if event[0] == "duplicate":
+                group = event[1]
+                keep = next((path for path in group["paths"] if path not in candidates), group["paths"][0])
+                category = candidates.pop(keep, None)
+                if category is not None:
+                    by_category[category] -= group["size"]  # 남길 사본은 정리 후보에서 뺌
+                group["keep"] = keep
+                group["remove"] = [path for path in group["paths"] if path != keep]
+                duplicate_groups += 1
+                # 이미 다른 분류로 센 사본은 두 번 세지 않음
+                duplicate_size += group["size"] * sum(1 for path in group["remove"] if path not in candidates)
+            yield event
+        if self._cancelled():
+            return
+        if duplicate_size:
+            by_category["duplicate"] = duplicate_size
+
+        self.stats.finished = time.perf_counter()
+        summary = {
+            "roots": roots,
+            "analyzed_at": time.time(),
+            "total_size": self.stats.total_size,
+            "files": self.stats.files,
+            "dirs": self.stats.dirs,
+            "largest_dirs": self._largest_dirs(dir_sizes, roots),
+            "by_category": by_category,
+            "reclaimable": sum(by_category.values()),
+            "duplicate_groups": duplicate_groups,
+            "stats": self.stats.snapshot(),
+        }
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('last_summary', ?)",
+                         (json.dumps(summary, ensure_ascii=False),))
+        yield ("done", summary)
+
+    # --- 1단계 ---
+
+    def _walk(self, roots, dir_sizes, size_groups, candidates):
+        stale_before = time.time_ns() - self.stale_days * 86400 * 10**9
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="clean-walk") as pool:
+            pending = {pool.submit(_list_dir, root, _dir_category(root, None)) for root in roots if os.path.isdir(root)}
+            while pending:
+                if self._cancelled():
+                    for future in pending:
+                        future.cancel()
+                    return
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, category, files, subdirs, failed = future.result()
+                    self.stats.dirs += 1
+                    self.stats.errors += failed
+                    for subdir in subdirs:
+                        pending.add(pool.submit(_list_dir, subdir, _dir_category(subdir, category)))
+
+                    own_size = 0
+                    for file_path, name, size, mtime_ns in files:
+                        own_size += size
+                        file_category = category or self._file_category(name, size, mtime_ns, stale_before)
+                        if size >= self.min_duplicate_size:
+                            size_groups.setdefault(size, []).append((file_path, mtime_ns))
+                            if file_category:
+                                candidates[file_path] = file_category
+                        if file_category:
+                            yield ("candidate", {"path": file_path, "size": size, "mtime_ns": mtime_ns,
+                                                 "category": file_category})
+                    dir_sizes[path] = own_size
+                    self.stats.files += len(files)
+                    self.stats.total_size += own_size
+                yield from self._progress()
+
+    def _file_category(self, name, size, mtime_ns, stale_before):
+        lower = name.lower()
+        if lower.startswith("~$") or os.path.splitext(lower)[1] in TEMP_EXTENSIONS:
+            return "temp"
+        if size >= STALE_MIN_SIZE and mtime_ns < stale_before:
+            return "stale"
+        return None
+
+    def _largest_dirs(self, dir_sizes, roots, limit=10):
+        # 하위 폴더 크기를 상위 폴더로 합산 (깊은 폴더부터)
+        totals = dict(dir_sizes)
+        root_set = set(roots)
+        for path in sorted(dir_sizes, key=lambda p: p.count(os.sep), reverse=True):
+            parent = os.path.dirname(path)
+            if path not in root_set and parent in totals:
+                totals[parent] += totals[path]
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    # --- 2단계 ---
+
+    def _find_duplicates(self, size_groups, roots):
+        candidates = {size: files for size, files in size_groups.items() if len(files) > 1}
+        with closing(self._connect()) as conn:
+            run_id = int(conn.execute("SELECT COALESCE(MAX(seen_run), 0) + 1 FROM hashes").fetchone()[0])
+            cache = _HashCache(conn, run_id)
+            with ThreadPoolExecutor(max_workers=self.hash_workers, thread_name_prefix="clean-hash") as pool:
+                # 크기가 같은 파일들 -> 부분 해시로 다시 묶기
+                partial_groups = {}
+                for key, files in self._hash_all(pool, cache, candidates, "partial"):
+                    partial_groups[key] = files
+                partial_groups = {key: files for key, files in partial_groups.items() if len(files) > 1}
+                # 부분 해시까지 같은 파일들만 전체 해시
+                for (size, _, digest), files in self._hash_all(pool, cache, partial_groups, "full"):
+                    if len(files) > 1:
+                        paths = sorted(path for path, _ in files)
+                        yield ("duplicate", {"size": size, "hash": digest, "paths": paths,
+                                             "reclaimable": size * (len(paths) - 1)})
+                    yield from self._progress()
+            if not self._cancelled():
+                cache.purge_unseen(roots)
+            conn.commit()
+
+    def _hash_all(self, pool, cache, groups, kind):
+        """
+        groups의 파일들을 kind("partial"/"full") 해시로 다시 묶습니다.
+        캐시에 있으면 읽지 않고, 없는 것만 스레드 풀에서 계산합니다.
+        return: [((크기, ..., 해시), [(경로, 수정시각)]), ...]
+        """
+        regrouped = {}
+        jobs = {}
+        for group_key, files in groups.items():
+            size = group_key if kind == "partial" else group_key[0]
+            for path, mtime_ns in files:
+                if self._cancelled():
+                    return []
+                if kind == "full" and size <= PARTIAL_BLOCK * 2:
+                    digest = group_key[1]  # 작은 파일은 부분 해시가 이미 전체 내용의 해시
+                else:
+                    digest = cache.get(path, size, mtime_ns, kind)
+                if digest is not None:
+                    self.stats.cached_hashes += 1
+                    regrouped.setdefault(self._group_key(group_key, size, digest, kind), []).append((path, mtime_ns))
+                elif kind == "partial":
+                    jobs[pool.submit(partial_hash, path, size)] = (group_key, size, path, mtime_ns)
+                else:
+                    jobs[pool.submit(full_hash, path)] = (group_key, size, path, mtime_ns)
+
+        for future in jobs:
+            group_key, size, path, mtime_ns = jobs[future]
+            if self._cancelled():
+                future.cancel()
+                continue
+            try:
+                digest = future.result()
+            except OSError:
+                self.stats.errors += 1
+                continue
+            self.stats.hashed_bytes += min(size, PARTIAL_BLOCK * 2) if kind == "partial" else size
+            cache.put(path, size, mtime_ns, kind, digest)
+            regrouped.setdefault(self._group_key(group_key, size, digest, kind), []).append((path, mtime_ns))
+        return list(regrouped.items())
+
+    def _group_key(self, group_key, size, digest, kind):
+        return (size, digest) if kind == "partial" else (size, group_key[1], digest)
+
+    # --- 공통 ---
+
+    def _cancelled(self):
+        return self._cancel_event is not None and self._cancel_event.is_set()
+
+    def _progress(self):
+        now = time.perf_counter()
+        if now - self._last_progress >= self._progress_interval:
+            self._last_progress = now
+            yield ("progress", self.stats.snapshot())
+
+
+class _HashCache:
+    """(경로, 크기, 수정시각)이 같으면 저장된 해시를 재사용"""
+
+    def __init__(self, conn, run_id):
+        self.conn = conn
+        self.run_id = run_id
+
+    def get(self, path, size, mtime_ns, kind):
+        row = self.conn.execute(f"SELECT size, mtime_ns, {kind} FROM hashes WHERE path = ?", (path,)).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns or row[2] is None:
+            return None
+        self.conn.execute("UPDATE hashes SET seen_run = ? WHERE path = ?", (self.run_id, path))
+        return row[2]
+
+    def put(self, path, size, mtime_ns, kind, digest):
+        row = self.conn.execute("SELECT size, mtime_ns FROM hashes WHERE path = ?", (path,)).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            # 새 파일이거나 내용이 바뀐 파일: 예전 해시는 모두 버림
+            self.conn.execute(
+                "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, partial, full, seen_run) VALUES (?, ?, ?, NULL, NULL, ?)",
+                (path, size, mtime_ns, self.run_id),
+            )
+        self.conn.execute(f"UPDATE hashes SET {kind} = ?, seen_run = ? WHERE path = ?", (digest, self.run_id, path))
+
+    def purge_unseen(self, roots):
+        for root in roots:
+            prefix = os.path.join(root, "")
+            high = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            self.conn.execute("DELETE FROM hashes WHERE path >= ? AND path < ? AND seen_run != ?",
+                              (prefix, high, self.run_id))
+
+
+# 테스트용 코드: python clean_analyzer.py <폴더>
+if __name__ == "__main__":
+    import sys
+    analyzer = CleanAnalyzer()
+    for kind, payload in analyzer.analyze(sys.argv[1:] or [os.path.expanduser("~")]):
+        if kind == "duplicate":
+            print("중복:", payload["paths"])
+        elif kind == "done":
+            print(json.dumps(payload, ensure_ascii=False, indent=2))
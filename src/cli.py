@@ -0,0 +1,299 @@
+# src/cli.py
+# 화면 없이 검사만 돌리는 명령줄 실행기 (작업 스케줄러/cron용). Tk/customtkinter를 불러오지 않습니다.
+#   python cli.py startup
+#   python cli.py scan <폴더>... [--all] [--no-index]
+#   python cli.py clean <폴더>...
+#   python cli.py wipe <파일 또는 폴더>... --yes [--scheme zero]
+#   python cli.py watch [--startup-every 300] [--scan-root <폴더> --scan-every 3600] [--clean-root <폴더> --clean-every 86400]
+# 결과는 한 줄에 JSON 하나씩(JSON Lines) 표준 출력으로 내보냅니다.
+# 종료 코드: 0 정상 / 1 확인이 필요한 항목 발견 / 2 잘못된 사용법 / 3 오류 / 130 중단됨
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+import time
+
+EXIT_OK = 0
+EXIT_FINDINGS = 1       # 승인 안 된 시작프로그램, 개인정보 포함 파일 등
+EXIT_USAGE = 2          # argparse와 같은 값
+EXIT_ERROR = 3
+EXIT_INTERRUPTED = 130  # Ctrl+C / 종료 신호
+
+
+class JsonLinesWriter:
+    """이벤트 하나를 JSON 한 줄로 써서 바로 내보냄 (여러 PC의 로그를 모아 볼 수 있게 호스트 이름 포함)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.host = socket.gethostname()
+        self._lock = threading.Lock()
+
+    def emit(self, command, event, **fields):
+        record = {"time": round(time.time(), 3), "host": self.host, "command": command, "event": event, **fields}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class HeadlessChecks:
+    """
+    검사 명령 모음. 엔진(감시자/색인/분석기)은 처음 쓸 때 만들고 재사용하므로,
+    watch 모드에서는 두 번째 검사부터 바뀐 것만 다시 읽습니다.
+    각 메서드는 종료 코드를 반환합니다.
+    """
+
+    def __init__(self, out, cancel_event, progress_interval=0.0):
+        self.out = out
+        self.cancel_event = cancel_event
+        self.progress_interval = progress_interval  # 0이면 진행 이벤트를 내보내지 않음
+        self._monitor = None
+        self._index = None
+        self._analyzer = None
+
+    def _progress_due(self, last):
+        return self.progress_interval > 0 and time.perf_counter() - last >= self.progress_interval
+
+    def startup(self):
+        if self._monitor is None:
+            from startup_checker import StartupMonitor
+            self._monitor = StartupMonitor()
+        status, items = self._monitor.check_for_changes()
+        for item in items:
+            self.out.emit("startup", "item", **item)
+        self.out.emit("startup", "summary", status=status, count=len(items))
+        if status == "ERROR":
+            return EXIT_ERROR
+        return EXIT_FINDINGS if status in ("WARNING", "RESET") else EXIT_OK
+
+    def scan(self, roots, use_index=True, include_all=False):
+        from pii_scanner import PIIScanner
+        if use_index and self._index is None:
+            from scan_index import ScanIndex
+            self._index = ScanIndex()
+        scanner = PIIScanner()
+        last = time.perf_counter()
+        # 검출된 값(마스킹된 예시 포함)은 로그에 남기지 않고 종류별 건수만 내보냄
+        for result in scanner.scan(roots, self.cancel_event, index=self._index if use_index else None):
+            if result["counts"] or include_all:
+                self.out.emit("scan", "file", path=result["path"], size=result["size"], counts=result["counts"],
+                              cached=result["cached"], error=result["error"])
+            if self._progress_due(last):
+                self.out.emit("scan", "progress", **scanner.stats.snapshot())
+                last = time.perf_counter()
+        stats = scanner.stats.snapshot()
+        self.out.emit("scan", "summary", roots=roots, interrupted=self.cancel_event.is_set(), **stats)
+        if self.cancel_event.is_set():
+            return EXIT_INTERRUPTED
+        return EXIT_FINDINGS if stats["files_with_pii"] else EXIT_OK
+
+    def clean(self, roots):
+        if self._analyzer is None:
+            from clean_analyzer import CleanAnalyzer
+            self._analyzer = CleanAnalyzer()
+        last = time.perf_counter()
+        for kind, payload in self._analyzer.analyze(roots, self.cancel_event):
+            if kind == "progress":
+                if self._progress_due(last):
+                    self.out.emit("clean", "progress", **payload)
+                    last = time.perf_counter()
+            elif kind == "done":
+                self.out.emit("clean", "summary", interrupted=self.cancel_event.is_set(), **payload)
+            else:
+                self.out.emit("clean", kind, **payload)
+        # 청소 분석은 정보 제공용이라 정리할 파일이 있어도 정상 종료
+        return EXIT_INTERRUPTED if self.cancel_event.is_set() else EXIT_OK
+
+    def wipe(self, targets, scheme="zero"):
+        from wipe_engine import WipeJob
+        missing = [target for target in targets if not os.path.lexists(target)]
+        for target in missing:
+            self.out.emit("wipe", "error", path=target, error="대상이 없습니다")
+        job = WipeJob(targets, scheme=scheme)
+        on_progress = None
+        if self.progress_interval > 0:
+            on_progress = lambda snap: self.out.emit("wipe", "progress", **snap)
+        snap = job.run(self.cancel_event, on_progress=on_progress, progress_interval=self.progress_interval or 0.2)
+        for progress in job.files:
+            self.out.emit("wipe", "file", **progress.snapshot())
+        snap.pop("running")
+        self.out.emit("wipe", "summary", scheme=scheme, interrupted=self.cancel_event.is_set(), **snap)
+        if self.cancel_event.is_set():
+            return EXIT_INTERRUPTED
+        return EXIT_ERROR if snap["failed"] or missing else EXIT_OK
+
+
+def next_delay(interval, failures, retry, max_backoff, jitter, rng):
+    """
+    다음 실행까지 기다릴 시간 (초).
+    실패가 이어지면 retry부터 두 배씩 늘려 max_backoff까지 (정상 주기보다 길어지지는 않음),
+    여러 PC가 같은 시각에 몰리지 않도록 ±jitter 비율만큼 흔듦
+    """
+    delay = interval if not failures else min(interval, max_backoff, retry * 2 ** (failures - 1))
+    return max(1.0, delay * (1 + rng.uniform(-jitter, jitter)))
+
+
+class ScheduledCheck:
+    def __init__(self, name, interval, run):
+        self.name = name
+        self.interval = interval
+        self.run = run          # () -> 종료 코드
+        self.failures = 0       # 연속 실패 횟수
+        self.next_run = 0.0     # time.monotonic() 기준
+        self.runs = 0
+
+
+def watch(checks, out, cancel_event, jitter=0.1, splay=0.0, retry=60.0, max_backoff=3600.0, max_runs=0, rng=None,
+          after_run=None):
+    """
+    상주 모드: 검사마다 주기를 두고 반복 실행합니다. (가장 먼저 돌아올 검사까지 잠들어 있음)
+    오류(종료 코드 3)는 백오프로 다시 시도하고, 확인이 필요한 항목 발견(1)은 정상 주기를 유지합니다.
+    after_run()은 검사가 한 번 끝날 때마다 호출됩니다. (진단 기록 남기기 등)
+    종료 신호로 멈추면 EXIT_INTERRUPTED, max_runs를 채우거나 검사가 없으면 EXIT_OK를 돌려줍니다.
+    """
+    rng = rng or random.Random()
+    now = time.monotonic()
+    for check in checks:
+        check.next_run = now + rng.uniform(0, splay)  # 시작 시각도 PC마다 흩어지게
+    out.emit("watch", "start", checks={check.name: check.interval for check in checks})
+    total = 0
+    interrupted = False
+    while checks and not cancel_event.is_set():
+        check = min(checks, key=lambda c: c.next_run)
+        if cancel_event.wait(max(0.0, check.next_run - time.monotonic())):
+            interrupted = True
+            break
+        try:
+            code = check.run()
+        except Exception as e:
+            out.emit("watch", "error", check=check.name, error=f"{type(e).__name__}: {e}")
+            code = EXIT_ERROR
+        if code == EXIT_INTERRUPTED:
+            interrupted = True
+            break
+        check.failures = check.failures + 1 if code == EXIT_ERROR else 0
+        check.runs += 1
+        delay = next_delay(check.interval, check.failures, retry, max_backoff, jitter, rng)
+        check.next_run = time.monotonic() + delay
+        out.emit("watch", "scheduled", check=check.name, exit_code=code, failures=check.failures,
+                 next_in=round(delay, 1))
+        if after_run:
+            after_run()
+        total += 1
+        if max_runs and total >= max_runs:
+            break
+    interrupted = interrupted or cancel_event.is_set()
+    out.emit("watch", "stop", runs=total, interrupted=interrupted)
+    return EXIT_INTERRUPTED if interrupted else EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="SecuDeck 검사를 화면 없이 실행합니다 (JSON Lines 출력).")
+    parser.add_argument("--data-dir", help="캐시/스냅샷 DB를 둘 폴더 (작업 스케줄러는 작업 폴더가 System32일 수 있음)")
+    parser.add_argument("--progress", type=float, default=0.0, metavar="SEC", help="SEC초마다 진행 이벤트 출력 (기본: 끔)")
+    parser.add_argument("--metrics", metavar="FILE", help="구간별 시간/카운터를 이 파일에 JSON Lines로 남김 (1MB마다 교체)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("startup", help="시작프로그램 변경 검사")
+
+    scan = commands.add_parser("scan", help="개인정보 스캔")
+    scan.add_argument("roots", nargs="+")
+    scan.add_argument("--all", action="store_true", help="개인정보가 없는 파일도 출력")
+    scan.add_argument("--no-index", action="store_true", help="색인을 쓰지 않고 전부 다시 읽음")
+
+    clean = commands.add_parser("clean", help="디지털 청소 분석 (삭제하지 않음)")
+    clean.add_argument("roots", nargs="+")
+
+    wipe = commands.add_parser("wipe", help="보안 삭제")
+    wipe.add_argument("targets", nargs="+")
+    wipe.add_argument("--scheme", default="zero", choices=["zero", "random", "3pass", "dod", "dod7"])
+    wipe.add_argument("--yes", action="store_true", help="확인 없이 삭제 (필수)")
+
+    watch_cmd = commands.add_parser("watch", help="주기적으로 검사를 반복하는 상주 모드")
+    watch_cmd.add_argument("--startup-every", type=float, default=300.0, metavar="SEC", help="0이면 끔")
+    watch_cmd.add_argument("--scan-root", action="append", default=[])
+    watch_cmd.add_argument("--scan-every", type=float, default=3600.0, metavar="SEC")
+    watch_cmd.add_argument("--clean-root", action="append", default=[])
+    watch_cmd.add_argument("--clean-every", type=float, default=86400.0, metavar="SEC")
+    watch_cmd.add_argument("--jitter", type=float, default=0.1, help="주기를 ±이 비율만큼 흔듦 (기본 0.1)")
+    watch_cmd.add_argument("--splay", type=float, default=0.0, metavar="SEC", help="첫 검사를 0~SEC초 사이에 무작위로 시작")
+    watch_cmd.add_argument("--retry", type=float, default=60.0, metavar="SEC", help="오류 후 첫 재시도 간격")
+    watch_cmd.add_argument("--max-backoff", type=float, default=3600.0, metavar="SEC")
+    watch_cmd.add_argument("--max-runs", type=int, default=0, help="이 횟수만큼 검사한 뒤 종료 (0이면 계속)")
+    return parser
+
+
+def install_signal_handlers(cancel_event):
+    # Ctrl+C / 서비스 종료 신호가 오면 진행 중인 검사에 취소 신호를 보냄
+    def handler(signum, frame):
+        cancel_event.set()
+    for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), handler)
+
+
+def main(argv=None, out=None, cancel_event=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "wipe" and not args.yes:
+        parser.error("보안 삭제는 되돌릴 수 없습니다. 확인했다면 --yes를 붙이세요.")
+    # 경로 인자는 작업 폴더를 바꾸기 전에 절대 경로로
+    for name in ("roots", "targets", "scan_root", "clean_root"):
+        if getattr(args, name, None):
+            setattr(args, name, [os.path.abspath(path) for path in getattr(args, name)])
+    if args.metrics:
+        args.metrics = os.path.abspath(args.metrics)
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+        os.chdir(args.data_dir)  # 엔진들의 기본 DB 경로가 작업 폴더 기준
+    out = out or JsonLinesWriter()
+    cancel_event = cancel_event or threading.Event()
+    if args.metrics:
+        from telemetry import TELEMETRY
+        TELEMETRY.configure_export(args.metrics)
+    try:
+        return _run(args, parser, out, cancel_event)
+    finally:
+        if args.metrics:
+            TELEMETRY.export()
+
+
+def _run(args, parser, out, cancel_event):
+    from telemetry import TELEMETRY
+    checks = HeadlessChecks(out, cancel_event, args.progress)
+    try:
+        if args.command == "startup":
+            return checks.startup()
+        if args.command == "scan":
+            return checks.scan(args.roots, use_index=not args.no_index, include_all=args.all)
+        if args.command == "clean":
+            return checks.clean(args.roots)
+        if args.command == "wipe":
+            return checks.wipe(args.targets, args.scheme)
+        scheduled = []
+        if args.startup_every > 0:
+            scheduled.append(ScheduledCheck("startup", args.startup_every, checks.startup))
+        if args.scan_root and args.scan_every > 0:
+            scheduled.append(ScheduledCheck("scan", args.scan_every, lambda: checks.scan(args.scan_root)))
+        if args.clean_root and args.clean_every > 0:
+            scheduled.append(ScheduledCheck("clean", args.clean_every, lambda: checks.clean(args.clean_root)))
+        if not scheduled:
+            parser.error("실행할 검사가 없습니다.")
+        return watch(scheduled, out, cancel_event, jitter=args.jitter, splay=args.splay, retry=args.retry,
+                     max_backoff=args.max_backoff, max_runs=args.max_runs,
+                     after_run=TELEMETRY.export if args.metrics else None)
+    except Exception as e:
+        out.emit(args.command, "error", error=f"{type(e).__name__}: {e}")
+        return EXIT_ERROR
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support() # 스캔 엔진의 프로세스 풀을 exe로 묶었을 때도 동작하도록
+    cancel = threading.Event()
+    install_signal_handlers(cancel)
+    sys.exit(main(cancel_event=cancel))
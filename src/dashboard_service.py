@@ -0,0 +1,207 @@
+# src/dashboard_service.py
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 카드별 요약 유효 시간 (초). None이면 시간으로는 만료되지 않고 publish/invalidate로만 바뀜
+DEFAULT_TTL = {"startup": None, "scan": 300, "clean": 600, "process": 10}
+
+# 보안 점수 가중치 (결과가 없는 항목은 빼고 나머지 비율로 계산)
+WEIGHTS = {"startup": 35, "scan": 30, "process": 20, "clean": 15}
+
+# 카드 내용과 상관없이 매번 바뀌는 값 (이것만 바뀐 경우는 다시 그리지 않음)
+IGNORED_FIELDS = {"process": ("samples", "cpu_percent")}
+
+# 다음 실행 때 첫 화면을 바로 그리기 위해 파일에 남겨두는 카드 (프로세스는 실행 중 상태라 제외)
+PERSISTED = ("startup", "scan", "clean")
+
+GB = 1024 ** 3
+
+
+def startup_summary(result):
+    """StartupMonitor.check_for_changes() 결과 -> 카드용 요약"""
+    if result is None:
+        return None
+    status, items = result
+    return {
+        "status": status,
+        "count": len(items),
+        "binary": sum(1 for item in items if item["change"] == "binary"),
+        "denied": sum(1 for item in items if item.get("reputation") == "deny"),
+    }
+
+
+def part_scores(summaries):
+    """{카드: 0.0~1.0 또는 None(아직 모름)}"""
+    parts = dict.fromkeys(WEIGHTS)
+
+    startup = summaries.get("startup")
+    if startup and startup["status"] in ("SAFE", "FIRST_RUN"):
+        parts["startup"] = 1.0
+    elif startup and startup["status"] in ("WARNING", "RESET"):
+        # 차단 목록 파일이 있으면 0점, 교체된 실행 파일은 새 항목보다 더 깎음
+        parts["startup"] = 0.0 if startup["denied"] else max(0.0, 1.0 - 0.15 * startup["count"] - 0.15 * startup["binary"])
+
+    scan = summaries.get("scan")
+    if scan and scan["scanned"]:
+        parts["scan"] = 1.0 / (1.0 + scan["files_with_pii"] / 5)  # 5개면 절반, 20개면 0.2
+
+    process = summaries.get("process")
+    if process:
+        parts["process"] = max(0.0, 1.0 - 0.25 * len(process["recent_listening"]))
+
+    clean = summaries.get("clean")
+    if clean:
+        parts["clean"] = 1.0 - min(0.5, clean["reclaimable"] / (40 * GB))  # 정리할 게 많아도 절반까지만 깎음
+    return parts
+
+
+def security_score(summaries, weights=WEIGHTS):
+    """가중 평균 보안 점수 (0~100). 아는 항목이 하나도 없으면 None"""
+    parts = part_scores(summaries)
+    known = {name: value for name, value in parts.items() if value is not None and weights.get(name)}
+    if not known:
+        return None
+    total = sum(weights[name] for name in known)
+    return round(100 * sum(weights[name] * value for name, value in known.items()) / total)
+
+
+class DashboardService:
+    """
+    대시보드 카드 요약 모음.
+    - 카드마다 마지막 요약과 읽은 시각을 보관하고, 유효 시간이 지난 것만 여러 스레드로 동시에 다시 읽습니다.
+    - providers는 저장된 요약만 읽는 가벼운 함수여야 합니다. (새로 스캔/분석하지 않음)
+    - 기능 쪽에서 결과가 바뀌면 publish()로 바로 넣거나 invalidate()로 다음 새로고침 때 다시 읽게 합니다.
+    - 화면에 마지막으로 보낸 요약과 비교해 바뀐 카드(와 점수)만 돌려줍니다.
+    """
+
+    def __init__(self, providers, ttl=None, weights=None, cache_file="dashboard_cache.json", workers=4):
+        self.providers = dict(providers) # 카드 -> () -> 요약
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.weights = weights or WEIGHTS
+        self.cache_file = cache_file
+        self.workers = workers
+        self.fetches = 0        # providers를 실제로 부른 횟수 (캐시 효과 확인용)
+        self._lock = threading.Lock()
+        self._values = {}       # 카드 -> 요약
+        self._fetched = {}      # 카드 -> 읽은 시각 (monotonic, 0이면 만료)
+        self._shown = {}        # 카드 -> 화면에 마지막으로 보낸 요약
+        self._dirty = False     # 파일에 아직 안 쓴 변경
+        self._load()
+
+    # --- 값 넣기 ---
+
+    def publish(self, name, value):
+        """기능 쪽에서 새 요약을 알려줌 -> 바뀐 카드 반환"""
+        with self._lock:
+            self._set_locked(name, value)
+        return self.take_changes()
+
+    def invalidate(self, name):
+        """다음 refresh() 때 다시 읽도록 만료시킴"""
+        with self._lock:
+            self._fetched[name] = 0
+
+    def refresh(self, force=False):
+        """
+        유효 시간이 지난 카드만 동시에 다시 읽고 바뀐 카드를 반환합니다. (작업 스레드에서 호출)
+        읽기에 실패한 카드는 이전 요약을 그대로 둡니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [name for name in self.providers if force or self._expired_locked(name, now)]
+        if due:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(due))), thread_name_prefix="dashboard") as pool:
+                results = list(pool.map(self._fetch, due))
+            with self._lock:
+                for name, ok, value in results:
+                    if ok:
+                        self._set_locked(name, value)
+            self.save()
+        return self.take_changes()
+
+    def _fetch(self, name):
+        self.fetches += 1
+        try:
+            return name, True, self.providers[name]()
+        except Exception as e:
+            print(f"대시보드 요약 오류 ({name}): {e}")
+            return name, False, None
+
+    def _expired_locked(self, name, now):
+        fetched = self._fetched.get(name, 0)
+        ttl = self.ttl.get(name)
+        return not fetched or (ttl is not None and now - fetched >= ttl)
+
+    def _set_locked(self, name, value):
+        if name in PERSISTED and value != self._values.get(name):
+            self._dirty = True
+        self._values[name] = value
+        self._fetched[name] = time.monotonic()
+
+    # --- 화면에 보낼 것 ---
+
+    def snapshot(self):
+        """지금 가진 요약 전체 + 점수 (디스크/다른 기능을 건드리지 않음)"""
+        with self._lock:
+            values = dict(self._values)
+        values["score"] = security_score(values, self.weights)
+        return values
+
+    def take_changes(self, full=False):
+        """
+        화면에 마지막으로 보낸 것과 다른 카드만 {카드: 요약}으로 반환하고, 보낸 것으로 표시합니다.
+        full=True이면 전부 (대시보드를 새로 만들었을 때)
+        """
+        current = self.snapshot()
+        with self._lock:
+            if full:
+                self._shown.clear()
+            changes = {}
+            for name, value in current.items():
+                if name not in self._shown or not self._same(name, self._shown[name], value):
+                    changes[name] = value
+            self._shown.update(changes)
+        return changes
+
+    @staticmethod
+    def _same(name, old, new):
+        ignored = IGNORED_FIELDS.get(name)
+        if ignored and isinstance(old, dict) and isinstance(new, dict):
+            old = {key: value for key, value in old.items() if key not in ignored}
+            new = {key: value for key, value in new.items() if key not in ignored}
+        return old == new
+
+    # --- 파일 캐시 ---
+
+    def _load(self):
+        # 지난 실행의 카드 요약 (만료 상태로 넣어 두고 첫 refresh 때 다시 읽음)
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"대시보드 캐시를 읽지 못했습니다: {e}")
+            return
+        for name in PERSISTED:
+            if name in saved:
+                self._values[name] = saved[name]
+                self._fetched[name] = 0
+
+    def save(self):
+        """바뀐 게 있을 때만 파일에 기록"""
+        with self._lock:
+            if not self._dirty or not self.cache_file:
+                return
+            data = {name: self._values[name] for name in PERSISTED if name in self._values}
+            self._dirty = False
+        try:
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            print(f"대시보드 캐시 저장 오류: {e}")
@@ -0,0 +1,140 @@
+# src/list_model.py
+import bisect
+import itertools
+
+
+class ListModel:
+    """
+    가상 리스트(VirtualList)의 데이터 쪽.
+    항목은 전부 여기에 두고, 화면에는 보이는 줄만 위젯으로 만듭니다.
+    정렬/필터는 (정렬값, 순번, 키) 목록만 다시 계산하므로 위젯을 새로 만들 필요가 없습니다.
+    Tk를 쓰지 않으므로 작업 스레드나 벤치마크에서도 그대로 쓸 수 있습니다.
+    """
+
+    BATCH_SORT_MIN = 32  # 이보다 적게 들어오면 하나씩 끼워넣고, 많으면 한 번에 합침
+
+    def __init__(self, key, sort_key=None, reverse=False, filter_func=None):
+        self._key = key                # item -> 고유 키 (같은 키가 다시 들어오면 교체)
+        self._sort_key = sort_key      # None이면 들어온 순서
+        self.reverse = reverse
+        self._filter = filter_func     # None이면 전부 표시
+        self._items = {}               # 키 -> 항목
+        self._entries = {}             # 키 -> (정렬값, 순번, 키)
+        self._all = []                 # 모든 항목의 entry (정렬됨)
+        self._view = []                # 필터를 통과한 entry (정렬됨)
+        self._seq = itertools.count()
+        self.revision = 0              # 내용이 바뀔 때마다 증가 (위젯이 다시 그릴지 판단)
+
+    # --- 읽기 ---
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, index):
+        # 화면 순서 index번째 항목 (내림차순이면 뒤에서부터 읽음)
+        if self.reverse:
+            index = len(self._view) - 1 - index
+        return self._items[self._view[index][2]]
+
+    def __contains__(self, key):
+        return key in self._items
+
+    @property
+    def total(self):
+        """필터와 상관없는 전체 항목 수"""
+        return len(self._items)
+
+    def get(self, key, default=None):
+        return self._items.get(key, default)
+
+    def items(self):
+        """화면 순서대로 (필터를 통과한) 항목들"""
+        entries = reversed(self._view) if self.reverse else self._view
+        return [self._items[entry[2]] for entry in entries]
+
+    # --- 쓰기 ---
+
+    def extend(self, items):
+        """항목 묶음을 추가합니다. (스트리밍 결과를 모아서 넣는 용도) 같은 키는 새 항목으로 교체됩니다."""
+        items = list(items)
+        if not items:
+            return
+        replaced = [self._key(item) for item in items if self._key(item) in self._items]
+        if replaced:
+            self.remove(replaced)
+        new_entries = []
+        for item in items:
+            key = self._key(item)
+            entry = (self._sort_key(item) if self._sort_key else 0, next(self._seq), key)
+            if key in self._entries:  # 같은 묶음 안에서 중복된 키
+                new_entries.remove(self._entries[key])
+            self._items[key] = item
+            self._entries[key] = entry
+            new_entries.append(entry)
+        new_entries.sort()
+        self._merge(self._all, new_entries)
+        if self._filter is not None:
+            new_entries = [entry for entry in new_entries if self._filter(self._items[entry[2]])]
+        self._merge(self._view, new_entries)
+        self.revision += 1
+
+    def _merge(self, target, entries):
+        # entries는 정렬된 상태. 들어갈 자리만 이진 탐색으로 찾고, 목록은 구간 단위로 이어 붙임
+        # (전체를 다시 비교/정렬하지 않으므로 큰 목록에 작은 묶음이 자주 들어와도 빠름)
+        if not entries:
+            return
+        if not target or entries[0] >= target[-1]:
+            target.extend(entries)
+            return
+        if len(entries) < self.BATCH_SORT_MIN:
+            for entry in entries:
+                bisect.insort(target, entry)
+            return
+        merged, prev = [], 0
+        for entry in entries:
+            pos = bisect.bisect_right(target, entry, prev)
+            merged += target[prev:pos]
+            merged.append(entry)
+            prev = pos
+        merged += target[prev:]
+        target[:] = merged
+
+    def remove(self, keys):
+        keys = {key for key in keys if key in self._items}
+        if not keys:
+            return
+        for key in keys:
+            del self._items[key]
+            del self._entries[key]
+        self._all = [entry for entry in self._all if entry[2] not in keys]
+        self._view = [entry for entry in self._view if entry[2] not in keys]
+        self.revision += 1
+
+    def clear(self):
+        self._items.clear()
+        self._entries.clear()
+        self._all, self._view = [], []
+        self.revision += 1
+
+    # --- 정렬/필터 ---
+
+    def set_sort(self, sort_key, reverse=False):
+        self._sort_key, self.reverse = sort_key, reverse
+        # 순번은 그대로 두어 같은 값끼리는 들어온 순서를 유지
+        self._all = sorted(
+            (sort_key(self._items[key]) if sort_key else 0, seq, key) for _, seq, key in self._all
+        )
+        self._entries = {entry[2]: entry for entry in self._all}
+        self._apply_filter()
+
+    def set_filter(self, filter_func):
+        self._filter = filter_func
+        self._apply_filter()
+
+    def _apply_filter(self):
+        # 전체 목록이 이미 정렬돼 있으므로 다시 정렬할 필요 없이 걸러내기만 함
+        if self._filter is None:
+            self._view = list(self._all)
+        else:
+            self._view = [entry for entry in self._all if self._filter(self._items[entry[2]])]
+        self.revision += 1
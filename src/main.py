@@ -1,10 +1,27 @@
-import customtkinter as ctk
+import time
+_APP_START = time.perf_counter()  # 첫 화면 표시 시간(time-to-first-paint) 측정 기준점
+
+from startup_profiler import StartupProfiler
+PROFILER = StartupProfiler(_APP_START) # import/서비스/프레임 생성 시간 기록
+
+with PROFILER.measure("import", "customtkinter"):
+    import customtkinter as ctk
 import os
-from startup_checker import StartupMonitor
+from tkinter import filedialog, messagebox
+from services import ServiceRegistry
+from task_runner import BackgroundTaskRunner
+from telemetry import TELEMETRY, EventLoopLagProbe, format_report
+from list_model import ListModel
+from virtual_list import VirtualList
+# 스캔/삭제/청소 엔진은 해당 기능을 처음 쓸 때 불러옴 (PROFILER.lazy_import)
 
 # --- 초기 설정 ---
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
+DASHBOARD_REFRESH_MS = 5000 # 대시보드가 보이는 동안 카드 요약 확인 주기
+PAINT_PROBE_ENV = "SECUDECK_PAINT_PROBE" # 설정되어 있으면 첫 화면을 그린 뒤 측정값을 출력하고 종료
+METRICS_FILE = "secudeck_metrics.jsonl"  # 진단 기록 (1MB마다 .1 .2 .3으로 밀려남)
+METRICS_EXPORT_MS = 60000               # 진단 기록을 파일에 남기는 주기
 
 class App(ctk.CTk):
     def __init__(self):
@@ -40,30 +57,166 @@ class App(ctk.CTk):
         self.btn_startup = self.create_sidebar_button("시작프로그램 감시", self.show_startup, 5)
         self.btn_ai = self.create_sidebar_button("🤖 AI 보안 자문", self.show_ai, 6)
 
-        # 4. 프레임 초기화
+        # 작업 스레드 실행기 (무거운 검사는 여기로 보내고 결과만 UI 스레드로 받음)
+        self.task_runner = BackgroundTaskRunner(self)
+
+        # 앱 전체가 같이 쓰는 서비스 (처음 쓰는 순간, 보통 작업 스레드에서 만들어짐)
+        self.services = ServiceRegistry(PROFILER)
+        self.services.register("startup_monitor", lambda: PROFILER.lazy_import("startup_checker").StartupMonitor())
+        self.services.register("scan_index", lambda: PROFILER.lazy_import("scan_index").ScanIndex()) # 바뀐 파일만 다시 검사
+        self.services.register("clean_analyzer", lambda: PROFILER.lazy_import("clean_analyzer").CleanAnalyzer()) # 해시 캐시 + 지난 분석 요약
+        self.services.register("ai_advisor", self._create_advisor) # AI 자문 (답변 캐시 + 최근 대화)
+        self.services.register("process_watcher", lambda: PROFILER.lazy_import("process_monitor").ProcessWatcher(
+            interval=1.0, approved_provider=lambda: self.services.get("startup_monitor").approved_executables()))
+        # 대시보드 카드 요약 (저장된 요약만 읽음, 카드별 유효 시간)
+        self.services.register("dashboard", lambda: PROFILER.lazy_import("dashboard_service").DashboardService(providers={
+            "scan": lambda: self.services.get("scan_index").summary(),
+            "clean": lambda: self.services.get("clean_analyzer").last_summary(),
+            "process": lambda: self.services.get("process_watcher").summary(),
+        }))
+        # 계측: UI 이벤트 루프 지연 감시 + 주기적으로 파일에 기록 (숨은 진단 화면: Ctrl+Shift+D)
+        TELEMETRY.configure_export(METRICS_FILE)
+        self.lag_probe = EventLoopLagProbe(self, TELEMETRY)
+        self.lag_probe.start()
+        self.after(METRICS_EXPORT_MS, self._export_metrics)
+        self.bind("<Control-Shift-D>", lambda event: self.show_diagnostics())
+        self.startup_result = None # 마지막 시작프로그램 검사 결과 (시작프로그램 화면이 나중에 만들어져도 바로 표시)
+        self.first_paint_ms = None
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.bind("<Map>", self._on_first_map, add="+")
+
+        # 4. 프레임 등록 (처음 열 때 만들고 이후에는 재사용)
         # DashboardFrame에 '앱(self)' 자체를 넘겨서, 앱의 함수(show_scan 등)를 호출할 수 있게 함
-        self.dashboard_frame = DashboardFrame(self, self.font_title, self.font_subtitle, self.font_body, app_instance=self)
-        self.scan_frame = ScanFrame(self, self.font_title, self.font_body)
-        self.wipe_frame = WipeFrame(self, self.font_title, self.font_body)
-        self.clean_frame = CleanFrame(self, self.font_title, self.font_body)
-        self.startup_frame = StartupFrame(self, self.font_title, self.font_body)
-        self.ai_frame = AIFrame(self, self.font_title, self.font_body)
+        self.frames = {}
+        self.frame_builders = {
+            "dashboard": lambda: DashboardFrame(self, self.font_title, self.font_subtitle, self.font_body, app_instance=self),
+            "scan": lambda: ScanFrame(self, self.font_title, self.font_body, runner=self.task_runner,
+                                      services=self.services, on_summary=lambda summary: self.publish_summary("scan", summary)),
+            "wipe": lambda: WipeFrame(self, self.font_title, self.font_body, runner=self.task_runner),
+            "clean": lambda: CleanFrame(self, self.font_title, self.font_body, runner=self.task_runner,
+                                        services=self.services, on_summary=lambda summary: self.publish_summary("clean", summary)),
+            "startup": lambda: StartupFrame(self, self.font_title, self.font_body, runner=self.task_runner,
+                                            services=self.services, on_check=self.run_startup_check,
+                                            last_result=self.startup_result),
+            "ai": lambda: AIFrame(self, self.font_title, self.font_body, runner=self.task_runner,
+                                  services=self.services, context_provider=self.collect_ai_context),
+            "diagnostics": lambda: DiagnosticsFrame(self, self.font_title, self.font_body, runner=self.task_runner),
+        }
 
         self.select_frame_by_name("dashboard")
 
+        # 검사는 백그라운드에서 돌리고 창은 바로 띄움
         self.run_startup_check()
+        self.task_runner.submit("process_watch", lambda: self.services.get("process_watcher").start(self._on_process_change))
+        self.load_dashboard()
+        self.after(DASHBOARD_REFRESH_MS, self._dashboard_tick)
+
+    @property
+    def dashboard_frame(self):
+        return self.get_frame("dashboard")
+
+    def get_frame(self, name):
+        # 처음 요청될 때 만들고 그 뒤로는 같은 프레임을 돌려줌
+        frame = self.frames.get(name)
+        if frame is None:
+            with PROFILER.measure("frame", name) as record, TELEMETRY.span("ui.frame", name=name):
+                frame = self.frames[name] = self.frame_builders[name]()
+            if self.first_paint_ms is not None:
+                print(f"'{name}' 화면 생성 {record['ms']:.0f}ms")
+        return frame
 
     def run_startup_check(self):
-        # 1. 감시자(Monitor) 소환해서 검사 실행
-        monitor = StartupMonitor()
-        status, new_items = monitor.check_for_changes()
-        
-        # 2. 대시보드 업데이트 (방금 만든 함수 호출)
-        self.dashboard_frame.update_startup_ui(status, len(new_items))
+        # 1. 감시자(Monitor)에게 검사를 시키되, 작업 스레드에서 실행 (UI가 멈추지 않음)
+        if "startup" in self.frames:
+            self.frames["startup"].show_checking()
+        self.task_runner.submit("startup", lambda: self.services.get("startup_monitor").check_for_changes(),
+                                on_done=self._on_startup_checked, coalesce=True)
+
+    def _on_startup_checked(self, result):
+        status, new_items = result
+        self.startup_result = result
+        # 2. 대시보드 업데이트 (바뀐 카드만 다시 그림)
+        from dashboard_service import startup_summary
+        self.publish_summary("startup", startup_summary(result))
+        if status == "RESET":
+            messagebox.showwarning("시작프로그램 감시", "기준 스냅샷 파일이 손상되어 옆에 옮겨두고 새로 만들었습니다.\n"
+                                   "지금 등록된 시작프로그램을 모두 다시 확인해 주세요.")
         
-        # 3. 상세 탭(StartupFrame) 업데이트
-        # (StartupFrame에 있던 run_check 대신 여기서 결과를 바로 주입)
-        self.startup_frame.update_ui(status, new_items)
+        # 3. 상세 탭(StartupFrame) 업데이트 (아직 안 열어봤으면 열 때 startup_result로 표시)
+        if "startup" in self.frames:
+            self.frames["startup"].update_ui(status, new_items)
+
+    def load_dashboard(self):
+        # 대시보드 서비스는 만들 때 저장된 카드 요약 파일을 읽으므로 작업 스레드에서 만듦
+        # (화면은 '불러오는 중...'으로 먼저 그리고, 저장된 요약 -> 만료된 카드 순으로 채움)
+        self.task_runner.submit("dashboard", lambda: self.services.get("dashboard").take_changes(full=True),
+                                on_done=self.dashboard_frame.apply_changes)
+        self.refresh_dashboard()
+
+    def refresh_dashboard(self):
+        # 유효 시간이 지난 카드 요약만 작업 스레드에서 동시에 다시 읽음 (스캔/분석을 새로 돌리지는 않음)
+        self.task_runner.submit("dashboard", lambda: self.services.get("dashboard").refresh(),
+                                on_done=self.dashboard_frame.apply_changes, coalesce=True)
+
+    def _dashboard_tick(self):
+        # 대시보드가 보이는 동안만 주기적으로 새로고침 (만료된 카드가 없으면 아무것도 읽지 않음)
+        if self.dashboard_frame.winfo_ismapped():
+            self.refresh_dashboard()
+        self.after(DASHBOARD_REFRESH_MS, self._dashboard_tick)
+
+    def publish_summary(self, name, summary):
+        # 기능 쪽에서 요약이 바뀌었을 때 (UI 스레드): 캐시를 갱신하고 바뀐 카드와 점수만 다시 그림
+        if self.services.created("dashboard"):
+            self.dashboard_frame.apply_changes(self.services.get("dashboard").publish(name, summary))
+        else:
+            # 서비스가 아직 만들어지는 중이면 UI 스레드에서 만들지 않도록 같은 작업 줄 뒤에 붙임
+            self.task_runner.submit("dashboard", lambda: self.services.get("dashboard").publish(name, summary),
+                                    on_done=self.dashboard_frame.apply_changes)
+
+    def _on_process_change(self, diff, watcher):
+        # 감시 스레드에서 호출됨: 요약만 만들어 UI 스레드로 넘김
+        self.task_runner.post(self.publish_summary, "process", watcher.summary())
+
+    def _create_advisor(self):
+        ai_advisor = PROFILER.lazy_import("ai_advisor")
+        return ai_advisor.SecurityAdvisor(cache=ai_advisor.AnswerCache())
+
+    def collect_ai_context(self):
+        # 작업 스레드에서 실행: 지금 PC 상태를 AI에게 보낼 짧은 요약으로 묶음 (저장된 요약만 읽고 새로 검사하지 않음)
+        from ai_advisor import compact_context
+        return compact_context(startup=self.startup_result,
+                               scan=self.services.get("scan_index").summary(),
+                               clean=self.services.get("clean_analyzer").last_summary())
+
+    def _on_first_map(self, event):
+        # 창이 처음 화면에 그려진 시점을 기록 (하위 위젯의 <Map>도 여기로 오므로 한 번만 처리)
+        if self.first_paint_ms is not None:
+            return
+        self.update_idletasks()
+        self.first_paint_ms = (time.perf_counter() - _APP_START) * 1000
+        print(PROFILER.report(f"첫 화면 표시까지 {self.first_paint_ms:.0f}ms"))
+        if os.environ.get(PAINT_PROBE_ENV):
+            # 벤치마크(benchmarks/suite.py)용: 측정값을 JSON 한 줄로 남기고 바로 종료
+            import json
+            print(PAINT_PROBE_ENV + " " + json.dumps({"first_paint_ms": round(self.first_paint_ms, 1),
+                                                      "totals": PROFILER.totals()}), flush=True)
+            self.after(0, self.on_close)
+
+    def _export_metrics(self):
+        # 파일 쓰기는 작업 스레드에서
+        self.task_runner.submit("telemetry", TELEMETRY.export, coalesce=True)
+        self.after(METRICS_EXPORT_MS, self._export_metrics)
+
+    def on_close(self):
+        # 진행 중인 작업에 취소 신호를 보내고 창 닫기
+        self.lag_probe.stop()
+        TELEMETRY.export()
+        if self.services.created("process_watcher"):
+            self.services.get("process_watcher").stop()
+        if self.services.created("dashboard"):
+            self.services.get("dashboard").save()
+        self.task_runner.shutdown()
+        self.destroy()
 
     def create_sidebar_button(self, text, command, row):
         btn = ctk.CTkButton(self.sidebar_frame, text=text, command=command, 
@@ -74,23 +227,34 @@ class App(ctk.CTk):
         return btn
 
     def select_frame_by_name(self, name):
-        for frame in [self.dashboard_frame, self.scan_frame, self.wipe_frame, self.clean_frame, self.startup_frame, self.ai_frame]:
+        for frame in self.frames.values():
             frame.grid_forget()
-        
-        if name == "dashboard": self.dashboard_frame.grid(row=0, column=1, sticky="nsew")
-        elif name == "scan": self.scan_frame.grid(row=0, column=1, sticky="nsew")
-        elif name == "wipe": self.wipe_frame.grid(row=0, column=1, sticky="nsew")
-        elif name == "clean": self.clean_frame.grid(row=0, column=1, sticky="nsew")
-        elif name == "startup": self.startup_frame.grid(row=0, column=1, sticky="nsew")
-        elif name == "ai": self.ai_frame.grid(row=0, column=1, sticky="nsew")
-
-    def show_dashboard(self): self.select_frame_by_name("dashboard")
+        self.get_frame(name).grid(row=0, column=1, sticky="nsew")
+
+    def show_dashboard(self):
+        # 캐시된 카드로 바로 보이고, 만료된 요약만 뒤에서 다시 읽음
+        self.select_frame_by_name("dashboard")
+        self.refresh_dashboard()
     def show_scan(self): self.select_frame_by_name("scan")
     def show_wipe(self): self.select_frame_by_name("wipe")
     def show_clean(self): self.select_frame_by_name("clean")
     def show_startup(self): self.select_frame_by_name("startup")
     def show_ai(self): self.select_frame_by_name("ai")
 
+    def show_diagnostics(self):
+        # 사이드바에는 없는 화면 ("앱이 멈췄어요" 문의 때 확인용)
+        self.select_frame_by_name("diagnostics")
+        self.frames["diagnostics"].start_auto_refresh()
+
+
+def format_size(size):
+    # 바이트 수를 읽기 쉬운 단위로 (예: 1.2GB)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
 
 # --- 핵심 수정: 클릭 가능한 카드 기능이 추가된 DashboardFrame ---
 
@@ -99,26 +263,35 @@ class DashboardFrame(ctk.CTkFrame):
         super().__init__(master, corner_radius=0, fg_color="transparent")
         self.app = app_instance # 앱 본체를 저장해둠 (페이지 이동 함수 쓰려고)
         
-        self.lbl_title = ctk.CTkLabel(self, text="안녕하세요! 현재 PC 보안 점수는 90점입니다.", font=f_title)
+        self.lbl_title = ctk.CTkLabel(self, text="안녕하세요! 보안 점수를 계산하고 있습니다...", font=f_title)
         self.lbl_title.pack(pady=30, padx=20, anchor="w")
 
         self.grid_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.grid_frame.pack(fill="both", expand=True, padx=20, pady=10)
         self.grid_frame.grid_columnconfigure((0, 1), weight=1)
-        self.grid_frame.grid_rowconfigure((0, 1), weight=1)
+        self.grid_frame.grid_rowconfigure((0, 1, 2), weight=1)
 
         # 카드 생성 (command에 이동할 함수를 연결)
-        self.create_clickable_card(0, 0, "⚠️ 개인정보 노출", "3건 발견됨\n(메모장 내 비밀번호)", "#C0392B", f_sub, f_body, command=self.app.show_scan)
+        self.card_scan, self.lbl_scan_title, self.lbl_scan_content = self.create_clickable_card(
+            0, 0, "⚠️ 개인정보 노출", "불러오는 중...", "#C0392B", f_sub, f_body, command=self.app.show_scan
+        )
         self.create_clickable_card(0, 1, "🔒 보안 삭제 도구", "파일을 안전하게\n파쇄할 준비 완료", "#2980B9", f_sub, f_body, command=self.app.show_wipe)
-        self.create_clickable_card(1, 0, "🧹 디지털 청소", "1.2GB 정리 가능\n(다운로드 폴더)", "#D35400", f_sub, f_body, command=self.app.show_clean)
+        self.card_clean, self.lbl_clean_title, self.lbl_clean_content = self.create_clickable_card(
+            1, 0, "🧹 디지털 청소", "불러오는 중...", "#D35400", f_sub, f_body, command=self.app.show_clean
+        )
         self.card_startup, self.lbl_startup_title, self.lbl_startup_content = self.create_clickable_card(
             1, 1, "✅ 시작 프로그램", "검사 중...", "#27AE60", f_sub, f_body, command=self.app.show_startup
         )
+        self.process_summary = None
+        self.card_process, self.lbl_process_title, self.lbl_process_content = self.create_clickable_card(
+            2, 0, "⚙️ 실행 중인 프로그램", "감시 준비 중...", "#7F8C8D", f_sub, f_body, command=self.show_process_activity, columnspan=2
+        )
+        # 카드 내용은 앱이 작업 스레드에서 불러와 apply_changes()로 넣어줌 (저장된 요약 -> 새로 읽은 요약 순)
         
-    def create_clickable_card(self, row, col, title, content, color, f_sub, f_body, command):
+    def create_clickable_card(self, row, col, title, content, color, f_sub, f_body, command, columnspan=1):
         # 1. 카드 프레임 생성
         card = ctk.CTkFrame(self.grid_frame, corner_radius=15, border_width=2, border_color=color, cursor="hand2")
-        card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+        card.grid(row=row, column=col, columnspan=columnspan, padx=10, pady=10, sticky="nsew")
         
         # 2. 내부 텍스트 생성 (이벤트 전달을 위해 변수에 저장)
         lbl_t = ctk.CTkLabel(card, text=title, font=f_sub, text_color=color)
@@ -148,8 +321,24 @@ class DashboardFrame(ctk.CTkFrame):
 
         return card, lbl_t, lbl_c
     
+    def apply_changes(self, changes):
+        # 바뀐 카드만 다시 그림 ({카드: 요약}, "score"는 제목의 점수)
+        handlers = {"score": self.update_score_ui, "startup": self.update_startup_ui, "scan": self.update_scan_ui,
+                    "clean": self.update_clean_ui, "process": self.update_process_ui}
+        for name, summary in changes.items():
+            handlers[name](summary)
+
+    def update_score_ui(self, score):
+        if score is None:
+            self.lbl_title.configure(text="안녕하세요! 보안 점수를 계산하고 있습니다...")
+        else:
+            self.lbl_title.configure(text=f"안녕하세요! 현재 PC 보안 점수는 {score}점입니다.")
+
     # [핵심] 대시보드 상태를 업데이트하는 함수 추가
-    def update_startup_ui(self, status, count):
+    def update_startup_ui(self, summary):
+        if summary is None:
+            return
+        status, count = summary["status"], summary["count"]
         if status == "SAFE":
             self.card_startup.configure(border_color="#27AE60") # 초록
             self.lbl_startup_title.configure(text="✅ 시작 프로그램", text_color="#27AE60")
@@ -157,57 +346,461 @@ class DashboardFrame(ctk.CTkFrame):
         elif status == "WARNING":
             self.card_startup.configure(border_color="#C0392B") # 빨강
             self.lbl_startup_title.configure(text="🚨 시작 프로그램", text_color="#C0392B")
-            self.lbl_startup_content.configure(text=f"{count}개의 변경 감지됨!\n확인이 필요합니다.")
+            detail = f"(차단 목록 {summary['denied']}개)" if summary["denied"] else "확인이 필요합니다."
+            if summary["binary"]:
+                detail = f"실행 파일 교체 {summary['binary']}개 · " + detail
+            self.lbl_startup_content.configure(text=f"{count}개의 변경 감지됨!\n{detail}")
         elif status == "FIRST_RUN":
             self.card_startup.configure(border_color="#2980B9") # 파랑
             self.lbl_startup_title.configure(text="ℹ️ 감시 시작", text_color="#2980B9")
             self.lbl_startup_content.configure(text="기준 스냅샷 생성 완료")
+        elif status == "RESET":
+            self.card_startup.configure(border_color="#E67E22") # 주황
+            self.lbl_startup_title.configure(text="⚠️ 시작 프로그램", text_color="#E67E22")
+            self.lbl_startup_content.configure(text=f"기준 스냅샷이 손상되어 새로 만들었습니다\n{count}개 항목을 다시 확인해 주세요")
+
+
+    def update_scan_ui(self, summary):
+        # 스캔 색인 요약으로 개인정보 카드 갱신
+        if not summary["scanned"]:
+            self.card_scan.configure(border_color="#2980B9") # 파랑
+            self.lbl_scan_title.configure(text="📄 개인정보 스캔", text_color="#2980B9")
+            self.lbl_scan_content.configure(text="아직 스캔하지 않았습니다\n(눌러서 스캔 시작)")
+        elif summary["files_with_pii"]:
+            labels = ScanFrame.PII_LABELS
+            top_kind = max(summary["by_kind"], key=summary["by_kind"].get)
+            self.card_scan.configure(border_color="#C0392B") # 빨강
+            self.lbl_scan_title.configure(text="⚠️ 개인정보 노출", text_color="#C0392B")
+            self.lbl_scan_content.configure(
+                text=f"{summary['matches']}건 발견됨\n(파일 {summary['files_with_pii']}개, 주로 {labels.get(top_kind, top_kind)})"
+            )
+        else:
+            self.card_scan.configure(border_color="#27AE60") # 초록
+            self.lbl_scan_title.configure(text="✅ 개인정보 노출", text_color="#27AE60")
+            self.lbl_scan_content.configure(text="발견된 개인정보 없음")
+
+
+    def update_process_ui(self, summary):
+        # 프로세스 감시 요약으로 카드 갱신 (최근 5분 안에 새 리슨 포트가 생겼으면 경고)
+        self.process_summary = summary
+        detail = (f"프로세스 {summary['processes']:,}개 · 리슨 포트 {summary['listening']}개 · 외부 연결 {summary['outbound']}개\n"
+                  f"최근 새 프로세스 {summary['recent_new']}개 · 승인된 시작프로그램 실행 {summary['startup_running']}개")
+        if summary["recent_listening"]:
+            ports = ", ".join(f"{item['name'] or '?'}:{item['port']}" for item in summary["recent_listening"][-3:])
+            self.card_process.configure(border_color="#E67E22") # 주황
+            self.lbl_process_title.configure(text="⚠️ 새로 열린 포트", text_color="#E67E22")
+            self.lbl_process_content.configure(text=f"{ports}\n{detail}")
+        else:
+            self.card_process.configure(border_color="#27AE60") # 초록
+            self.lbl_process_title.configure(text="⚙️ 실행 중인 프로그램", text_color="#27AE60")
+            self.lbl_process_content.configure(text=detail)
+
+    def show_process_activity(self):
+        # 카드를 누르면 최근 프로세스/연결 변화 목록
+        if self.process_summary is None:
+            return
+        labels = {"new": "시작", "exited": "종료", "new_listening": "포트 열림", "new_outbound": "외부 연결"}
+        lines = []
+        for at, kind, item in reversed(self.process_summary["recent"]):
+            target = item.get("exe") or item.get("name") or "?"
+            if "port" in item:
+                target = f"{item['name'] or '?'} → {item['ip']}:{item['port']}"
+            lines.append(f"{time.strftime('%H:%M:%S', time.localtime(at))}  [{labels[kind]}] {target}")
+        messagebox.showinfo("최근 프로세스 활동", "\n".join(lines) or "최근 변화가 없습니다.")
+
+    def update_clean_ui(self, summary):
+        # 지난 청소 분석 요약으로 청소 카드 갱신
+        if summary is None:
+            self.lbl_clean_content.configure(text="아직 분석하지 않았습니다\n(눌러서 분석 시작)")
+            return
+        CATEGORY_LABELS = PROFILER.lazy_import("clean_analyzer").CATEGORY_LABELS # 저장된 요약으로 그릴 때는 처음 불러올 수도 있음
+        by_category = summary["by_category"]
+        if by_category:
+            top = max(by_category, key=by_category.get)
+            detail = f"(주로 {CATEGORY_LABELS.get(top, top)})"
+        else:
+            detail = "(정리할 파일 없음)"
+        self.lbl_clean_content.configure(text=f"{format_size(summary['reclaimable'])} 정리 가능\n{detail}")
 
 
 # --- 나머지 프레임들은 동일 ---
 
 class ScanFrame(ctk.CTkFrame):
-    def __init__(self, master, f_title, f_body):
+    PII_LABELS = {"rrn": "주민번호", "phone": "전화번호", "card": "카드번호", "email": "이메일", "password": "비밀번호"}
+
+    def __init__(self, master, f_title, f_body, runner, services, on_summary):
         super().__init__(master, corner_radius=0, fg_color="transparent")
+        self.runner = runner
+        self.services = services
+        self.on_summary = on_summary # 요약이 바뀌면 대시보드에 알려줌
+        self.f_body = f_body
+        self.scan_roots = [os.path.expanduser("~")] # 기본 검사 위치: 사용자 폴더
         ctk.CTkLabel(self, text="📄 개인정보 정밀 스캔", font=f_title).pack(pady=20, padx=20, anchor="w")
-        self.btn_start = ctk.CTkButton(self, text="내 PC 스캔 시작", height=50, font=f_body, fg_color="#E67E22", hover_color="#D35400")
+        self.btn_start = ctk.CTkButton(self, text="내 PC 스캔 시작", height=50, font=f_body, fg_color="#E67E22", hover_color="#D35400", command=self.toggle_scan)
         self.btn_start.pack(pady=10, fill="x", padx=40)
-        self.scroll_frame = ctk.CTkScrollableFrame(self, label_text="검출된 파일 목록", label_font=f_body)
-        self.scroll_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        for i in range(5):
-            row = ctk.CTkFrame(self.scroll_frame)
-            row.pack(fill="x", pady=5)
-            ctk.CTkLabel(row, text=f"C:/Users/User/Desktop/secret_{i}.txt", font=f_body, anchor="w").pack(side="left", padx=10)
-            ctk.CTkButton(row, text="삭제", width=60, font=f_body, fg_color="#C0392B").pack(side="right", padx=5)
+        self.lbl_progress = ctk.CTkLabel(self, text="", font=f_body)
+        self.lbl_progress.pack(padx=20, anchor="w")
+
+        # 종류별 보기 (목록을 다시 만들지 않고 보이는 항목만 거름)
+        self.kind_by_label = {"전체": None, **{label: kind for kind, label in self.PII_LABELS.items()}}
+        self.opt_kind = ctk.CTkOptionMenu(self, values=list(self.kind_by_label), font=f_body, command=self.filter_kind)
+        self.opt_kind.pack(padx=20, pady=(10, 0), anchor="e")
+
+        # 검출 건수가 많은 파일부터 (결과가 수만 개여도 보이는 줄만 위젯으로 만듦)
+        model = ListModel(key=lambda result: result["path"], sort_key=lambda result: sum(result["counts"].values()), reverse=True)
+        self.result_list = VirtualList(self, self.create_result_row, self.bind_result_row, model=model, row_height=56,
+                                       label_text="검출된 파일 목록", label_font=f_body)
+        self.result_list.pack(fill="both", expand=True, padx=20, pady=(10, 20))
+        self.load_from_index()
+
+    @property
+    def index(self):
+        # 스캔 색인 (지난 결과 재사용) - 앱 전체에서 하나
+        return self.services.get("scan_index")
+
+    def load_from_index(self):
+        # 지난 스캔 결과를 색인에서 바로 보여줌 (파일을 다시 읽지 않음)
+        self.runner.submit("scan_index", lambda: (self.index.summary(), self.index.findings()),
+                           on_done=self._on_index_loaded)
+
+    def _on_index_loaded(self, result):
+        summary, findings = result
+        if self.runner.is_busy("pii_scan"):
+            return # 그 사이 스캔이 시작됐으면 스캔 결과가 우선
+        self.result_list.extend(findings)
+        if summary["scanned"]:
+            self.lbl_progress.configure(text=f"지난 스캔 결과: 개인정보 포함 파일 {summary['files_with_pii']:,}개 ({summary['matches']:,}건)")
+        self.on_summary(summary)
+
+    def toggle_scan(self):
+        # 스캔 중에 한 번 더 누르면 중지
+        if self.runner.is_busy("pii_scan"):
+            self.runner.cancel("pii_scan")
+            self.btn_start.configure(text="중지하는 중...")
+            return
+        self.result_list.clear()
+        self.btn_start.configure(text="⏹ 스캔 중지")
+        self.lbl_progress.configure(text="파일 목록을 모으는 중...")
+        self.runner.submit("pii_scan", self._scan_worker, pass_cancel=True, on_error=self._on_scan_error)
+
+    def _scan_worker(self, cancel_event):
+        # 작업 스레드에서 실행: 찾은 결과는 모아서 0.2초마다 UI로 보냄
+        scanner = PROFILER.lazy_import("pii_scanner").PIIScanner()
+        found, last_post = [], time.perf_counter()
+        for result in scanner.scan(self.scan_roots, cancel_event, index=self.index):
+            if result["counts"]:
+                found.append(result)
+            if time.perf_counter() - last_post >= 0.2:
+                self.runner.post(self._on_scan_progress, found, scanner.stats.snapshot())
+                found, last_post = [], time.perf_counter()
+        self.runner.post(self._on_scan_progress, found, scanner.stats.snapshot())
+        self.runner.post(self._on_scan_finished, scanner.stats.snapshot(), cancel_event.is_set(), self.index.summary())
+
+    def _on_scan_progress(self, results, stats):
+        self.result_list.extend(results)
+        self.lbl_progress.configure(
+            text=f"{stats['files_scanned']:,} / {stats['files_found']:,}개 파일 검사  ·  "
+                 f"{stats['files_per_sec']:,.0f}개/초  ·  {stats['mb_per_sec']:.1f}MB/초  ·  "
+                 f"개인정보 포함 {stats['files_with_pii']:,}개"
+        )
+
+    def _on_scan_finished(self, stats, cancelled, summary):
+        self.btn_start.configure(text="내 PC 스캔 시작")
+        state = "중지됨" if cancelled else "완료"
+        self.lbl_progress.configure(
+            text=f"스캔 {state}: {stats['files_scanned']:,}개 파일 (변경 없어 건너뜀 {stats['files_cached']:,}개), "
+                 f"{stats['elapsed']:.1f}초  ·  개인정보 포함 파일 {stats['files_with_pii']:,}개 ({stats['matches']:,}건)"
+        )
+        self.on_summary(summary)
+
+    def _on_scan_error(self, error):
+        self.btn_start.configure(text="내 PC 스캔 시작")
+        self.lbl_progress.configure(text=f"스캔 오류: {error}")
+
+    def filter_kind(self, label):
+        kind = self.kind_by_label[label]
+        self.result_list.set_filter(None if kind is None else lambda result: kind in result["counts"])
+
+    def create_result_row(self, parent):
+        # 행 위젯은 화면에 보이는 줄 수만큼만 만들어지고, 스크롤하면 bind_result_row로 내용만 바뀜
+        row = ctk.CTkFrame(parent, height=52)
+        row.lbl_info = ctk.CTkLabel(row, text="", font=self.f_body, anchor="w", justify="left")
+        row.lbl_info.pack(side="left", padx=10)
+        row.btn_delete = ctk.CTkButton(row, text="삭제", width=60, font=self.f_body, fg_color="#C0392B")
+        row.btn_delete.pack(side="right", padx=5)
+        return row
+
+    def bind_result_row(self, row, result):
+        summary = ", ".join(f"{self.PII_LABELS.get(kind, kind)} {count}" for kind, count in result["counts"].items())
+        row.lbl_info.configure(text=f"{result['path']}\n({summary})")
+        row.btn_delete.configure(command=lambda: self.delete_result(result))
+
+    def delete_result(self, result):
+        # 개인정보가 든 파일은 복구할 수 없도록 덮어쓴 뒤 삭제
+        if not messagebox.askyesno("보안 삭제", f"{result['path']}\n\n이 파일을 복구할 수 없게 삭제할까요?"):
+            return
+        # 보안 삭제 화면의 "wipe" 작업과 키를 나눔 (그 뒤에 줄 서거나 그 화면의 중지 버튼에 같이 취소되지 않도록)
+        self.runner.submit("scan_delete", lambda: PROFILER.lazy_import("wipe_engine").WipeJob([result["path"]]).run(),
+                           on_done=lambda snap: self._on_deleted(result, snap))
+
+    def _forget_paths(self, paths):
+        # 작업 스레드에서 실행: 색인에서 빼고 새 요약 반환
+        self.index.forget(paths)
+        return self.index.summary()
+
+    def _on_deleted(self, result, snap):
+        if snap["done"]:
+            self.result_list.remove([result["path"]])
+            self.runner.submit("scan_index", self._forget_paths, [result["path"]], on_done=self.on_summary)
+        else:
+            messagebox.showerror("보안 삭제", f"삭제하지 못했습니다.\n{result['path']}")
 
 class WipeFrame(ctk.CTkFrame):
-    def __init__(self, master, f_title, f_body):
+    def __init__(self, master, f_title, f_body, runner):
         super().__init__(master, corner_radius=0, fg_color="transparent")
+        self.runner = runner
         ctk.CTkLabel(self, text="🔒 완전 보안 삭제 (디지털 세탁소)", font=f_title).pack(pady=20, padx=20, anchor="w")
         self.drop_zone = ctk.CTkFrame(self, border_width=2, border_color="gray", corner_radius=20, fg_color=("#E0E0E0", "#2B2B2B"))
         self.drop_zone.pack(fill="both", expand=True, padx=40, pady=20)
-        ctk.CTkLabel(self.drop_zone, text="이곳에 파일을 드래그하세요", font=f_title).place(relx=0.5, rely=0.4, anchor="center")
-        self.btn_select = ctk.CTkButton(self.drop_zone, text="파일 선택하기", font=f_body, command=lambda: print("클릭"))
-        self.btn_select.place(relx=0.5, rely=0.6, anchor="center")
+        ctk.CTkLabel(self.drop_zone, text="이곳에 파일을 드래그하세요", font=f_title).place(relx=0.5, rely=0.3, anchor="center")
+        self.btn_select = ctk.CTkButton(self.drop_zone, text="파일 선택하기", font=f_body, command=self.select_files)
+        self.btn_select.place(relx=0.4, rely=0.5, anchor="center")
+        self.btn_select_folder = ctk.CTkButton(self.drop_zone, text="폴더 선택하기", font=f_body, command=self.select_folder)
+        self.btn_select_folder.place(relx=0.6, rely=0.5, anchor="center")
+
+        # 삭제 방식 선택 (라벨 -> 방식 키)
+        wipe_engine = PROFILER.lazy_import("wipe_engine")
+        self.scheme_by_label = {wipe_engine.SCHEME_LABELS[key]: key for key in wipe_engine.WIPE_SCHEMES}
+        self.opt_scheme = ctk.CTkOptionMenu(self.drop_zone, values=list(self.scheme_by_label), font=f_body)
+        self.opt_scheme.set(wipe_engine.SCHEME_LABELS["3pass"])
+        self.opt_scheme.place(relx=0.5, rely=0.65, anchor="center")
+
+        # 진행 상황 (파일별/전체 속도)
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.set(0)
+        self.lbl_progress = ctk.CTkLabel(self, text="", font=f_body)
+        self.btn_cancel = ctk.CTkButton(self, text="중지", font=f_body, fg_color="#C0392B", command=lambda: self.runner.cancel("wipe"))
+
+    def select_files(self):
+        paths = filedialog.askopenfilenames(title="안전하게 삭제할 파일 선택")
+        if paths:
+            self.wipe_paths(list(paths))
+
+    def select_folder(self):
+        path = filedialog.askdirectory(title="안전하게 삭제할 폴더 선택")
+        if path:
+            self.wipe_paths([path])
+
+    def wipe_paths(self, paths):
+        if self.runner.is_busy("wipe"):
+            messagebox.showinfo("보안 삭제", "이미 삭제 작업이 진행 중입니다.")
+            return
+        scheme = self.scheme_by_label[self.opt_scheme.get()]
+        names = "\n".join(os.path.basename(path.rstrip("/\\")) or path for path in paths[:5])
+        more = f"\n외 {len(paths) - 5}개" if len(paths) > 5 else ""
+        if not messagebox.askyesno("보안 삭제", f"다음 항목을 복구할 수 없게 삭제합니다.\n\n{names}{more}\n\n계속할까요?"):
+            return
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x", padx=40)
+        self.lbl_progress.pack(pady=5)
+        self.btn_cancel.pack(pady=(0, 20))
+        self.lbl_progress.configure(text="삭제할 파일을 모으는 중...")
+        self.runner.submit("wipe", self._wipe_worker, paths, scheme, pass_cancel=True, on_error=self._on_wipe_error)
+
+    def _wipe_worker(self, paths, scheme, cancel_event):
+        # 작업 스레드에서 실행: 진행률은 post()로 UI에 전달
+        from wipe_engine import WipeJob # 화면을 만들 때 이미 불러옴
+        job = WipeJob(paths, scheme=scheme)
+        result = job.run(cancel_event, on_progress=lambda snap: self.runner.post(self._on_wipe_progress, snap))
+        self.runner.post(self._on_wipe_finished, result, cancel_event.is_set())
+
+    def _on_wipe_progress(self, snap):
+        self.progress_bar.set(snap["progress"])
+        current = ", ".join(f"{os.path.basename(f['path'])} {f['mb_per_sec']:.0f}MB/s" for f in snap["running"][:3])
+        self.lbl_progress.configure(
+            text=f"{snap['done']}/{snap['files']}개 완료  ·  전체 {snap['mb_per_sec']:.0f}MB/s\n{current}"
+        )
+
+    def _on_wipe_finished(self, snap, cancelled):
+        self.btn_cancel.pack_forget()
+        self.progress_bar.set(snap["progress"])
+        state = "중지됨" if cancelled else "완료"
+        failed = f", 실패 {snap['failed']}개" if snap["failed"] else ""
+        self.lbl_progress.configure(
+            text=f"보안 삭제 {state}: {snap['done']}/{snap['files']}개{failed}  ·  "
+                 f"{snap['written'] / (1024 * 1024):.0f}MB, {snap['elapsed']:.1f}초 ({snap['mb_per_sec']:.0f}MB/s)"
+        )
+
+    def _on_wipe_error(self, error):
+        self.btn_cancel.pack_forget()
+        self.lbl_progress.configure(text=f"삭제 오류: {error}")
 
 class CleanFrame(ctk.CTkFrame):
-    def __init__(self, master, f_title, f_body):
+    def __init__(self, master, f_title, f_body, runner, services, on_summary):
         super().__init__(master, corner_radius=0, fg_color="transparent")
+        self.runner = runner
+        self.services = services
+        clean_analyzer = PROFILER.lazy_import("clean_analyzer")
+        self.category_labels = clean_analyzer.CATEGORY_LABELS
+        self.auto_select = clean_analyzer.AUTO_SELECT # 처음부터 체크해 두는 분류 (오래된 파일은 제외)
+        self.on_summary = on_summary # 분석이 끝나면 대시보드에 알려줌
+        self.f_body = f_body
+        self.clean_roots = [os.path.expanduser("~")]
+        self.selection = {} # 사용자가 직접 바꾼 체크 상태: 경로 -> bool (행 위젯은 재사용되므로 선택 상태는 여기에 보관)
         ctk.CTkLabel(self, text="🧹 디지털 찌꺼기 청소", font=f_title).pack(pady=20, padx=20, anchor="w")
-        ctk.CTkLabel(self, text="총 2.5GB의 불필요한 파일 정리 가능", font=f_body, text_color="#F39C12").pack(pady=10)
-        self.list_frame = ctk.CTkScrollableFrame(self)
-        self.list_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        for i in range(10):
-            chk = ctk.CTkCheckBox(self.list_frame, text=f"오래된_과제파일_{i}.pdf", font=f_body)
-            chk.pack(anchor="w", pady=5, padx=10)
-            chk.select()
-        ctk.CTkButton(self, text="정리하기", height=45, font=f_body, fg_color="#27AE60").pack(fill="x", padx=40, pady=20)
+        self.lbl_summary = ctk.CTkLabel(self, text="분석을 시작하면 정리 가능한 파일을 찾아드립니다", font=f_body, text_color="#F39C12")
+        self.lbl_summary.pack(pady=(10, 0))
+        self.lbl_progress = ctk.CTkLabel(self, text="", font=f_body)
+        self.lbl_progress.pack()
+        self.toolbar = ctk.CTkFrame(self, fg_color="transparent")
+        self.toolbar.pack(fill="x", padx=20, pady=5)
+        self.btn_analyze = ctk.CTkButton(self.toolbar, text="분석 시작", font=f_body, command=self.toggle_analyze)
+        self.btn_analyze.pack(side="left")
+        self.category_by_label = {"전체": None, **{label: category for category, label in self.category_labels.items()}}
+        self.opt_category = ctk.CTkOptionMenu(self.toolbar, values=list(self.category_by_label), font=f_body, command=self.filter_category)
+        self.opt_category.pack(side="right")
+
+        # 큰 파일부터 (후보가 수만 개여도 보이는 줄만 위젯으로 만듦)
+        model = ListModel(key=lambda item: item["path"], sort_key=lambda item: item["size"], reverse=True)
+        self.candidate_list = VirtualList(self, self.create_candidate_row, self.bind_candidate_row, model=model,
+                                          row_height=36, label_text="정리 후보", label_font=f_body)
+        self.candidate_list.pack(fill="both", expand=True, padx=20, pady=10)
+        ctk.CTkButton(self, text="정리하기", height=45, font=f_body, fg_color="#27AE60", command=self.clean_selected).pack(fill="x", padx=40, pady=20)
+        self.load_last_summary()
+
+    @property
+    def analyzer(self):
+        # 디지털 청소 분석기 - 앱 전체에서 하나
+        return self.services.get("clean_analyzer")
+
+    def load_last_summary(self):
+        # 지난 분석 요약을 바로 보여줌 (디스크를 다시 훑지 않음)
+        self.runner.submit("clean_summary", lambda: self.analyzer.last_summary(), on_done=self._on_last_summary)
+
+    def _on_last_summary(self, summary):
+        if summary is not None and not self.runner.is_busy("clean"):
+            self.show_summary(summary, prefix="지난 분석: ")
+        self.on_summary(summary)
+
+    def show_summary(self, summary, prefix=""):
+        self.lbl_summary.configure(
+            text=f"{prefix}총 {format_size(summary['reclaimable'])}의 불필요한 파일 정리 가능 "
+                 f"(전체 {format_size(summary['total_size'])}, 파일 {summary['files']:,}개)"
+        )
+
+    def toggle_analyze(self):
+        if self.runner.is_busy("clean"):
+            self.runner.cancel("clean")
+            self.btn_analyze.configure(text="중지하는 중...")
+            return
+        if self.runner.is_busy("clean_delete"):
+            return
+        self.candidate_list.clear()
+        self.selection.clear()
+        self.btn_analyze.configure(text="⏹ 분석 중지")
+        self.runner.submit("clean", self._analyze_worker, pass_cancel=True, on_error=self._on_analyze_error)
+
+    def _analyze_worker(self, cancel_event):
+        # 작업 스레드에서 실행: 찾은 항목은 모아서 0.2초마다 UI로 보냄
+        items, kept, last_post, summary = [], [], time.perf_counter(), None
+        for kind, payload in self.analyzer.analyze(self.clean_roots, cancel_event):
+            if kind == "candidate":
+                items.append({"path": payload["path"], "size": payload["size"], "category": payload["category"]})
+            elif kind == "duplicate":
+                # 분석기가 고른 사본 하나는 남기고 나머지만 정리 후보로 (남길 사본이 다른 분류의 후보였다면 목록에서 뺌)
+                kept.append(payload["keep"])
+                items = [item for item in items if item["path"] != payload["keep"]]
+                items.extend({"path": path, "size": payload["size"], "category": "duplicate"} for path in payload["remove"])
+            elif kind == "done":
+                summary = payload
+            if kind == "progress" or time.perf_counter() - last_post >= 0.2:
+                self.runner.post(self._on_analyze_progress, items, kept, self.analyzer.stats.snapshot())
+                items, kept, last_post = [], [], time.perf_counter()
+        self.runner.post(self._on_analyze_progress, items, kept, self.analyzer.stats.snapshot())
+        self.runner.post(self._on_analyze_finished, summary)
+
+    def _on_analyze_progress(self, items, kept, stats):
+        if kept:
+            self.candidate_list.remove(kept)
+        self.candidate_list.extend(item for item in items if item["path"] not in self.candidate_list.model)
+        self.lbl_progress.configure(
+            text=f"폴더 {stats['dirs']:,}개 · 파일 {stats['files']:,}개 · {format_size(stats['total_size'])} 확인 ({stats['elapsed']:.1f}초)"
+        )
+
+    def _on_analyze_finished(self, summary):
+        self.btn_analyze.configure(text="분석 시작")
+        if summary is None:
+            self.lbl_progress.configure(text="분석을 중지했습니다.")
+            return
+        self.show_summary(summary)
+        self.on_summary(summary)
+
+    def _on_analyze_error(self, error):
+        self.btn_analyze.configure(text="분석 시작")
+        self.lbl_progress.configure(text=f"분석 오류: {error}")
+
+    def filter_category(self, label):
+        category = self.category_by_label[label]
+        self.candidate_list.set_filter(None if category is None else lambda item: item["category"] == category)
+
+    def create_candidate_row(self, parent):
+        row = ctk.CTkFrame(parent, height=34, fg_color="transparent")
+        row.chk = ctk.CTkCheckBox(row, text="", font=self.f_body)
+        row.chk.pack(side="left", padx=10)
+        return row
+
+    def bind_candidate_row(self, row, item):
+        path = item["path"]
+        row.chk.configure(text=f"[{self.category_labels[item['category']]}] {path} ({format_size(item['size'])})",
+                          command=lambda: self.toggle_candidate(path, row.chk.get()))
+        if self.is_checked(item):
+            row.chk.select()
+        else:
+            row.chk.deselect()
+
+    def is_checked(self, item):
+        return self.selection.get(item["path"], item["category"] in self.auto_select)
+
+    def toggle_candidate(self, path, checked):
+        self.selection[path] = bool(checked)
+
+    def clean_selected(self):
+        # 지금 보이는(필터를 통과한) 후보 중 체크된 것만 정리 (분석/삭제 중에는 받지 않음)
+        if self.runner.is_busy("clean") or self.runner.is_busy("clean_delete"):
+            return
+        items = [item for item in self.candidate_list.model.items() if self.is_checked(item)]
+        if not items:
+            return
+        paths = [item["path"] for item in items]
+        total = sum(item["size"] for item in items)
+        if not messagebox.askyesno("디지털 청소", f"선택한 파일 {len(paths):,}개 ({format_size(total)})를 삭제할까요?"):
+            return
+        self.runner.submit("clean_delete", self._delete_files, paths, on_done=self._on_cleaned)
+
+    def _delete_files(self, paths):
+        # 작업 스레드에서 실행
+        removed = []
+        for path in paths:
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError as e:
+                print(f"삭제 오류: {e}")
+        return removed
+
+    def _on_cleaned(self, removed):
+        model = self.candidate_list.model
+        freed = sum(model.get(path)["size"] for path in removed if path in model)
+        self.candidate_list.remove(removed)
+        self.lbl_progress.configure(text=f"{len(removed):,}개 파일, {format_size(freed)} 정리 완료")
 
 class StartupFrame(ctk.CTkFrame):
-    def __init__(self, master, f_title, f_body):
+    def __init__(self, master, f_title, f_body, runner, services, on_check, last_result=None):
         super().__init__(master, corner_radius=0, fg_color="transparent")
         
-        self.monitor = StartupMonitor()
+        self.services = services # 감시자(StartupMonitor)는 앱과 같은 것을 씀
+        self.on_check = on_check # 검사는 앱이 실행하고 결과를 update_ui로 넣어줌 (대시보드도 함께 갱신)
+        self.runner = runner # 백그라운드 작업 실행기
         self.f_body = f_body # 폰트 저장해둠
         
         ctk.CTkLabel(self, text="🚀 시작 프로그램 감시", font=f_title).pack(pady=20, padx=20, anchor="w")
@@ -221,24 +814,40 @@ class StartupFrame(ctk.CTkFrame):
         
         # 2. 감지된 항목 리스트 (여기에 버튼이 들어감)
         self.lbl_warning_detail = ctk.CTkLabel(self, text="[새로 발견된 프로그램 - 승인 필요]", text_color="#E74C3C", font=f_body)
-        # 스크롤 가능한 프레임으로 변경 (버튼을 넣기 위해)
-        self.scroll_list = ctk.CTkScrollableFrame(self, height=200, label_text="감지 목록")
+        # 보이는 줄만 위젯으로 만드는 목록 (항목이 많아도 다시 그리는 비용이 일정함)
+        self.scroll_list = VirtualList(self, self.create_item_row, self.bind_item_row, height=200, row_height=56,
+                                       model=ListModel(key=lambda item: item["key"]), label_text="감지 목록")
+        self.btn_approve_all = ctk.CTkButton(self, text="모두 승인", command=self.approve_all, font=f_body, fg_color="#27AE60", hover_color="#2ECC71")
+        self.pending_items = []
         
         # 3. 수동 검사 버튼
         self.btn_refresh = ctk.CTkButton(self, text="🔄 다시 검사하기", command=self.run_manual_check, font=f_body, fg_color="#555555")
         self.btn_refresh.pack(side="bottom", pady=20)
 
+        # 화면을 처음 열기 전에 끝난 검사가 있으면 바로 표시
+        if last_result is not None:
+            self.update_ui(*last_result)
+
+    @property
+    def monitor(self):
+        return self.services.get("startup_monitor")
+
     def run_manual_check(self):
-        # 수동 버튼 눌렀을 때 실행
-        status, new_items = self.monitor.check_for_changes()
-        self.update_ui(status, new_items)
+        # 수동 버튼 눌렀을 때 실행 (여러 번 눌러도 대기 중인 검사는 하나로 합쳐짐)
+        self.on_check()
+
+    def show_checking(self):
+        # 검사가 끝날 때까지 '검사 중' 상태 표시
+        self.status_box.configure(fg_color="gray")
+        self.lbl_status.configure(text="⏳ 검사 중...")
 
     def update_ui(self, status, new_items):
         # UI 초기화 (기존 목록 지우기)
         self.lbl_warning_detail.pack_forget()
         self.scroll_list.pack_forget()
-        for widget in self.scroll_list.winfo_children():
-            widget.destroy()
+        self.btn_approve_all.pack_forget()
+        self.pending_items = new_items
+        self.scroll_list.clear()
 
         if status == "SAFE":
             self.status_box.configure(fg_color="#1E8449") # 초록
@@ -248,61 +857,231 @@ class StartupFrame(ctk.CTkFrame):
             self.status_box.configure(fg_color="#2980B9") # 파랑
             self.lbl_status.configure(text="ℹ️ 기준 스냅샷을 생성했습니다.")
             
-        elif status == "WARNING":
-            self.status_box.configure(fg_color="#C0392B") # 빨강
-            self.lbl_status.configure(text=f"🚨 {len(new_items)}개의 새로운 시작프로그램 감지!")
+        elif status == "ERROR":
+            self.status_box.configure(fg_color="#7F8C8D") # 회색
+            self.lbl_status.configure(text="⚠️ 시작 프로그램 정보를 읽지 못했습니다.")
+
+        elif status in ("WARNING", "RESET"):
+            if status == "RESET":
+                # 손상된 기준 스냅샷을 새로 만듦 - 지금 등록된 항목을 그대로 믿지 않고 전부 다시 승인받음
+                self.status_box.configure(fg_color="#E67E22") # 주황
+                self.lbl_status.configure(text=f"⚠️ 기준 스냅샷이 손상되어 새로 만들었습니다. {len(new_items)}개 항목을 확인하세요")
+            else:
+                self.status_box.configure(fg_color="#C0392B") # 빨강
+                self.lbl_status.configure(text=f"🚨 {len(new_items)}개의 새로운/변경된 시작프로그램 감지!")
+            if not new_items:
+                return
             
             # 리스트 보여주기
             self.lbl_warning_detail.pack(pady=(10, 5))
             self.scroll_list.pack(fill="x", padx=20)
+            self.btn_approve_all.pack(pady=(10, 0))
             
-            # [핵심] 각 아이템마다 '승인' 버튼 생성
-            for item in new_items:
-                self.create_item_row(item)
+            # [핵심] 각 아이템마다 '승인' 버튼 (보이는 줄만 만들어짐)
+            self.scroll_list.extend(new_items)
 
-    def create_item_row(self, item):
-        row = ctk.CTkFrame(self.scroll_list)
-        row.pack(fill="x", pady=5)
+    def create_item_row(self, parent):
+        row = ctk.CTkFrame(parent, height=52)
         
-        # 프로그램 정보 (이름, 경로)
-        info_text = f"{item['name']}\n({item['path']})"
-        ctk.CTkLabel(row, text=info_text, anchor="w", font=self.f_body).pack(side="left", padx=10, pady=5)
+        # 프로그램 정보 (이름, 경로) - 내용은 bind_item_row에서 채움
+        row.lbl_info = ctk.CTkLabel(row, text="", anchor="w", justify="left", font=self.f_body)
+        row.lbl_info.pack(side="left", padx=10, pady=5)
         
         # 승인 버튼
-        btn_approve = ctk.CTkButton(
+        row.btn_approve = ctk.CTkButton(
             row, 
             text="승인 (안전함)", 
             width=100, 
             fg_color="#27AE60", 
-            hover_color="#2ECC71",
-            command=lambda: self.approve_item(item)
+            hover_color="#2ECC71"
         )
-        btn_approve.pack(side="right", padx=10)
+        row.btn_approve.pack(side="right", padx=10)
+        return row
+
+    def bind_item_row(self, row, item):
+        info_text = f"{item['name']}  [{item['source']}]\n({item['path']})"
+        if item['change'] == "modified":
+            info_text = f"[경로 변경] {item['name']}  [{item['source']}]\n({item['old_path']} → {item['path']})"
+        elif item['change'] == "binary":
+            # 이름/경로는 같은데 실행 파일 내용이 바뀜 (교체된 실행 파일)
+            info_text = f"[실행 파일 변경] {item['name']}  [{item['source']}]\n({item['exe']}  SHA-256 {item['old_sha256'][:12]}… → {item['sha256'][:12]}…)"
+        if item.get('reputation') == "deny":
+            info_text = "[차단 목록] " + info_text
+        elif item.get('reputation') == "allow":
+            info_text = "[신뢰 목록] " + info_text
+        row.lbl_info.configure(text=info_text)
+        # 차단 목록에 있는 파일은 승인해도 계속 경고되므로 버튼을 막음
+        denied = item.get('reputation') == "deny"
+        row.btn_approve.configure(command=lambda: self.approve_item(item), state="disabled" if denied else "normal")
 
     def approve_item(self, item):
-        # 1. 로직에게 "이거 저장해!"라고 명령
-        success = self.monitor.approve_new_program(item['name'], item['path'])
-        
+        # 1. 로직에게 "이거 저장해!"라고 명령 (파일 쓰기는 작업 스레드에서)
+        self.runner.submit("startup", lambda: self.monitor.approve_programs([item]),
+                           on_done=lambda success: self._on_approved([item], success))
+
+    def approve_all(self):
+        # 목록 전체를 한 번의 저장으로 승인 (차단 목록 항목은 제외)
+        items = [item for item in self.pending_items if item.get('reputation') != "deny"]
+        if not items:
+            return
+        self.runner.submit("startup", lambda: self.monitor.approve_programs(items),
+                           on_done=lambda success: self._on_approved(items, success))
+
+    def _on_approved(self, items, success):
         if success:
             # 2. 성공했으면 화면 갱신 (다시 검사하면 이제 SAFE로 뜰 것임)
-            print(f"승인 완료: {item['name']}")
+            print(f"승인 완료: {', '.join(item['name'] for item in items)}")
+            TELEMETRY.event("startup.approved", count=len(items))
             self.run_manual_check() # UI 업데이트
         else:
             print("승인 실패")
 
+class DiagnosticsFrame(ctk.CTkFrame):
+    REFRESH_MS = 1000 # 보이는 동안 자동 새로고침 주기
+
+    def __init__(self, master, f_title, f_body, runner):
+        super().__init__(master, corner_radius=0, fg_color="transparent")
+        self.runner = runner
+        self.auto_refresh = False
+        ctk.CTkLabel(self, text="🩺 진단 정보", font=f_title).pack(pady=20, padx=20, anchor="w")
+        self.txt_report = ctk.CTkTextbox(self, state="disabled", wrap="none",
+                                         font=ctk.CTkFont(family="Consolas", size=12))
+        self.txt_report.pack(fill="both", expand=True, padx=20)
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x", padx=20, pady=20)
+        ctk.CTkButton(bar, text="새로고침", width=100, command=self.refresh).pack(side="left")
+        ctk.CTkButton(bar, text="파일로 내보내기", width=120, command=self.export).pack(side="left", padx=10)
+        self.lbl_status = ctk.CTkLabel(bar, text=f"기록 파일: {os.path.abspath(METRICS_FILE)}", font=f_body, text_color="gray")
+        self.lbl_status.pack(side="left", padx=10)
+
+    def start_auto_refresh(self):
+        self.refresh()
+        if not self.auto_refresh:
+            self.auto_refresh = True
+            self.after(self.REFRESH_MS, self._tick)
+
+    def _tick(self):
+        # 다른 화면으로 가면 멈춤 (다시 열 때 start_auto_refresh)
+        if not self.winfo_ismapped():
+            self.auto_refresh = False
+            return
+        self.refresh()
+        self.after(self.REFRESH_MS, self._tick)
+
+    def refresh(self):
+        # 스크롤 위치는 유지한 채 내용만 바꿈
+        top = self.txt_report.yview()[0]
+        self.txt_report.configure(state="normal")
+        self.txt_report.delete("1.0", "end")
+        self.txt_report.insert("end", format_report(TELEMETRY.snapshot()))
+        self.txt_report.configure(state="disabled")
+        self.txt_report.yview_moveto(top)
+
+    def export(self):
+        self.runner.submit("telemetry", TELEMETRY.export,
+                           on_done=lambda _: self.lbl_status.configure(text=f"저장함: {os.path.abspath(METRICS_FILE)}"))
+
 class AIFrame(ctk.CTkFrame):
-    def __init__(self, master, f_title, f_body):
+    def __init__(self, master, f_title, f_body, runner, services, context_provider):
         super().__init__(master, corner_radius=0, fg_color="transparent")
+        self.runner = runner
+        self.services = services
+        self.context_provider = context_provider # 작업 스레드에서 PC 상태 요약을 만들어 줌
+        self.ask_count = 0
+        self.active_ask = None # 지금 답변을 받는 질문 번호 (중지한 질문의 늦은 조각은 버리기 위해)
         ctk.CTkLabel(self, text="🤖 AI 보안 자문", font=f_title).pack(pady=20, padx=20, anchor="w")
         self.chat_history = ctk.CTkTextbox(self, state="disabled", font=f_body)
         self.chat_history.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+        self.lbl_stats = ctk.CTkLabel(self, text="", font=f_body, text_color="gray")
+        self.lbl_stats.pack(padx=20, anchor="e")
         self.input_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.input_frame.pack(fill="x", padx=20, pady=20)
         self.entry_msg = ctk.CTkEntry(self.input_frame, placeholder_text="내용을 입력하세요...", font=f_body, height=40)
         self.entry_msg.pack(side="left", fill="x", expand=True, padx=(0, 10))
-        self.btn_send = ctk.CTkButton(self.input_frame, text="전송", font=f_body, width=100, height=40, fg_color="#8E44AD")
+        self.entry_msg.bind("<Return>", lambda event: self.toggle_send())
+        self.btn_send = ctk.CTkButton(self.input_frame, text="전송", font=f_body, width=100, height=40, fg_color="#8E44AD", command=self.toggle_send)
         self.btn_send.pack(side="right")
 
+        # openai 불러오기와 접속 준비는 화면을 연 순간 미리 해둠 (첫 질문 대기 시간 단축)
+        self.runner.submit("ai_warmup", lambda: self.advisor.warm_up(),
+                           on_error=lambda error: self.lbl_stats.configure(text=self._error_message(error)))
+
+    @property
+    def advisor(self):
+        return self.services.get("ai_advisor")
+
+    def toggle_send(self):
+        # 답변을 받는 중에 한 번 더 누르면 중지
+        if self.active_ask is not None:
+            self.runner.cancel("ai")
+            self.advisor.cancel() # 다음 조각을 기다리며 멈춘 스트림도 바로 끝나도록
+            self._end_answer(" (중지됨)\n\n", "답변을 중지했습니다")
+            return
+        question = self.entry_msg.get().strip()
+        if not question:
+            return
+        self.entry_msg.delete(0, "end")
+        self.append_text(f"나: {question}\n\nAI: ")
+        self.ask_count += 1
+        self.active_ask = ask_id = self.ask_count
+        self.btn_send.configure(text="중지")
+        self.lbl_stats.configure(text="답변을 기다리는 중...")
+        self.runner.submit("ai", self._ask_worker, question, ask_id, pass_cancel=True,
+                           on_error=lambda error: self._on_ask_error(ask_id, error))
+
+    def _ask_worker(self, question, ask_id, cancel_event):
+        # 작업 스레드에서 실행: 받은 조각은 모아서 0.05초마다 화면에 붙임
+        context = self.context_provider()
+        pending, last_post = [], time.perf_counter()
+        for text in self.advisor.ask(question, context, cancel_event):
+            pending.append(text)
+            if time.perf_counter() - last_post >= 0.05:
+                self.runner.post(self._on_answer_chunk, ask_id, "".join(pending))
+                pending, last_post = [], time.perf_counter()
+        self.runner.post(self._on_answer_chunk, ask_id, "".join(pending))
+        self.runner.post(self._on_answer_finished, ask_id, self.advisor.last_stats.snapshot())
+
+    def append_text(self, text):
+        if not text:
+            return
+        self.chat_history.configure(state="normal")
+        self.chat_history.insert("end", text)
+        self.chat_history.configure(state="disabled")
+        self.chat_history.see("end")
+
+    def _on_answer_chunk(self, ask_id, text):
+        if ask_id == self.active_ask:
+            self.append_text(text)
+
+    def _on_answer_finished(self, ask_id, stats):
+        if ask_id != self.active_ask:
+            return
+        if stats["cached"]:
+            status = "저장된 답변을 재사용했습니다"
+        elif stats["first_token_ms"] is not None:
+            status = f"첫 응답 {stats['first_token_ms'] / 1000:.2f}초  ·  {stats['tokens_per_sec']:.0f}토큰/초"
+        else:
+            status = "빈 답변을 받았습니다"
+        self._end_answer("\n\n", status)
+
+    def _on_ask_error(self, ask_id, error):
+        if ask_id == self.active_ask:
+            message = self._error_message(error)
+            self._end_answer(f"[{message}]\n\n", message)
+
+    def _end_answer(self, suffix, status):
+        self.active_ask = None
+        self.btn_send.configure(text="전송")
+        self.append_text(suffix)
+        self.lbl_stats.configure(text=status)
+
+    def _error_message(self, error):
+        if isinstance(error, ImportError):
+            return "AI 자문을 쓰려면 openai 패키지가 필요합니다. (pip install openai)"
+        return f"AI 자문 오류: {error}"
+
 if __name__ == "__main__":
+    import multiprocessing # 여기서만 씀 (모듈 맨 위에서 불러오면 시작 시간이 약 30ms 늘어남)
+    multiprocessing.freeze_support() # 스캔 엔진의 프로세스 풀을 exe로 묶었을 때도 동작하도록
     app = App()
     app.mainloop()
\ No newline at end of file
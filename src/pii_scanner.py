@@ -0,0 +1,338 @@
+# src/pii_scanner.py
+import mmap
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from telemetry import TELEMETRY
+
+# --- 검출 패턴 ---
+# 하나로 합친 정규식으로 파일을 한 번만 훑습니다. (패턴마다 반복해서 훑지 않음)
+# 파일 인코딩을 모르므로 바이트 단위로 검사하고, 한글 키워드는 UTF-8/CP949 두 가지를 모두 넣습니다.
+_KOREAN_PASSWORD_WORDS = [w.encode(enc) for w in ("비밀번호", "비번", "암호") for enc in ("utf-8", "cp949")]
+
+_PATTERNS = [
+    # 주민등록번호: 생년월일(YYMMDD) + 성별자리(1~8) + 6자리
+    ("rrn", rb"\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01])-?[1-8]\d{6}(?!\d)"),
+    # 휴대폰 / 지역번호 전화번호
+    ("phone", rb"(?:01[016789][-. ]?\d{3,4}[-. ]?\d{4}|0(?:2|[3-6][1-5])[-.]\d{3,4}[-.]\d{4})(?!\d)"),
+    # 카드번호: 16자리(4-4-4-4) 또는 아멕스 15자리 -> 찾은 뒤 Luhn 검사
+    ("card", rb"(?:\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}|3[47]\d{2}[- ]?\d{6}[- ]?\d{5})(?!\d)"),
+    ("email", rb"[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63})*\.[A-Za-z]{2,24}"),
+    # 비밀번호처럼 보이는 문자열 (password=..., 비밀번호: ...)
+    ("password", rb"(?:(?i:password|passwd|pwd)|" + b"|".join(re.escape(w) for w in _KOREAN_PASSWORD_WORDS)
+                 + rb")\s{0,3}[:=]\s{0,3}[^\s\"']{4,64}"),
+]
+# 모든 위치에서 다섯 패턴을 다 시도하면 느리므로, 단어 경계(\b)나 한글 키워드의 첫 바이트에서만 시도
+_KOREAN_LEAD_BYTES = re.escape(bytes(sorted({w[0] for w in _KOREAN_PASSWORD_WORDS})))
+COMBINED_PATTERN = re.compile(
+    rb"(?:\b|(?=[" + _KOREAN_LEAD_BYTES + rb"]))(?:"
+    + b"|".join(b"(?P<%s>%s)" % (name.encode(), pattern) for name, pattern in _PATTERNS)
+    + b")"
+)
+PII_KINDS = [name for name, _ in _PATTERNS]
+
+# 청크 경계에 걸친 값을 놓치지 않도록 앞 청크 끝부분을 이만큼 겹쳐서 읽음 (가장 긴 패턴보다 길게)
+CHUNK_SIZE = 1024 * 1024
+CHUNK_OVERLAP = 512
+_CONTEXT = 16
+MMAP_THRESHOLD = 8 * 1024 * 1024  # 이보다 큰 파일은 mmap으로 복사 없이 검사
+SAMPLES_PER_KIND = 3
+_READY_FLUSH = 256  # 색인에서 꺼낸 결과를 이만큼 모이면 먼저 내보냄
+
+DEFAULT_EXTENSIONS = {
+    ".txt", ".csv", ".tsv", ".log", ".md", ".json", ".xml", ".html", ".htm", ".ini", ".cfg", ".conf",
+    ".yaml", ".yml", ".sql", ".env", ".rtf", ".eml", ".vcf", ".py", ".js", ".java", ".c", ".cpp", ".cs",
+}
+DEFAULT_EXCLUDE_DIRS = {
+    "AppData", "$Recycle.Bin", "System Volume Information", "Windows", "Program Files",
+    "Program Files (x86)", "node_modules", ".git", "__pycache__", ".venv", "venv",
+}
+DEFAULT_MAX_FILE_SIZE = 512 * 1024 * 1024
+
+
+def luhn_valid(digits):
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        n = ord(ch) - 48
+        if i % 2 == 1:
+            n *= 2
+            if n > 9:
+                n -= 9
+        total += n
+    return total % 10 == 0
+
+
+def _digits(value):
+    return "".join(ch for ch in value if ch.isdigit())
+
+
+def _decode(raw):
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("cp949", "replace")
+
+
+def mask_value(kind, value):
+    """화면/로그에 원문이 남지 않도록 가립니다."""
+    if kind == "rrn":
+        digits = _digits(value)
+        return f"{digits[:6]}-{digits[6]}******"
+    if kind in ("phone", "card"):
+        digits = _digits(value)
+        return "*" * (len(digits) - 4) + digits[-4:]
+    if kind == "email":
+        local, _, domain = value.partition("@")
+        return f"{local[:2]}***@{domain}"
+    if kind == "password":
+        key = re.split(r"\s*[:=]", value, maxsplit=1)[0]
+        return f"{key}=****"
+    return "****"
+
+
+def _scan_buffer(buffer, start, limit, counts, samples):
+    """buffer[start:limit]에서 시작하는 값만 셉니다. (limit 이후는 다음 청크에서 다시 검사)"""
+    for match in COMBINED_PATTERN.finditer(buffer, start):
+        if match.start() >= limit:
+            break
+        kind = match.lastgroup
+        value = _decode(match.group())
+        if kind == "card" and not luhn_valid(_digits(value)):
+            continue
+        counts[kind] = counts.get(kind, 0) + 1
+        kind_samples = samples.setdefault(kind, [])
+        if len(kind_samples) < SAMPLES_PER_KIND:
+            kind_samples.append(mask_value(kind, value))
+
+
+def scan_file(path, size=None, mtime_ns=None):
+    """
+    파일 하나를 검사합니다.
+    return: {"path", "size", "mtime_ns", "counts": {종류: 개수}, "samples": {종류: [가린 값]},
+             "error", "cached"}
+    """
+    counts, samples = {}, {}
+    result = {"path": path, "size": size, "mtime_ns": mtime_ns,
+              "counts": counts, "samples": samples, "error": None, "cached": False}
+    try:
+        with open(path, "rb") as f:
+            if size is None:
+                size = result["size"] = os.fstat(f.fileno()).st_size
+            if size >= MMAP_THRESHOLD:
+                # 큰 파일: mmap으로 메모리에 통째로 올리지 않고 운영체제 페이지 단위로 검사
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    _scan_buffer(mm, 0, len(mm), counts, samples)
+            else:
+                _scan_stream(f, counts, samples)
+    except (OSError, ValueError) as e:
+        result["error"] = str(e)
+    return result
+
+
+def _scan_stream(f, counts, samples):
+    # 청크 단위로 읽되, 앞 청크의 마지막 CHUNK_OVERLAP 바이트를 이어 붙여 경계의 값을 놓치지 않음
+    # (그 앞 CONTEXT 바이트도 남겨서 "앞이 숫자가 아님" 같은 조건을 그대로 판단)
+    tail, start = b"", 0
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            _scan_buffer(tail, start, len(tail), counts, samples)
+            return
+        buffer = tail + chunk
+        limit = max(len(buffer) - CHUNK_OVERLAP, start)
+        _scan_buffer(buffer, start, limit, counts, samples)
+        keep_from = max(limit - _CONTEXT, 0)
+        tail, start = buffer[keep_from:], limit - keep_from
+
+
+def scan_batch(batch):
+    """작업 프로세스에서 실행: [(경로, 크기, 수정시각_ns), ...]를 차례로 검사 (파일별 걸린 시간 "ms" 포함)"""
+    results = []
+    for path, size, mtime_ns in batch:
+        started = time.perf_counter()
+        result = scan_file(path, size, mtime_ns)
+        result["ms"] = (time.perf_counter() - started) * 1000
+        results.append(result)
+    return results
+
+
+class ScanStats:
+    """진행률/처리량 카운터"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.files_found = 0     # 검사 대상으로 찾은 파일 수
+        self.files_scanned = 0   # 검사 끝난 파일 수 (색인에서 재사용한 파일 포함)
+        self.files_cached = 0    # 바뀌지 않아서 다시 읽지 않은 파일 수
+        self.bytes_scanned = 0
+        self.files_with_pii = 0
+        self.matches = 0
+        self.errors = 0
+        self.files_purged = 0    # 색인에서 지운(삭제된) 파일 수
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def files_per_sec(self):
+        return self.files_scanned / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_sec(self):
+        return self.bytes_scanned / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def snapshot(self):
+        return {
+            "files_found": self.files_found, "files_scanned": self.files_scanned, "files_cached": self.files_cached,
+            "bytes_scanned": self.bytes_scanned, "files_with_pii": self.files_with_pii,
+            "matches": self.matches, "errors": self.errors, "files_purged": self.files_purged, "elapsed": round(self.elapsed, 3),
+            "files_per_sec": round(self.files_per_sec, 1), "mb_per_sec": round(self.mb_per_sec, 2),
+        }
+
+
+def iter_files(roots, extensions=DEFAULT_EXTENSIONS, exclude_dirs=DEFAULT_EXCLUDE_DIRS,
+               max_file_size=DEFAULT_MAX_FILE_SIZE, cancel_event=None):
+    """os.scandir로 폴더를 훑으며 (경로, 크기, 수정시각_ns)를 내보냅니다. (심볼릭 링크는 따라가지 않음)"""
+    stack = list(roots)
+    while stack:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in exclude_dirs:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                            if max_file_size is None or st.st_size <= max_file_size:
+                                yield entry.path, st.st_size, st.st_mtime_ns
+                    except OSError:
+                        continue
+        except OSError:
+            continue  # 권한 없는 폴더 등은 건너뜀
+
+
+class PIIScanner:
+    """
+    개인정보 스캔 엔진.
+    폴더를 훑는 것은 현재 스레드에서, 파일 검사는 프로세스 풀에서 (모든 코어 사용) 진행하고
+    검사가 끝난 파일부터 바로바로 결과를 내보냅니다.
+    """
+
+    def __init__(self, workers=None, extensions=DEFAULT_EXTENSIONS, exclude_dirs=DEFAULT_EXCLUDE_DIRS,
+                 max_file_size=DEFAULT_MAX_FILE_SIZE, batch_files=64, batch_bytes=32 * 1024 * 1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.extensions = extensions
+        self.exclude_dirs = exclude_dirs
+        self.max_file_size = max_file_size
+        self.batch_files = batch_files   # 프로세스 간 통신 비용을 줄이려고 파일을 묶어서 보냄
+        self.batch_bytes = batch_bytes
+        self.stats = ScanStats()
+
+    def scan(self, roots, cancel_event=None, index=None):
+        """
+        결과를 하나씩 내보내는 제너레이터. (개인정보가 없는 파일의 결과도 포함, counts가 비어 있음)
+        index(ScanIndex)를 주면 크기/수정시각이 그대로인 파일은 다시 읽지 않고 저장된 결과를 내보내며,
+        끝까지 스캔하면 사라진 파일을 색인에서 지웁니다.
+        진행 상황은 self.stats에서 확인합니다.
+        """
+        self.stats = ScanStats()
+        roots = [os.path.abspath(root) for root in roots]
+        files = iter_files(roots, self.extensions, self.exclude_dirs, self.max_file_size, cancel_event)
+        index_run = index.begin_run(roots) if index is not None else None
+        completed = False
+        try:
+            yield from self._run(files, cancel_event, index_run)
+            completed = not (cancel_event is not None and cancel_event.is_set())
+        finally:
+            if index_run is not None:
+                index_run.finish(self.stats, completed)
+
+    def _batches(self, files, index_run, ready):
+        batch, batch_size = [], 0
+        for path, size, mtime_ns in files:
+            self.stats.files_found += 1
+            if index_run is not None:
+                cached = index_run.lookup(path, size, mtime_ns)
+                if cached is not None:
+                    ready.append(cached)  # 바뀌지 않은 파일: 다시 읽지 않음
+                    if len(ready) >= _READY_FLUSH:
+                        yield []  # 쌓인 결과를 먼저 내보내도록 잠깐 돌려줌
+                    continue
+            batch.append((path, size, mtime_ns))
+            batch_size += size
+            if len(batch) >= self.batch_files or batch_size >= self.batch_bytes:
+                yield batch
+                batch, batch_size = [], 0
+        if batch:
+            yield batch
+
+    def _count(self, result):
+        stats = self.stats
+        stats.files_scanned += 1
+        if result["cached"]:
+            stats.files_cached += 1
+        elif result["error"]:
+            stats.errors += 1
+        else:
+            stats.bytes_scanned += result["size"] or 0
+            # 작업 프로세스에서 잰 파일별 시간 (계측기는 이 프로세스에 있음)
+            TELEMETRY.observe("scan.file", result.get("ms", 0.0))
+        if result["counts"]:
+            stats.files_with_pii += 1
+            stats.matches += sum(result["counts"].values())
+
+    def _run(self, files, cancel_event, index_run):
+        max_in_flight = self.workers * 2  # 폴더 탐색이 너무 앞서가지 않도록 동시에 보낼 묶음 수 제한
+        ready = []  # 색인에서 바로 꺼낸 결과
+        # 프로세스는 실제로 검사할 파일이 생길 때 만들어짐 (변경 없는 재검사는 프로세스를 띄우지 않음)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = set()
+            batches = self._batches(files, index_run, ready)
+            exhausted = False
+            try:
+                while in_flight or not exhausted or ready:
+                    cancelled = cancel_event is not None and cancel_event.is_set()
+                    while not exhausted and not cancelled and len(in_flight) < max_in_flight and len(ready) < _READY_FLUSH:
+                        batch = next(batches, None)
+                        if batch is None:
+                            exhausted = True
+                        elif batch:
+                            in_flight.add(pool.submit(scan_batch, batch))
+                    for result in ready:
+                        self._count(result)
+                        yield result
+                    ready.clear()
+                    if cancelled:
+                        break
+                    if not in_flight:
+                        continue
+                    done, in_flight = wait(in_flight, timeout=0.2, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for result in future.result():
+                            if index_run is not None:
+                                index_run.record(result)
+                            self._count(result)
+                            yield result
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                self.stats.finished = time.perf_counter()
+
+
+# 테스트용 코드: python pii_scanner.py <폴더>
+if __name__ == "__main__":
+    import sys
+    scanner = PIIScanner()
+    for result in scanner.scan(sys.argv[1:] or [os.path.expanduser("~")]):
+        if result["counts"]:
+            print(result["path"], result["counts"], result["samples"])
+    print(scanner.stats.snapshot())
@@ -0,0 +1,209 @@
+# src/process_monitor.py
+import os
+import threading
+import time
+from collections import deque
+
+import psutil
+
+RECENT_LIMIT = 200      # 최근 이벤트 보관 개수
+RECENT_WINDOW = 300     # 대시보드에 "최근"으로 보여줄 범위 (초)
+
+
+class ProcessInfo:
+    """프로세스 하나의 요약 (새로 생겼을 때 한 번만 읽음)"""
+
+    __slots__ = ("pid", "create_time", "name", "exe", "startup")
+
+    def __init__(self, pid, create_time, name, exe):
+        self.pid = pid
+        self.create_time = create_time
+        self.name = name
+        self.exe = exe          # 정규화된 실행 파일 경로 (권한이 없으면 None)
+        self.startup = False    # 승인된 시작프로그램으로 실행된 것인지
+
+    def as_dict(self):
+        return {"pid": self.pid, "name": self.name, "exe": self.exe, "startup": self.startup}
+
+
+class ProcessWatcher:
+    """
+    실행 중인 프로세스와 네트워크 연결 감시.
+    매 주기마다 PID 목록만 가져와 지난 집합과 비교하고, 새 PID만 자세히(이름/경로/시작 시각) 읽습니다.
+    연결 목록은 읽는 비용이 커서 더 긴 주기로 따로 읽고, 역시 집합 차이로 새 리슨 포트/외부 연결만 찾습니다.
+    """
+
+    def __init__(self, interval=1.0, connection_interval=5.0, verify_every=30, approved_provider=None):
+        self.interval = interval
+        self.connection_interval = connection_interval
+        self.verify_every = verify_every          # 이 횟수마다 PID 재사용(같은 번호의 다른 프로세스) 확인
+        self.approved_provider = approved_provider  # () -> 승인된 시작프로그램 실행 파일 경로 집합
+        self.processes = {}    # pid -> ProcessInfo
+        self.listening = set() # (pid, ip, port)
+        self.outbound = set()  # (pid, 원격 ip, 원격 port)
+        self.recent = deque(maxlen=RECENT_LIMIT)  # (시각, 종류, 내용)
+        self.samples = 0
+        self.cpu_time = 0.0    # 감시에 쓴 CPU 시간 (초)
+        self.started = None
+        self._approved = None
+        self._last_connections = None
+        self._lock = threading.Lock()  # summary()를 UI/다른 스레드에서 읽을 때
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- 한 번 읽기 ---
+
+    def sample(self):
+        """
+        프로세스 표를 한 번 읽고 지난번과의 차이를 반환합니다.
+        {"time", "initial", "new", "exited", "new_listening", "closed_listening", "new_outbound"}
+        """
+        cpu_started = time.thread_time()
+        now = time.time()
+        if self.started is None:
+            self.started = time.perf_counter()
+
+        pids = set(psutil.pids())
+        known = self.processes.keys()
+        gone = known - pids
+        fresh = pids - known
+        if self.samples and self.samples % self.verify_every == 0:
+            fresh |= self._reused_pids(pids & known)
+            gone |= fresh & known
+        new = [info for info in map(self._read, fresh) if info is not None]
+
+        approved = self.approved_provider() if self.approved_provider else frozenset()
+        if approved is not self._approved:
+            # 승인 목록이 바뀌었으면 이미 보고 있는 프로세스도 다시 대조 (수백 개 집합 조회라 저렴)
+            self._approved = approved
+            for info in self.processes.values():
+                info.startup = info.exe in approved
+        for info in new:
+            info.startup = info.exe in approved
+
+        diff = {"time": now, "initial": self.samples == 0, "new": [], "exited": [],
+                "new_listening": [], "closed_listening": [], "new_outbound": []}
+        with self._lock:
+            exited = [self.processes.pop(pid) for pid in gone]
+            for info in new:
+                self.processes[info.pid] = info
+            if not diff["initial"]:
+                diff["new"] = [info.as_dict() for info in new]
+                diff["exited"] = [info.as_dict() for info in exited]
+            if self._last_connections is None or now - self._last_connections >= self.connection_interval:
+                self._last_connections = now
+                self._sample_connections(diff)
+            self._remember(diff)
+            self.samples += 1
+        self.cpu_time += time.thread_time() - cpu_started
+        return diff
+
+    def _read(self, pid):
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                name, create_time = proc.name(), proc.create_time()
+                try:
+                    exe = proc.exe() or None
+                except psutil.AccessDenied:  # 시스템 프로세스 등
+                    exe = None
+        except psutil.NoSuchProcess:  # 읽는 사이에 끝남
+            return None
+        except psutil.AccessDenied:
+            return ProcessInfo(pid, 0.0, "?", None)
+        return ProcessInfo(pid, create_time, name, os.path.normcase(exe) if exe else None)
+
+    def _reused_pids(self, pids):
+        # 번호는 같지만 시작 시각이 다르면 다른 프로세스 (끝난 뒤 번호가 재사용됨)
+        reused = set()
+        for pid in pids:
+            try:
+                if psutil.Process(pid).create_time() != self.processes[pid].create_time:
+                    reused.add(pid)
+            except psutil.Error:
+                pass
+        return reused
+
+    def _sample_connections(self, diff):
+        try:
+            connections = psutil.net_connections(kind="inet")
+        except psutil.AccessDenied:  # 맥OS 등은 관리자 권한 필요
+            return
+        listening, outbound = set(), set()
+        for conn in connections:
+            if conn.status == psutil.CONN_LISTEN and conn.laddr:
+                listening.add((conn.pid, conn.laddr.ip, conn.laddr.port))
+            elif conn.status == psutil.CONN_ESTABLISHED and conn.raddr:
+                outbound.add((conn.pid, conn.raddr.ip, conn.raddr.port))
+        if not diff["initial"]:
+            diff["new_listening"] = [self._describe(entry) for entry in sorted(listening - self.listening, key=str)]
+            diff["closed_listening"] = [self._describe(entry) for entry in sorted(self.listening - listening, key=str)]
+            diff["new_outbound"] = [self._describe(entry) for entry in sorted(outbound - self.outbound, key=str)]
+        self.listening, self.outbound = listening, outbound
+
+    def _describe(self, entry):
+        pid, ip, port = entry
+        info = self.processes.get(pid)
+        return {"pid": pid, "name": info.name if info else None, "ip": ip, "port": port}
+
+    def _remember(self, diff):
+        for kind in ("new", "exited", "new_listening", "new_outbound"):
+            for item in diff[kind]:
+                self.recent.append((diff["time"], kind, item))
+
+    # --- 요약 ---
+
+    @property
+    def cpu_percent(self):
+        """감시 자체가 쓴 CPU 비율 (%)"""
+        if self.started is None:
+            return 0.0
+        wall = time.perf_counter() - self.started
+        return self.cpu_time / wall * 100 if wall > 0 else 0.0
+
+    def summary(self, window=RECENT_WINDOW):
+        """대시보드용 요약 (다른 스레드에서 호출 가능)"""
+        since = time.time() - window
+        with self._lock:
+            recent = [(at, kind, item) for at, kind, item in self.recent if at >= since]
+            return {
+                "processes": len(self.processes),
+                "listening": len(self.listening),
+                "outbound": len(self.outbound),
+                "startup_running": sum(1 for info in self.processes.values() if info.startup),
+                "recent_new": sum(1 for _, kind, _ in recent if kind == "new"),
+                "recent_listening": [item for _, kind, item in recent if kind == "new_listening"],
+                "recent": recent[-20:],
+                "samples": self.samples,
+                "cpu_percent": round(self.cpu_percent, 2),
+            }
+
+    # --- 주기 실행 ---
+
+    def start(self, on_change=None):
+        """
+        전용 스레드에서 interval마다 sample()을 돌립니다.
+        on_change(diff, watcher)는 바뀐 것이 있을 때(와 첫 번째 읽기 때) 감시 스레드에서 호출됩니다.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(on_change,), name="process-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _loop(self, on_change):
+        next_time = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                diff = self.sample()
+                if on_change and (diff["initial"] or any(diff[kind] for kind in ("new", "exited", "new_listening", "closed_listening", "new_outbound"))):
+                    on_change(diff, self)
+            except Exception as e:
+                print(f"프로세스 감시 오류: {e}")
+            # 주기가 밀리면 쌓아두지 않고 지금부터 다시 셈
+            next_time = max(next_time + self.interval, time.perf_counter())
+            self._stop.wait(next_time - time.perf_counter())
@@ -0,0 +1,171 @@
+# src/scan_index.py
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    match_count INTEGER NOT NULL DEFAULT 0,
+    findings    TEXT,
+    scanned_at  REAL NOT NULL,
+    seen_run    INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS files_match_count ON files (match_count);
+CREATE TABLE IF NOT EXISTS runs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    started       REAL NOT NULL,
+    roots         TEXT NOT NULL,
+    elapsed       REAL,
+    files_scanned INTEGER,
+    files_cached  INTEGER,
+    completed     INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _root_range(root):
+    """root 폴더 아래의 경로만 고르는 문자열 범위 (LIKE 대신 인덱스를 쓰는 범위 검색)"""
+    prefix = os.path.join(os.path.abspath(root), "")
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class ScanIndex:
+    """
+    개인정보 스캔 색인.
+    경로별로 크기/수정시각과 검출 결과를 저장해 두고,
+    다음 스캔에서는 바뀐 파일과 새 파일만 다시 읽게 합니다.
+    """
+
+    def __init__(self, db_path="scan_index.db"):
+        self.db_path = db_path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def begin_run(self, roots):
+        """스캔 한 번을 시작합니다. 반환된 ScanIndexRun은 스캔하는 스레드에서만 사용합니다."""
+        return ScanIndexRun(self, roots)
+
+    def summary(self):
+        """대시보드용 요약 (색인만 읽으므로 즉시 반환)"""
+        with closing(self._connect()) as conn:
+            files_with_pii, matches = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(match_count), 0) FROM files WHERE match_count > 0"
+            ).fetchone()
+            by_kind = {}
+            for (findings,) in conn.execute("SELECT findings FROM files WHERE match_count > 0"):
+                for kind, count in json.loads(findings)["counts"].items():
+                    by_kind[kind] = by_kind.get(kind, 0) + count
+            last = conn.execute(
+                "SELECT started, elapsed FROM runs WHERE completed = 1 ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            cold = conn.execute(
+                "SELECT elapsed FROM runs WHERE completed = 1 AND files_cached = 0 ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            warm = conn.execute(
+                "SELECT elapsed FROM runs WHERE completed = 1 AND files_cached > 0 ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        return {
+            "scanned": last is not None,
+            "files_with_pii": files_with_pii,
+            "matches": matches,
+            "by_kind": by_kind,
+            "last_scan": last[0] if last else None,
+            "cold_elapsed": cold[0] if cold else None,  # 처음부터 다 읽은 스캔 소요 시간
+            "warm_elapsed": warm[0] if warm else None,  # 색인을 재사용한 스캔 소요 시간
+        }
+
+    def findings(self, limit=None):
+        """개인정보가 검출된 파일들의 저장된 결과 (검출 건수 많은 순)"""
+        query = "SELECT path, size, mtime_ns, findings FROM files WHERE match_count > 0 ORDER BY match_count DESC"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + (" LIMIT ?" if limit else ""), (limit,) if limit else ()).fetchall()
+        return [_row_to_result(*row) for row in rows]
+
+    def forget(self, paths):
+        """삭제한 파일 등을 색인에서 뺍니다."""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in paths])
+
+
+def _row_to_result(path, size, mtime_ns, findings):
+    data = json.loads(findings) if findings else {"counts": {}, "samples": {}}
+    return {"path": path, "size": size, "mtime_ns": mtime_ns,
+            "counts": data["counts"], "samples": data["samples"], "error": None, "cached": True}
+
+
+class ScanIndexRun:
+    """스캔 한 번 동안 쓰는 연결. 쓰기는 모아서 일정 개수마다 한 번에 커밋합니다."""
+
+    COMMIT_EVERY = 500
+
+    def __init__(self, index, roots):
+        self.index = index
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.conn = index._connect()
+        self.started = time.time()
+        with self.conn:
+            self.run_id = self.conn.execute(
+                "INSERT INTO runs (started, roots) VALUES (?, ?)", (self.started, json.dumps(self.roots))
+            ).lastrowid
+        self._pending = 0
+
+    def lookup(self, path, size, mtime_ns):
+        """크기와 수정시각이 그대로면 저장된 결과를, 아니면 None을 반환합니다."""
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, findings FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None
+        self.conn.execute("UPDATE files SET seen_run = ? WHERE path = ?", (self.run_id, path))
+        self._maybe_commit()
+        return _row_to_result(path, size, mtime_ns, row[2])
+
+    def record(self, result):
+        """새로 검사한 결과를 저장합니다. (읽기 오류가 난 파일은 다음에 다시 검사하도록 저장하지 않음)"""
+        if result["error"]:
+            return
+        findings = json.dumps({"counts": result["counts"], "samples": result["samples"]}, ensure_ascii=False)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, match_count, findings, scanned_at, seen_run) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (result["path"], result["size"], result["mtime_ns"],
+             sum(result["counts"].values()), findings, time.time(), self.run_id),
+        )
+        self._maybe_commit()
+
+    def _maybe_commit(self):
+        self._pending += 1
+        if self._pending >= self.COMMIT_EVERY:
+            self.conn.commit()
+            self._pending = 0
+
+    def finish(self, stats, completed):
+        """
+        스캔을 마칩니다. 끝까지 돈 경우에만 이번에 보이지 않은(삭제된) 파일을 색인에서 지웁니다.
+        """
+        try:
+            with self.conn:
+                purged = 0
+                if completed:
+                    for root in self.roots:
+                        low, high = _root_range(root)
+                        purged += self.conn.execute(
+                            "DELETE FROM files WHERE path >= ? AND path < ? AND seen_run != ?",
+                            (low, high, self.run_id),
+                        ).rowcount
+                self.conn.execute(
+                    "UPDATE runs SET elapsed = ?, files_scanned = ?, files_cached = ?, completed = ? WHERE id = ?",
+                    (stats.elapsed, stats.files_scanned, stats.files_cached, int(completed), self.run_id),
+                )
+            stats.files_purged = purged
+        finally:
+            self.conn.close()
@@ -0,0 +1,37 @@
+# src/services.py
+import threading
+
+
+class ServiceRegistry:
+    """
+    앱 전체에서 하나만 두고 같이 쓰는 서비스 (시작프로그램 감시자, 스캔 색인, 청소 분석기 등).
+    처음 get() 할 때 만들고, 이후에는 같은 객체를 돌려줍니다.
+    작업 스레드에서 동시에 불러도 한 번만 만들어집니다.
+    """
+
+    def __init__(self, profiler=None):
+        self.profiler = profiler  # 있으면 생성 시간을 기록
+        self._factories = {}
+        self._instances = {}
+        self._lock = threading.RLock()  # 서비스를 만들다가 다른 서비스를 get() 할 수 있으므로 RLock
+
+    def register(self, name, factory):
+        self._factories[name] = factory
+
+    def get(self, name):
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances:
+                factory = self._factories[name]
+                if self.profiler is None:
+                    self._instances[name] = factory()
+                else:
+                    with self.profiler.measure("service", name):
+                        self._instances[name] = factory()
+            return self._instances[name]
+
+    def created(self, name):
+        """이미 만들어졌는지 (만들지 않고 확인만)"""
+        return name in self._instances
@@ -0,0 +1,214 @@
+# src/snapshot_store.py
+import sqlite3
+import time
+from contextlib import closing
+from telemetry import TELEMETRY
+
+# 변경 기록은 최근 이 개수만 남기고 오래된 것부터 정리 (압축)
+JOURNAL_LIMIT = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key  TEXT PRIMARY KEY,
+    path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS journal (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       REAL NOT NULL,
+    action   TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    old_path TEXT,
+    new_path TEXT
+);
+CREATE TABLE IF NOT EXISTS binaries (
+    key    TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def diff_snapshots(saved, current):
+    """
+    저장된 스냅샷과 현재 상태를 키 기준 집합 연산으로 비교합니다.
+    return: (추가된_키_목록, 삭제된_키_목록, 경로가_바뀐_키_목록)
+    """
+    saved_keys = saved.keys()
+    current_keys = current.keys()
+    added = sorted(current_keys - saved_keys)
+    removed = sorted(saved_keys - current_keys)
+    modified = sorted(key for key in current_keys & saved_keys if current[key] != saved[key])
+    return added, removed, modified
+
+
+class SnapshotStore:
+    """
+    기준 스냅샷을 SQLite에 보관합니다.
+    - 모든 쓰기는 트랜잭션이라 도중에 꺼져도 파일이 깨지지 않음
+    - 바뀐 항목만 쓰고, 바뀐 내용은 journal 테이블에 시간과 함께 기록
+    - 항목별로 승인 당시 실행 파일의 SHA-256도 함께 보관 (journal에는 action "binary"로 기록)
+    - 해시 기능 이전 스냅샷(예전 JSON을 옮겨온 것, binaries 테이블이 없던 DB)만 한 번 지금 해시를 그대로 받아들임
+      (meta "adopt_hashes" 표시. adopt_hashes()가 지움)
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._cache = None  # (revision, {키: 경로}) - 변동 없으면 DB를 다시 읽지 않음
+        self._hash_cache = None  # (revision, {키: sha256})
+        self.last_revision = None  # 마지막으로 읽거나 쓴 리비전 (DB를 열지 않고 변동 여부만 볼 때. 다른 프로세스의 쓰기는 다음 revision() 때 반영)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            pre_hash = (conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta'").fetchone() is not None
+                        and conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'binaries'").fetchone() is None)
+            conn.executescript(_SCHEMA)
+            if pre_hash and conn.execute("SELECT 1 FROM meta WHERE name = 'baseline_created'").fetchone():
+                # 해시 기능 이전에 만든 기준 스냅샷
+                with conn:
+                    conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('adopt_hashes', '1')")
+
+    def _connect(self):
+        # 작업 스레드마다 따로 쓰도록 연결은 매번 새로 엶
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    # --- 읽기 ---
+
+    def has_baseline(self):
+        return self._get_meta("baseline_created") is not None
+
+    def needs_hash_adoption(self):
+        """해시 기록 없이 옮겨온 스냅샷이라 지금 해시를 한 번 받아들여야 하는지"""
+        return self._get_meta("adopt_hashes") is not None
+
+    def revision(self):
+        """쓰기가 일어날 때마다 1씩 증가하는 번호"""
+        self.last_revision = int(self._get_meta("revision") or 0)
+        return self.last_revision
+
+    def load(self):
+        """저장된 스냅샷 {키: 경로}"""
+        revision = self.revision()
+        if self._cache is not None and self._cache[0] == revision:
+            return self._cache[1]
+        with TELEMETRY.span("snapshot.load"), closing(self._connect()) as conn:
+            entries = dict(conn.execute("SELECT key, path FROM entries"))
+        self._cache = (revision, entries)
+        return entries
+
+    def approved_hashes(self):
+        """승인된 실행 파일 해시 {키: sha256}"""
+        revision = self.revision()
+        if self._hash_cache is not None and self._hash_cache[0] == revision:
+            return self._hash_cache[1]
+        with closing(self._connect()) as conn:
+            hashes = dict(conn.execute("SELECT key, sha256 FROM binaries"))
+        self._hash_cache = (revision, hashes)
+        return hashes
+
+    def journal(self, limit=100):
+        """최근 변경 기록 (최신순)"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT ts, action, key, old_path, new_path FROM journal ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [{"ts": ts, "action": action, "key": key, "old_path": old, "new_path": new}
+                for ts, action, key, old, new in rows]
+
+    # --- 쓰기 ---
+
+    def replace_baseline(self, current, hashes=None, adopt_hashes=False):
+        """
+        스냅샷을 current와 같게 맞춥니다. 바뀐 항목이 없으면 아무것도 쓰지 않습니다.
+        adopt_hashes=True이면 해시 없이 옮겨온 스냅샷으로 표시 (다음 검사 때 지금 해시를 한 번 받아들임)
+        """
+        saved = self.load() if self.has_baseline() else {}
+        added, removed, modified = diff_snapshots(saved, current)
+        changes = [("added", key, None, current[key]) for key in added]
+        changes += [("modified", key, saved[key], current[key]) for key in modified]
+        changes += [("removed", key, saved[key], None) for key in removed]
+        changes += self._hash_changes(hashes)
+        self._apply(changes, mark_baseline=True, meta={"adopt_hashes": "1"} if adopt_hashes else None)
+        return len(changes)
+
+    def approve_many(self, items, hashes=None):
+        """
+        승인된 항목들 [(키, 경로), ...]을 한 번의 트랜잭션으로 반영합니다.
+        hashes({키: sha256})가 있으면 승인 당시 실행 파일 해시도 함께 저장합니다.
+        """
+        saved = self.load()
+        changes = []
+        for key, path in items:
+            old = saved.get(key)
+            if old is None:
+                changes.append(("added", key, None, path))
+            elif old != path:
+                changes.append(("modified", key, old, path))
+        changes += self._hash_changes(hashes)
+        self._apply(changes)
+        return len(changes)
+
+    def set_hashes(self, hashes):
+        """경로는 그대로 두고 승인된 실행 파일 해시만 갱신합니다. {키: sha256}"""
+        changes = self._hash_changes(hashes)
+        self._apply(changes)
+        return len(changes)
+
+    def adopt_hashes(self, hashes):
+        """해시 없이 옮겨온 스냅샷의 해시를 지금 값으로 채우고 표시를 지웁니다. (한 번만)"""
+        changes = self._hash_changes(hashes)
+        self._apply(changes, meta={"adopt_hashes": None})
+        return len(changes)
+
+    def _hash_changes(self, hashes):
+        if not hashes:
+            return []
+        saved = self.approved_hashes()
+        return [("binary", key, saved.get(key), sha256) for key, sha256 in sorted(hashes.items())
+                if sha256 and saved.get(key) != sha256]
+
+    def remove_many(self, keys):
+        saved = self.load()
+        self._apply([("removed", key, saved[key], None) for key in keys if key in saved])
+
+    def _apply(self, changes, mark_baseline=False, meta=None):
+        # meta: {이름: 값} 함께 쓸 표시 (값이 None이면 지움)
+        if not changes and not meta and not (mark_baseline and not self.has_baseline()):
+            return
+        now = time.time()
+        with TELEMETRY.span("snapshot.save", changes=len(changes)), closing(self._connect()) as conn, conn:
+            for action, key, old, new in changes:
+                if action == "removed":
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    conn.execute("DELETE FROM binaries WHERE key = ?", (key,))
+                elif action == "binary":
+                    conn.execute("INSERT OR REPLACE INTO binaries (key, sha256) VALUES (?, ?)", (key, new))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO entries (key, path) VALUES (?, ?)", (key, new))
+            conn.executemany(
+                "INSERT INTO journal (ts, action, key, old_path, new_path) VALUES (?, ?, ?, ?, ?)",
+                [(now, action, key, old, new) for action, key, old, new in changes],
+            )
+            if mark_baseline:
+                conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('baseline_created', ?)", (str(now),))
+            for name, value in (meta or {}).items():
+                if value is None:
+                    conn.execute("DELETE FROM meta WHERE name = ?", (name,))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+            conn.execute(
+                "INSERT INTO meta (name, value) VALUES ('revision', '1') "
+                "ON CONFLICT(name) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+            )
+            # 오래된 변경 기록 정리
+            conn.execute("DELETE FROM journal WHERE id <= (SELECT MAX(id) FROM journal) - ?", (JOURNAL_LIMIT,))
+            revision = int(conn.execute("SELECT value FROM meta WHERE name = 'revision'").fetchone()[0])
+        self.last_revision = revision
+        self._cache = None
+        self._hash_cache = None
+
+    def _get_meta(self, name):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
@@ -1,104 +1,253 @@
 # src/startup_checker.py
-import winreg
 import json
 import os
+import shutil
+import sqlite3
+import time
+from binary_hasher import BinaryHasher, ReputationList
+from snapshot_store import SnapshotStore, diff_snapshots
+from telemetry import TELEMETRY
+from startup_sources import StartupSourceSet, command_executable, default_sources, make_key, split_key, HKCU_RUN
 
 class StartupMonitor:
-    def __init__(self, db_file="startup_snapshot.json"):
+    def __init__(self, db_file="startup_snapshot.db", sources=None, legacy_file="startup_snapshot.json",
+                 reputation_file="startup_reputation.txt"):
         self.db_file = db_file
-        self.registry_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
+        self.legacy_file = legacy_file # 예전 JSON 스냅샷 (있으면 최초 1회 옮겨옴)
+        # 감시 대상 (레지스트리 Run/RunOnce, Wow6432Node, 시작프로그램 폴더 등)
+        self.sources = StartupSourceSet(default_sources() if sources is None else sources)
+        self._reset_backup = None    # 손상된 스냅샷 DB를 옮겨둔 경로 (다음 검사 결과를 "RESET"으로 알림)
+        self.store = self._open_store()
+        # 실행 파일 해시 (경로/크기/수정시각이 같으면 다시 읽지 않음) + 로컬 허용/차단 목록
+        self.hasher = BinaryHasher(db_file)
+        self.reputation = ReputationList(reputation_file)
+        self._exe_by_command = {}    # (명령줄, 경로 여부) -> 실행 파일 경로 (파싱 결과 재사용)
+        self._last_result = None     # 마지막 검사 결과 (변동 없으면 그대로 재사용)
+        self._last_revision = None   # 그때의 스냅샷 리비전
+        self._last_binary_token = None # 그때의 실행 파일 크기/수정시각 + 평판 목록 상태
+        self._approved_exes = (None, frozenset()) # (리비전, 승인된 실행 파일 경로) - 프로세스 감시용
 
-    def get_current_startup_programs(self):
-        """현재 레지스트리에 등록된 시작 프로그램 목록을 가져옵니다."""
-        programs = {}
+    def _open_store(self):
         try:
-            # 윈도우 레지스트리 열기 (HKEY_CURRENT_USER)
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.registry_path, 0, winreg.KEY_READ)
-            
-            # 등록된 값들을 하나씩 읽어옴
-            i = 0
-            while True:
-                try:
-                    name, path, _ = winreg.EnumValue(key, i)
-                    programs[name] = path
-                    i += 1
-                except OSError:
-                    break # 더 이상 읽을 값이 없으면 종료
-            winreg.CloseKey(key)
-        except Exception as e:
-            print(f"레지스트리 접근 오류: {e}")
-            return None
-            
+            store = SnapshotStore(self.db_file)
+        except sqlite3.DatabaseError as e:
+            store = self._reset_corrupt_store(e)
+        if not store.has_baseline() and self.legacy_file and os.path.exists(self.legacy_file):
+            self._import_legacy(store)
+        return store
+
+    def _reset_corrupt_store(self, error):
+        """
+        깨진 파일은 지우지 않고 -wal/-shm과 함께 옆으로 옮겨둔 뒤 새로 만듦.
+        지금 등록된 항목을 그대로 믿지 않도록 빈 기준 스냅샷으로 시작하므로, 모든 항목이 다시 승인 대상이 됩니다.
+        """
+        backup = f"{self.db_file}.corrupt-{int(time.time())}"
+        print(f"스냅샷 DB 손상 ({error}) -> {backup} 로 옮기고 새로 만듭니다.")
+        TELEMETRY.event("snapshot.reset", error=str(error), backup=backup)
+        for suffix in ("", "-wal", "-shm"):  # 남겨두면 새 DB에 예전 WAL이 다시 적용될 수 있음
+            if os.path.exists(self.db_file + suffix):
+                os.replace(self.db_file + suffix, backup + suffix)
+        store = SnapshotStore(self.db_file)
+        store.replace_baseline({})
+        if hasattr(self, "hasher"):
+            self.hasher = BinaryHasher(self.db_file)  # 해시 캐시 테이블도 새 파일에 다시 만듦
+        self._reset_backup = backup
+        self._last_result = None  # 지난 검사 결과는 예전 스냅샷 기준이므로 버림
+        return store
+
+    def _import_legacy(self, store):
+        try:
+            with open(self.legacy_file, "r", encoding="utf-8") as f:
+                saved_progs = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"이전 스냅샷을 읽지 못했습니다: {e}")
+            return
+        # 예전 형식(HKCU\Run의 이름만 저장)은 "소스ID|이름" 키로 변환
+        # 예전 스냅샷에는 실행 파일 해시가 없으므로 다음 검사 때 한 번만 지금 해시를 기준으로 삼음
+        store.replace_baseline({make_key(*split_key(key)): path for key, path in saved_progs.items()}, adopt_hashes=True)
+
+    def get_current_startup_programs(self):
+        """현재 등록된 시작 프로그램 목록을 가져옵니다. (키: "소스ID|이름")"""
+        programs, _ = self.sources.collect()
         return programs
 
     def check_for_changes(self):
         """
         저장된 스냅샷과 현재 상태를 비교합니다.
-        return: (상태코드, 새로운_프로그램_리스트)
-        상태코드: "SAFE", "WARNING", "FIRST_RUN"
+        return: (상태코드, 변경_항목_리스트)
+        상태코드: "SAFE", "WARNING", "FIRST_RUN", "ERROR",
+                  "RESET" (스냅샷 DB가 손상되어 새로 만듦 - 현재 항목 전부가 승인 대상, 한 번만 반환)
+        변경_항목: {"key", "name", "path", "source", "change"("added"/"modified"/"binary"/"denied"), "old_path",
+                    "exe", "sha256", "old_sha256", "reputation"}
         """
-        current_progs = self.get_current_startup_programs()
+        current_progs, changed = self.sources.collect()
         if current_progs is None:
             return "ERROR", []
 
-        # 1. 저장된 파일이 없으면 (최초 실행) -> 현재 상태 저장하고 종료
-        if not os.path.exists(self.db_file):
-            self.save_snapshot(current_progs)
-            return "FIRST_RUN", []
-
-        # 2. 저장된 파일 불러오기
+        # 레지스트리 값이 그대로여도 실행 파일이 바뀔 수 있으므로 파일 크기/수정시각도 확인 (stat만, 읽지는 않음)
+        exes = self._executables(current_progs)
+        with TELEMETRY.span("startup.binary_stat", files=len(exes)):
+            # 평판 목록도 여기서 한 번만 확인 (이후 verdict()는 메모리 조회만)
+            binary_token = (self.hasher.stat_many(set(exes.values())), self.reputation.reload())
         try:
-            with open(self.db_file, "r", encoding="utf-8") as f:
-                saved_progs = json.load(f)
-        except:
-            # 파일 깨졌으면 다시 저장
+            # 0. 소스도 스냅샷도 실행 파일도 그대로면 지난 결과를 그대로 반환 (주기적 검사 비용 최소화)
+            revision = self.store.revision()
+            if (not changed and self._last_result is not None and revision == self._last_revision
+                    and binary_token == self._last_binary_token):
+                return self._last_result
+
+            with TELEMETRY.span("startup.compare"):
+                status, new_items = self._compare(current_progs, exes)
+        except sqlite3.DatabaseError as e:
+            self.store = self._reset_corrupt_store(e)
+            status, new_items = self._compare(current_progs, exes)
+
+        # FIRST_RUN 다음부터는 변동이 없으면 SAFE
+        self._last_result = ("SAFE", []) if status == "FIRST_RUN" else (status, new_items)
+        self._last_revision = self.store.revision()
+        self._last_binary_token = binary_token
+        if self._reset_backup is not None:
+            # 조용히 새 기준을 만들지 않고 사용자에게 알림 (이후 검사는 승인 전까지 WARNING)
+            self._reset_backup = None
+            return "RESET", new_items
+        return status, new_items
+
+    def _executables(self, programs):
+        """{키: 실행 파일 경로} - 경로를 알 수 없는 항목은 빠짐"""
+        exes = {}
+        for key, command in programs.items():
+            exe = self._resolve_executable(command, split_key(key)[0] in self.sources.path_sources)
+            if exe:
+                exes[key] = exe
+        return exes
+
+    def _resolve_executable(self, command, is_path=False):
+        """명령줄(is_path면 파일 경로) -> 실행 파일 경로 (없으면 None). 결과는 명령줄별로 재사용"""
+        cache_key = (command, is_path)
+        if cache_key not in self._exe_by_command:
+            exe = command_executable(command, is_path)
+            if exe and not os.path.isabs(exe):
+                exe = shutil.which(exe) or exe  # 예: "rundll32.exe ..." -> System32에서 찾음
+            self._exe_by_command[cache_key] = exe
+        return self._exe_by_command[cache_key]
+
+    def _hash_entries(self, exes, keys=None):
+        """{키: 해시 정보} - 바뀐 실행 파일만 다시 읽음 (병렬)"""
+        keys = exes.keys() if keys is None else [key for key in keys if key in exes]
+        hashed = self.hasher.hash_many({exes[key] for key in keys})
+        return {key: dict(hashed[exes[key]], exe=exes[key]) for key in keys}
+
+    def _compare(self, current_progs, exes):
+        # 1. 기준 스냅샷이 없으면 (최초 실행) -> 현재 상태 저장하고 종료
+        if not self.store.has_baseline():
             self.save_snapshot(current_progs)
             return "FIRST_RUN", []
 
-        # 3. 비교 로직 (새로 추가된 것 찾기)
-        new_items = []
-        for name, path in current_progs.items():
-            if name not in saved_progs:
-                new_items.append({"name": name, "path": path})
+        # 2. 저장된 스냅샷과 키 기준으로 비교
+        saved_progs = self.store.load()
+        added, removed, modified = diff_snapshots(saved_progs, current_progs)
+
+        # 3. 삭제된 항목은 바로 스냅샷에서 빼고 기록만 남김 (없을 때는 아무것도 쓰지 않음)
+        if removed:
+            self.store.remove_many(removed)
+
+        # 4. 실행 파일 해시 (크기/수정시각이 그대로인 파일은 캐시 사용)
+        binaries = self._hash_entries(exes)
+        approved = self.store.approved_hashes()
+
+        # 5. 새로 생긴 항목 / 경로가 바뀐 항목은 사용자 승인이 필요
+        new_items = [self._make_item(key, current_progs[key], "added", binary=binaries.get(key)) for key in added]
+        new_items += [self._make_item(key, current_progs[key], "modified", saved_progs[key], binaries.get(key))
+                      for key in modified]
+
+        # 6. 이름/경로는 그대로인데 실행 파일 내용이 바뀐 항목
+        #    승인된 해시가 없는 항목(승인 때 파일이 없었던 경우 등)에 파일이 생겨도 바뀐 것으로 봄.
+        #    해시 기능 이전 스냅샷을 옮겨온 직후 한 번만 지금 해시를 조용히 기준으로 삼음
+        adopting = self.store.needs_hash_adoption()
+        first_seen = {} # 해시 기능 이전 스냅샷에서 처음 본 해시
+        trusted = {}    # 바뀌었지만 허용 목록에 있는 해시 - 경고 없이 새 기준으로
+        for key in sorted(current_progs.keys() & saved_progs.keys() - set(modified)):
+            binary = binaries.get(key)
+            if binary is None or binary["sha256"] is None:
+                continue
+            old = approved.get(key)
+            if old is None and adopting:
+                first_seen[key] = binary["sha256"]
+            elif old != binary["sha256"]:
+                if self.reputation.verdict(binary["sha256"]) == "allow":
+                    trusted[key] = binary["sha256"]
+                else:
+                    new_items.append(self._make_item(key, current_progs[key], "binary", binary=binary, old_sha256=old))
+            elif self.reputation.verdict(binary["sha256"]) == "deny":
+                # 승인했던 파일이라도 나중에 차단 목록에 오르면 다시 경고
+                new_items.append(self._make_item(key, current_progs[key], "denied", binary=binary, old_sha256=old))
+        if adopting:
+            self.store.adopt_hashes({**first_seen, **trusted})
+        elif trusted:
+            self.store.set_hashes(trusted)
 
-        # 4. 결과 반환
         if new_items:
-            # 변경사항이 있으면 사용자에게 알리기 위해 저장하지 않음 (사용자가 확인 후 저장하도록 유도 가능)
-            # 여기서는 편의상 감지 후 바로 갱신하지 않고 경고만 줌
             return "WARNING", new_items
-        else:
-            # 변동 없으면 최신 상태로 갱신 (삭제된 게 있을 수 있으니)
-            self.save_snapshot(current_progs)
-            return "SAFE", []
+        return "SAFE", []
+
+    def _make_item(self, key, path, change, old_path=None, binary=None, old_sha256=None):
+        source_id, name = split_key(key)
+        sha256 = binary["sha256"] if binary else None
+        return {"key": key, "name": name, "path": path, "source": source_id, "change": change, "old_path": old_path,
+                "exe": binary["exe"] if binary else None, "sha256": sha256, "old_sha256": old_sha256,
+                "reputation": self.reputation.verdict(sha256)}
 
     def save_snapshot(self, data):
-        """현재 상태를 JSON 파일로 저장"""
+        """현재 상태를 기준 스냅샷으로 저장 (바뀐 항목만 기록, 실행 파일 해시 포함)"""
         try:
-            with open(self.db_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-        except Exception as e:
+            binaries = self._hash_entries(self._executables(data))
+            self.store.replace_baseline(data, {key: binary["sha256"] for key, binary in binaries.items()})
+        except sqlite3.Error as e:
             print(f"저장 오류: {e}")
-    
-    def approve_new_program(self, name, path):
+            TELEMETRY.event("snapshot.save_error", error=str(e))
+
+    def approve_new_program(self, name, path, source=HKCU_RUN):
+        return self.approve_programs([{"key": make_key(source, name), "name": name, "path": path}])
+
+    def approve_programs(self, items):
+        """
+        여러 항목을 한 번에 승인합니다. (이제 이 프로그램들은 '정상'으로 인식됨)
+        실행 파일 해시는 화면에 보였던 값이 아니라 승인하는 시점의 파일에서 다시 확인해 저장합니다.
+        """
         try:
-            # 1. 기존 스냅샷 불러오기
-            with open(self.db_file, "r", encoding="utf-8") as f:
-                saved_progs = json.load(f)
-            
-            # 2. 승인된 프로그램 추가
-            saved_progs[name] = path
-            
-            # 3. 저장 (이제 이 프로그램은 '정상'으로 인식됨)
-            self.save_snapshot(saved_progs)
+            binaries = self._hash_entries(self._executables({item["key"]: item["path"] for item in items}))
+            self.store.approve_many([(item["key"], item["path"]) for item in items],
+                                    {key: binary["sha256"] for key, binary in binaries.items()})
+            self._last_result = None
             return True
-        except Exception as e:
+        except sqlite3.Error as e:
             print(f"승인 오류: {e}")
+            TELEMETRY.event("snapshot.save_error", error=str(e))
             return False
 
+    def approved_executables(self):
+        """
+        승인된(기준 스냅샷에 있는) 시작프로그램의 실행 파일 경로 집합. (검사와 같은 방식으로 찾은 경로, os.path.normcase 적용)
+        스냅샷 리비전은 메모리에 있는 값만 보고 바뀌었을 때만 다시 만들므로,
+        프로세스 감시에서 매초 불러도 DB를 열지 않습니다. (다른 스레드에서 호출 가능)
+        """
+        revision = self.store.last_revision
+        if revision is None:
+            revision = self.store.revision()
+        cached_revision, exes = self._approved_exes
+        if cached_revision != revision:
+            exes = frozenset(os.path.normcase(exe) for exe in self._executables(self.store.load()).values())
+            self._approved_exes = (revision, exes)
+        return exes
+
+    def recent_changes(self, limit=100):
+        """최근 스냅샷 변경 기록 (추가/삭제/수정, 최신순)"""
+        return self.store.journal(limit)
+
 # 테스트용 코드 (이 파일을 직접 실행했을 때만 동작)
 if __name__ == "__main__":
     monitor = StartupMonitor()
     status, new_items = monitor.check_for_changes()
     print(f"상태: {status}")
     if new_items:
-        print("새로 발견된 항목:", new_items)
\ No newline at end of file
+        print("새로 발견된 항목:", new_items)
@@ -0,0 +1,56 @@
+# src/startup_profiler.py
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    앱 시작 비용을 구간별로 기록합니다. (모듈 import, 서비스 생성, 화면(프레임) 생성)
+    무거운 모듈은 lazy_import로 처음 쓸 때 불러오고, 그 시간도 함께 기록됩니다.
+    """
+
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin  # 앱 시작 시각
+        self.records = []  # {"kind", "name", "ms", "at_ms"(앱 시작 후 끝난 시점), "thread"}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, kind, name):
+        """with 블록 시간을 기록합니다. (as로 받은 기록은 블록이 끝나면 ms가 채워짐)"""
+        record = {"kind": kind, "name": name, "ms": None, "at_ms": None, "thread": threading.current_thread().name}
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            ended = time.perf_counter()
+            record["ms"], record["at_ms"] = (ended - started) * 1000, (ended - self.origin) * 1000
+            with self._lock:
+                self.records.append(record)
+
+    def lazy_import(self, module_name):
+        """모듈을 처음 쓸 때 불러옵니다. (이미 불러온 모듈이면 기록 없이 바로 반환)"""
+        module = sys.modules.get(module_name)
+        if module is None:
+            with self.measure("import", module_name):
+                module = importlib.import_module(module_name)
+        return module
+
+    def totals(self):
+        """분류별 합계 (ms)"""
+        totals = {}
+        with self._lock:
+            for record in self.records:
+                totals[record["kind"]] = totals.get(record["kind"], 0.0) + record["ms"]
+        return totals
+
+    def report(self, title="시작 프로파일"):
+        with self._lock:
+            records = sorted(self.records, key=lambda record: record["at_ms"])
+        lines = [title]
+        for record in records:
+            thread = "" if record["thread"] == "MainThread" else f"  ({record['thread']})"
+            lines.append(f"  {record['kind']:<8}{record['name']:<22}{record['ms']:8.1f}ms  @ {record['at_ms']:.0f}ms{thread}")
+        return "\n".join(lines)
@@ -0,0 +1,239 @@
+# src/startup_sources.py
+import json
+import os
+import re
+from telemetry import TELEMETRY
+
+try:
+    import winreg
+except ImportError:  # 윈도우가 아닌 환경 (리눅스 개발/벤치마크용)
+    winreg = None
+
+# 항목 키 형식: "<소스ID>|<이름>"  (소스ID에는 '|'가 들어가지 않음)
+KEY_SEPARATOR = "|"
+HKCU_RUN = r"HKCU\Run"
+
+# 환경변수로 가짜(JSON 파일) 소스를 지정하면 레지스트리 대신 사용 (리눅스 테스트용)
+FAKE_SOURCE_ENV = "SECUDECK_FAKE_STARTUP"
+
+_RUN_PATH = r"Software\Microsoft\Windows\CurrentVersion"
+_WOW64_RUN_PATH = r"Software\Wow6432Node\Microsoft\Windows\CurrentVersion"
+
+
+# 명령줄 맨 앞의 실행 파일 (따옴표 없이 공백이 들어간 경로도 확장자까지를 경로로 봄)
+_COMMAND_EXE = re.compile(r"(.+?\.(?:exe|com|bat|cmd|scr))(?=\s|$)", re.IGNORECASE)
+
+
+def command_executable(command, is_path=False):
+    """
+    시작프로그램 명령줄에서 실행 파일 경로만 꺼냅니다. (비교용으로 대소문자/구분자 정규화)
+      "C:\\Program Files\\App\\app.exe" --min  ->  c:\\program files\\app\\app.exe
+      %ProgramFiles%\\App\\app.exe /s           ->  환경변수 확장 후 같은 방식
+    is_path=True이면 명령줄이 아니라 파일 경로 그대로 (시작프로그램 폴더의 바로가기 등)
+    """
+    command = os.path.expandvars(command.strip())
+    if not command:
+        return None
+    if is_path or (command[0] != '"' and os.path.isfile(command)):
+        # 따옴표 없이 공백이 들어간 경로 (예: ...\\Start Menu\\...\\OneNote.lnk) - 공백에서 자르지 않음
+        path = command
+    elif command[0] == '"':
+        end = command.find('"', 1)
+        path = command[1:end] if end > 0 else command[1:]
+    else:
+        match = _COMMAND_EXE.match(command)
+        path = match.group(1) if match else command.split()[0]
+    return os.path.normcase(os.path.normpath(path))
+
+
+def make_key(source_id, name):
+    return f"{source_id}{KEY_SEPARATOR}{name}"
+
+
+def split_key(key):
+    """키를 (소스ID, 이름)으로 나눕니다. 예전 스냅샷(이름만 저장)은 HKCU\\Run으로 간주합니다."""
+    source_id, sep, name = key.partition(KEY_SEPARATOR)
+    if not sep:
+        return HKCU_RUN, key
+    return source_id, name
+
+
+class RegistryRunSource:
+    """레지스트리 Run/RunOnce 키 하나. 변경 토큰은 키의 마지막 수정 시각(QueryInfoKey)입니다."""
+
+    def __init__(self, source_id, hive, subkey):
+        self.source_id = source_id
+        self.hive = hive
+        self.subkey = subkey
+
+    def _open(self):
+        return winreg.OpenKey(self.hive, self.subkey, 0, winreg.KEY_READ)
+
+    def change_token(self):
+        try:
+            with self._open() as key:
+                return winreg.QueryInfoKey(key)[2]
+        except FileNotFoundError:
+            return None  # 키가 없음 (예: RunOnce가 비어 있어 삭제된 경우)
+
+    def read(self):
+        programs = {}
+        try:
+            with self._open() as key:
+                # 값 개수를 미리 알 수 있으므로 예외로 끝을 찾을 필요 없음
+                value_count = winreg.QueryInfoKey(key)[1]
+                for i in range(value_count):
+                    name, path, _ = winreg.EnumValue(key, i)
+                    programs[name] = path
+        except FileNotFoundError:
+            pass
+        return programs
+
+
+class StartupFolderSource:
+    """
+    시작프로그램 폴더. 변경 토큰은 폴더의 수정 시각입니다.
+    (파일 추가/삭제/이름 변경 시 바뀜 - 바로가기 내용만 바뀐 경우는 감지하지 못함)
+    """
+
+    entries_are_paths = True  # 항목 값이 명령줄이 아니라 파일 경로 (해시할 때 그대로 씀)
+
+    def __init__(self, source_id, folder):
+        self.source_id = source_id
+        self.folder = folder
+
+    def change_token(self):
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def read(self):
+        programs = {}
+        try:
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.lower() != "desktop.ini":
+                        programs[entry.name] = entry.path
+        except FileNotFoundError:
+            pass
+        return programs
+
+
+class FakeStartupSource:
+    """
+    테스트/벤치마크용 가짜 소스 (리눅스에서도 동작).
+    - file_path가 없으면 메모리에 보관 (set/remove 할 때마다 버전 증가)
+    - file_path가 있으면 {"이름": "명령줄"} 형식의 JSON 파일을 읽음 (파일 수정 시각이 토큰)
+    """
+
+    def __init__(self, source_id, entries=None, file_path=None):
+        self.source_id = source_id
+        self.file_path = file_path
+        self._entries = dict(entries or {})
+        self._version = 0
+
+    def set(self, name, path):
+        self._entries[name] = path
+        self._version += 1
+
+    def remove(self, name):
+        if self._entries.pop(name, None) is not None:
+            self._version += 1
+
+    def change_token(self):
+        if self.file_path is None:
+            return self._version
+        try:
+            st = os.stat(self.file_path)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def read(self):
+        if self.file_path is None:
+            return dict(self._entries)
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+
+def default_sources():
+    """현재 환경에서 감시할 기본 소스 목록"""
+    fake_path = os.environ.get(FAKE_SOURCE_ENV)
+    if fake_path:
+        return [FakeStartupSource(HKCU_RUN, file_path=fake_path)]
+    if winreg is None:
+        return []
+
+    hkcu, hklm = winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE
+    sources = [
+        RegistryRunSource(HKCU_RUN, hkcu, _RUN_PATH + r"\Run"),
+        RegistryRunSource(r"HKCU\RunOnce", hkcu, _RUN_PATH + r"\RunOnce"),
+        RegistryRunSource(r"HKLM\Run", hklm, _RUN_PATH + r"\Run"),
+        RegistryRunSource(r"HKLM\RunOnce", hklm, _RUN_PATH + r"\RunOnce"),
+        RegistryRunSource(r"HKLM\Wow6432Node\Run", hklm, _WOW64_RUN_PATH + r"\Run"),
+        RegistryRunSource(r"HKLM\Wow6432Node\RunOnce", hklm, _WOW64_RUN_PATH + r"\RunOnce"),
+    ]
+    startup_subdir = os.path.join("Microsoft", "Windows", "Start Menu", "Programs", "Startup")
+    if os.environ.get("APPDATA"):
+        sources.append(StartupFolderSource("StartupFolder(User)", os.path.join(os.environ["APPDATA"], startup_subdir)))
+    if os.environ.get("PROGRAMDATA"):
+        sources.append(StartupFolderSource("StartupFolder(Common)", os.path.join(os.environ["PROGRAMDATA"], startup_subdir)))
+    return sources
+
+
+class StartupSourceSet:
+    """
+    여러 소스를 묶어서 읽습니다.
+    소스마다 마지막 변경 토큰과 읽은 결과를 기억해 두고, 토큰이 그대로면 다시 읽지 않습니다.
+    """
+
+    def __init__(self, sources):
+        self.sources = list(sources)
+        # 항목 값이 파일 경로 그대로인 소스 (명령줄로 해석하지 않음)
+        self.path_sources = {source.source_id for source in self.sources if getattr(source, "entries_are_paths", False)}
+        self._cache = {}  # source_id -> (토큰, {이름: 명령줄})
+        self._programs = None  # 마지막으로 합친 결과 (변동 없으면 재사용)
+
+    def collect(self):
+        """
+        return: (프로그램_딕셔너리, 변경_여부)
+        프로그램_딕셔너리의 키는 make_key(소스ID, 이름). 모든 소스를 읽지 못하면 (None, False)
+        """
+        changed = False
+        failures = 0
+        merged = []
+
+        for source in self.sources:
+            cached = self._cache.get(source.source_id)
+            try:
+                token = source.change_token()
+                if cached is not None and token is not None and cached[0] == token:
+                    entries = cached[1]  # 변동 없음 -> 다시 읽지 않음
+                else:
+                    with TELEMETRY.span("startup.source_read", source=source.source_id):
+                        entries = source.read()
+                    if cached is None or cached[1] != entries:
+                        changed = True
+                    self._cache[source.source_id] = (token, entries)
+            except OSError as e:
+                print(f"레지스트리 접근 오류 ({source.source_id}): {e}")
+                TELEMETRY.event("startup.source_error", source=source.source_id, error=str(e))
+                failures += 1
+                entries = cached[1] if cached is not None else {}
+            merged.append((source.source_id, entries))
+
+        if self.sources and failures == len(self.sources):
+            return None, False
+        if changed or self._programs is None:
+            self._programs = {make_key(source_id, name): path
+                              for source_id, entries in merged for name, path in entries.items()}
+        return self._programs, changed
+
+    def invalidate(self):
+        """캐시를 비워 다음 collect()에서 모든 소스를 다시 읽게 합니다."""
+        self._cache.clear()
+        self._programs = None
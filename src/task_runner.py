@@ -0,0 +1,172 @@
+# src/task_runner.py
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor  # 첫 화면 전에 시작프로그램 검사를 보내므로 미룰 수 없음
+from telemetry import TELEMETRY
+
+
+def _callback_name(callback, args):
+    # _finish는 결과를 받을 콜백 이름으로 표시 (어느 작업의 결과 처리인지 보이도록)
+    if callback.__name__ == "_finish" and args:
+        handle = args[0]
+        target = handle.on_error if args[2] is not None else handle.on_done
+        return f"{handle.key}:{getattr(target, '__qualname__', None) or 'None'}"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class TaskHandle:
+    """제출된 작업 하나를 가리키는 핸들 (취소 여부 확인용)"""
+
+    def __init__(self, key, func, args, kwargs, on_done, on_error, coalesce, pass_cancel):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.coalesce = coalesce
+        self.pass_cancel = pass_cancel
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+
+class BackgroundTaskRunner:
+    """
+    무거운 작업(레지스트리 조회, 파일 저장 등)을 작업 스레드에서 돌리고,
+    결과 콜백은 Tk의 after()를 통해 메인(UI) 스레드에서 실행합니다.
+
+    - 같은 key의 작업은 순서대로 하나씩만 실행됩니다.
+    - coalesce=True인 작업은 아직 시작하지 않은 같은 key의 coalesce 작업을 대체합니다.
+      (새로고침 버튼을 여러 번 눌러도 검사는 한 번만 더 돌게 됨)
+    - 결과 큐는 UI 스레드에서 poll_ms마다 도는 고정 루프가 비웁니다. after()는 UI 스레드에서만 부르므로
+      submit()/post()는 어느 스레드에서 불러도 됩니다. (반드시 UI 스레드에서 만들어야 함)
+    """
+
+    def __init__(self, root, max_workers=2, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="secudeck")
+        self._results = queue.Queue()  # 작업 스레드 -> UI 스레드 전달용
+        self._lock = threading.Lock()
+        self._running = {}  # key -> 실행 중인 TaskHandle
+        self._pending = {}  # key -> 대기 중인 TaskHandle 목록(deque)
+        self._closed = False
+        self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, key, func, *args, on_done=None, on_error=None, coalesce=False, pass_cancel=False, **kwargs):
+        """
+        작업을 제출합니다.
+        pass_cancel=True이면 func에 cancel_event 키워드 인자를 넘겨 협조적 취소를 지원합니다.
+        """
+        handle = TaskHandle(key, func, args, kwargs, on_done, on_error, coalesce, pass_cancel)
+
+        with self._lock:
+            if self._closed:
+                handle.cancel()
+                return handle
+            pending = self._pending.setdefault(key, deque())
+            if coalesce:
+                # 아직 시작 안 한 같은 종류의 요청은 버리고 최신 요청 하나만 남김
+                for old in [h for h in pending if h.coalesce]:
+                    old.cancel()
+                    pending.remove(old)
+            pending.append(handle)
+            self._start_next_locked(key)
+        return handle
+
+    def post(self, callback, *args):
+        """작업 스레드에서 UI 스레드로 콜백을 넘깁니다 (진행률/스트리밍 결과 전달용)"""
+        self._results.put((callback, args))
+
+    def cancel(self, key):
+        """해당 key의 실행 중/대기 중 작업을 모두 취소합니다."""
+        with self._lock:
+            for handle in self._pending.pop(key, ()):
+                handle.cancel()
+            running = self._running.get(key)
+            if running is not None:
+                running.cancel()
+
+    def is_busy(self, key):
+        with self._lock:
+            return key in self._running or bool(self._pending.get(key))
+
+    def shutdown(self):
+        """앱 종료 시 호출: 대기 작업은 버리고 실행 중 작업에는 취소 신호를 보냅니다."""
+        with self._lock:
+            self._closed = True
+            for key in list(self._pending):
+                for handle in self._pending.pop(key):
+                    handle.cancel()
+            for handle in self._running.values():
+                handle.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- 내부 동작 ---
+
+    def _start_next_locked(self, key):
+        if key in self._running:
+            return
+        pending = self._pending.get(key)
+        if not pending:
+            self._pending.pop(key, None)
+            return
+        handle = pending.popleft()
+        self._running[key] = handle
+        self._executor.submit(self._run, handle)
+
+    def _run(self, handle):
+        # 작업 스레드에서 실행됨
+        if handle.cancelled:
+            self._results.put((self._finish, (handle, None, None)))
+            return
+        if handle.pass_cancel:
+            handle.kwargs["cancel_event"] = handle.cancel_event
+        try:
+            with TELEMETRY.span("task." + handle.key):
+                result = handle.func(*handle.args, **handle.kwargs)
+            self._results.put((self._finish, (handle, result, None)))
+        except Exception as e:
+            self._results.put((self._finish, (handle, None, e)))
+
+    def _finish(self, handle, result, error):
+        # UI 스레드에서 실행됨
+        with self._lock:
+            if self._running.get(handle.key) is handle:
+                del self._running[handle.key]
+            self._start_next_locked(handle.key)
+
+        if handle.cancelled:
+            return
+        if error is not None:
+            if handle.on_error:
+                handle.on_error(error)
+            else:
+                print(f"작업 오류 ({handle.key}): {error}")
+        elif handle.on_done:
+            handle.on_done(result)
+
+    def _poll(self):
+        # 쌓인 콜백을 UI 스레드에서 한꺼번에 처리
+        while True:
+            try:
+                callback, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                # UI 스레드에서 오래 걸린 콜백은 진단 화면의 'UI 멈춤' 원인으로 잡힘
+                with TELEMETRY.span("ui.callback", name=_callback_name(callback, args)):
+                    callback(*args)
+            except Exception as e:
+                print(f"UI 콜백 오류: {e}")
+                TELEMETRY.event("ui.callback_error", error=str(e))
+
+        if not self._closed:
+            self.root.after(self.poll_ms, self._poll)
@@ -0,0 +1,266 @@
+# src/telemetry.py
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# 히스토그램 구간 (ms). 마지막 구간 위는 전부 "그 이상"
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+RECENT_MIN_MS = 1.0     # 이보다 짧은 구간은 히스토그램에만 넣고 최근 목록에는 남기지 않음
+STALL_MS = 200          # UI 이벤트 루프가 이만큼 늦으면 '멈춤'으로 기록
+
+
+class Histogram:
+    """고정 구간 히스토그램 (값을 따로 보관하지 않아 오래 켜 둬도 메모리가 늘지 않음)"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS_MS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """q(0~1) 위치 값이 들어 있는 구간의 위쪽 경계 (맨 위 구간이면 최댓값)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(BUCKETS_MS[index], self.max) if index < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {"count": self.count, "total_ms": round(self.total, 1),
+                "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+                "p50_ms": round(self.percentile(0.5), 3), "p95_ms": round(self.percentile(0.95), 3),
+                "p99_ms": round(self.percentile(0.99), 3),
+                "max_ms": round(self.max, 3)}
+
+
+class _Span:
+    __slots__ = ("telemetry", "name", "attrs", "started", "wall")
+
+    def __init__(self, telemetry, name, attrs):
+        self.telemetry = telemetry
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.wall = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.telemetry._finish(self, (time.perf_counter() - self.started) * 1000, exc_type)
+        return False
+
+
+class RotatingJsonLines:
+    """JSON Lines 파일. max_bytes를 넘으면 .1, .2 ...로 밀어내고 backups개까지만 남김"""
+
+    def __init__(self, path, max_bytes=1024 * 1024, backups=3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    self._rotate()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as e:
+                print(f"진단 기록 저장 오류: {e}")
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+class Telemetry:
+    """
+    가벼운 계측: 구간 시간(span), 카운터, 히스토그램, 최근 구간/이벤트/UI 멈춤 기록.
+    모든 값은 메모리에만 두고, export()를 부를 때 파일로 한 줄씩 남깁니다.
+    """
+
+    def __init__(self, recent_limit=1000, event_limit=200, stall_limit=50):
+        self.started = time.time()
+        self.counters = {}
+        self.histograms = {}
+        self.recent = deque(maxlen=recent_limit)  # 끝난 구간 (RECENT_MIN_MS 이상)
+        self.events = deque(maxlen=event_limit)   # 오류 등 눈에 띄는 일
+        self.stalls = deque(maxlen=stall_limit)   # UI 멈춤과 그때 UI 스레드에서 돌던 구간
+        self.exporter = None
+        self._lock = threading.Lock()
+
+    # --- 기록 ---
+
+    def span(self, name, /, **attrs):
+        """with TELEMETRY.span("snapshot.load"): ... - 걸린 시간을 name 히스토그램에 넣음"""
+        return _Span(self, name, attrs)
+
+    def _finish(self, span, ms, exc_type):
+        thread = threading.current_thread().name
+        with self._lock:
+            self._observe_locked(span.name, ms)
+            if exc_type is not None:
+                self.counters[span.name + ".error"] = self.counters.get(span.name + ".error", 0) + 1
+            if ms >= RECENT_MIN_MS:
+                self.recent.append({"name": span.name, "at": span.wall, "started": span.started, "ms": round(ms, 3),
+                                    "thread": thread, "attrs": span.attrs})
+
+    def observe(self, name, ms):
+        """이미 잰 시간(ms)을 히스토그램에 넣음 (다른 프로세스에서 잰 값 등)"""
+        with self._lock:
+            self._observe_locked(name, ms)
+
+    def _observe_locked(self, name, ms):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(ms)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def event(self, name, /, **attrs):
+        """눈에 띄는 일 (오류 등) - 개수도 함께 셈"""
+        record = {"name": name, "at": time.time(), "thread": threading.current_thread().name, "attrs": attrs}
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+            self.events.append(record)
+
+    def record_stall(self, started, ended, lag_ms):
+        """
+        UI 이벤트 루프가 started~ended(perf_counter) 동안 막혔을 때 호출.
+        그 사이에 UI 스레드에서 돌았던 구간을 오래 걸린 순으로 붙여 둡니다.
+        """
+        with self._lock:
+            culprits = [span for span in self.recent if span["thread"] == "MainThread"
+                        and span["started"] < ended and span["started"] + span["ms"] / 1000 > started]
+            culprits.sort(key=lambda span: span["ms"], reverse=True)
+            stall = {"at": time.time() - (time.perf_counter() - started), "lag_ms": round(lag_ms, 1),
+                     "culprits": [{"name": span["name"], "ms": span["ms"], "attrs": span["attrs"]} for span in culprits[:5]]}
+            self.stalls.append(stall)
+            self.counters["ui.stalls"] = self.counters.get("ui.stalls", 0) + 1
+        if self.exporter is not None:
+            self.exporter.write({"type": "stall", **stall})  # 드문 일이라 바로 남김
+        return stall
+
+    # --- 보기 / 내보내기 ---
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "time": time.time(),
+                "uptime": round(time.time() - self.started, 1),
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+                "slowest": [dict(span) for span in sorted(self.recent, key=lambda span: span["ms"], reverse=True)[:20]],
+                "events": list(self.events)[-20:],
+                "stalls": list(self.stalls)[-20:],
+            }
+
+    def configure_export(self, path, max_bytes=1024 * 1024, backups=3):
+        self.exporter = RotatingJsonLines(path, max_bytes, backups)
+
+    def export(self):
+        """지금까지의 값을 내보내기 파일에 한 줄로 남김 (설정 안 했으면 아무것도 안 함)"""
+        if self.exporter is not None:
+            snapshot = self.snapshot()
+            for span in snapshot["slowest"]:
+                span.pop("started")  # 프로세스 안에서만 의미 있는 값
+            self.exporter.write({"type": "snapshot", **snapshot})
+
+
+def _detail(attrs):
+    # 어느 콜백/화면/소스였는지 (있으면)
+    for key in ("name", "source", "path"):
+        if key in attrs:
+            return f"[{attrs[key]}]"
+    return ""
+
+
+def format_report(snapshot):
+    """진단 화면용 텍스트"""
+    lines = [f"실행 {snapshot['uptime']:.0f}초  ·  UI 멈춤 {snapshot['counters'].get('ui.stalls', 0)}회", ""]
+    lines.append(f"{'구간':<28}{'횟수':>8}{'평균':>10}{'p95':>10}{'최대':>10}  (ms)")
+    for name, h in snapshot["histograms"].items():
+        lines.append(f"{name:<28}{h['count']:>8,}{h['mean_ms']:>10.2f}{h['p95_ms']:>10.1f}{h['max_ms']:>10.1f}")
+    if snapshot["stalls"]:
+        lines += ["", "최근 UI 멈춤"]
+        for stall in reversed(snapshot["stalls"]):
+            culprits = ", ".join(f"{c['name']}{_detail(c['attrs'])} {c['ms']:.0f}ms" for c in stall["culprits"]) or "(계측 안 된 코드)"
+            lines.append(f"  {time.strftime('%H:%M:%S', time.localtime(stall['at']))}  {stall['lag_ms']:.0f}ms 지연  <- {culprits}")
+    if snapshot["events"]:
+        lines += ["", "최근 이벤트"]
+        for event in reversed(snapshot["events"]):
+            lines.append(f"  {time.strftime('%H:%M:%S', time.localtime(event['at']))}  {event['name']}  {event['attrs']}")
+    counters = {name: value for name, value in snapshot["counters"].items() if name != "ui.stalls"}
+    if counters:
+        lines += ["", "카운터"] + [f"  {name:<30}{value:>12,}" for name, value in sorted(counters.items())]
+    return "\n".join(lines)
+
+
+class EventLoopLagProbe:
+    """
+    Tk 이벤트 루프 지연 측정.
+    after(interval_ms)로 예약한 콜백이 예정보다 얼마나 늦게 불렸는지를 "ui.lag" 히스토그램에 넣고,
+    stall_ms 이상 늦으면 그동안 UI 스레드에서 돌던 구간과 함께 멈춤으로 기록합니다.
+    """
+
+    def __init__(self, root, telemetry, interval_ms=100, stall_ms=STALL_MS):
+        self.root = root
+        self.telemetry = telemetry
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+        self._after_id = None
+        self._expected = None
+
+    def start(self):
+        if self._after_id is None:
+            self._schedule()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self._expected) * 1000)
+        self.telemetry.observe("ui.lag", lag_ms)
+        if lag_ms >= self.stall_ms:
+            self.telemetry.record_stall(self._expected, now, lag_ms)
+        self._schedule()
+
+
+# 앱 전체가 같이 쓰는 기본 계측기 (GUI/CLI/엔진 공용)
+TELEMETRY = Telemetry()
@@ -0,0 +1,140 @@
+# src/virtual_list.py
+import tkinter
+import customtkinter as ctk
+from list_model import ListModel
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    항목이 수만 개여도 가벼운 스크롤 목록.
+    화면에 보이는 줄 수만큼만 행 위젯을 만들어 두고, 스크롤하면 그 위젯에 다른 항목을 다시 채워 넣습니다.
+      make_row(parent) -> 행 위젯 (처음 한 번만 호출, 높이는 row_height로 만들어야 함)
+      bind_row(row, item) -> 행 위젯에 항목 내용을 채움 (스크롤/갱신 때마다 호출)
+    항목 추가/정렬/필터는 model(ListModel)이 하고, 화면 갱신은 idle 때 한 번으로 모아서 합니다.
+    """
+
+    WHEEL_ROWS = 3  # 마우스 휠 한 칸에 움직일 줄 수
+
+    def __init__(self, master, make_row, bind_row, model=None, row_height=40, label_text=None, label_font=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.model = model if model is not None else ListModel(key=id)
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.label_text = label_text
+        self.first = 0        # 맨 위에 보이는 항목 번호
+        self._rows = []       # 재사용하는 행 위젯
+        self._bound = []      # 각 행 위젯에 지금 채워진 항목 (같으면 다시 채우지 않음)
+        self._shown = 0       # 지금 화면에 놓인 행 수
+        self._pending = None  # 예약된 화면 갱신 (after_idle id)
+        self._rendered_revision = None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        if label_text is not None:
+            self.lbl_header = ctk.CTkLabel(self, text=label_text, font=label_font)
+            self.lbl_header.grid(row=0, column=0, columnspan=2, pady=(5, 0))
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=1, column=0, sticky="nsew", padx=(5, 0), pady=5)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", pady=5)
+
+        self.body.bind("<Configure>", lambda event: self.schedule_refresh())
+        self._bind_wheel(self.body)
+
+    # --- 항목 조작 (model에 위임하고 화면 갱신 예약) ---
+
+    def extend(self, items):
+        self.model.extend(items)
+        self.schedule_refresh()
+
+    def remove(self, keys):
+        self.model.remove(keys)
+        self.schedule_refresh()
+
+    def clear(self):
+        self.model.clear()
+        self.first = 0
+        self.schedule_refresh()
+
+    def set_sort(self, sort_key, reverse=False):
+        self.model.set_sort(sort_key, reverse)
+        self.first = 0
+        self.schedule_refresh()
+
+    def set_filter(self, filter_func):
+        self.model.set_filter(filter_func)
+        self.first = 0
+        self.schedule_refresh()
+
+    # --- 스크롤 ---
+
+    @property
+    def visible_rows(self):
+        return max(1, self.body.winfo_height() // self.row_height)
+
+    def yview(self, *args):
+        # 스크롤바가 부르는 형식: ("moveto", 비율) 또는 ("scroll", 칸 수, "units"/"pages")
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.model))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.first += step * self.visible_rows if args[2] == "pages" else step
+        self.schedule_refresh()
+
+    def _on_wheel(self, event):
+        # 윈도우/맥은 delta 부호로, 리눅스는 Button-4/5로 방향을 알려줌
+        up = event.delta > 0 if event.num not in (4, 5) else event.num == 4
+        self.yview("scroll", -self.WHEEL_ROWS if up else self.WHEEL_ROWS, "units")
+
+    def _bind_wheel(self, widget):
+        # 휠 이벤트는 커서 아래 위젯으로만 오므로 행 안쪽 위젯까지 모두 연결
+        # (CTk 위젯의 bind는 내부 위젯에도 대신 걸어주므로 중복되지 않게 tkinter 쪽 bind를 씀)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tkinter.Misc.bind(widget, sequence, self._on_wheel, "+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    # --- 그리기 ---
+
+    def schedule_refresh(self):
+        # 여러 번 불려도 다음 idle 때 한 번만 다시 그림
+        if self._pending is None:
+            self._pending = self.after_idle(self.refresh)
+
+    def refresh(self, force=False):
+        """보이는 줄만 다시 채웁니다. force=True면 항목이 같아도 다시 채움 (선택 상태 변경 등)"""
+        self._pending = None
+        if force:
+            self._bound = [None] * len(self._bound)
+        total, visible = len(self.model), self.visible_rows
+        self.first = max(0, min(self.first, total - visible))
+        shown = min(visible, total - self.first)
+
+        for i in range(shown):
+            if i == len(self._rows):
+                row = self.make_row(self.body)
+                row.pack_propagate(False) # 내용이 바뀌어도 행 높이는 그대로
+                row.grid_propagate(False)
+                self._bind_wheel(row)
+                self._rows.append(row)
+                self._bound.append(None)
+            item = self.model[self.first + i]
+            if self._bound[i] is not item:
+                self.bind_row(self._rows[i], item)
+                self._bound[i] = item
+            if i >= self._shown:
+                self._rows[i].place(x=0, y=i * self.row_height, relwidth=1.0)
+        for i in range(shown, self._shown):
+            self._rows[i].place_forget()
+            self._bound[i] = None
+        self._shown = shown
+
+        if total:
+            self.scrollbar.set(self.first / total, (self.first + shown) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if self.label_text is not None and self._rendered_revision != self.model.revision:
+            count = f"{total:,}개" if self.model.total == total else f"{total:,} / {self.model.total:,}개"
+            self.lbl_header.configure(text=f"{self.label_text} ({count})")
+        self._rendered_revision = self.model.revision
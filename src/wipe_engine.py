@@ -0,0 +1,283 @@
+# src/wipe_engine.py
+import os
+import stat
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from telemetry import TELEMETRY
+
+# 덮어쓰기 방식: 회차별로 어떤 값으로 덮어쓸지
+WIPE_SCHEMES = {
+    "zero": ["zero"],                                  # 1회: 0으로 채움 (가장 빠름)
+    "random": ["random"],                              # 1회: 난수
+    "3pass": ["random", "random", "zero"],             # 3회: 난수 2번 + 0
+    "dod": ["zero", "ones", "random"],                 # DoD 5220.22-M (3회)
+    "dod7": ["zero", "ones", "random", "random", "zero", "ones", "random"],  # DoD 5220.22-M ECE (7회)
+}
+SCHEME_LABELS = {
+    "zero": "빠른 삭제 (1회, 0)",
+    "random": "1회 난수",
+    "3pass": "3회 덮어쓰기",
+    "dod": "DoD 5220.22-M (3회)",
+    "dod7": "DoD 5220.22-M ECE (7회)",
+}
+
+ALIGNMENT = 4096                    # 디스크 섹터/페이지 크기에 맞춘 쓰기 단위
+DEFAULT_BLOCK_SIZE = 1024 * 1024       # 벤치마크(bench_wipe.py)에서 가장 빨랐던 크기
+DEFAULT_WORKERS = 4                 # 동시에 지우는 파일 수 (너무 많으면 디스크 헤드가 왔다갔다 함)
+TIMING_BATCH_BYTES = 16 * 1024 * 1024  # 이만큼 쓸 때마다 걸린 시간을 "wipe.block_batch"에 기록
+
+
+def _write_at(fd, view, offset):
+    """offset 위치에 view를 전부 씁니다. (os.pwrite가 없는 윈도우는 lseek + write)"""
+    while view:
+        if hasattr(os, "pwrite"):
+            written = os.pwrite(fd, view, offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            written = os.write(fd, view)
+        view = view[written:]
+        offset += written
+
+
+class PatternBuffers:
+    """
+    작업 스레드마다 하나씩 미리 만들어 두고 재사용하는 덮어쓰기 버퍼.
+    난수 버퍼는 회차마다 한 번 새로 채웁니다. (블록마다 새로 만들지 않아 빠름)
+    """
+
+    def __init__(self, block_size):
+        self.block_size = block_size
+        self._fixed = {"zero": bytes(block_size), "ones": b"\xff" * block_size}
+        self._random = bytearray(block_size)
+
+    def for_pass(self, pattern):
+        if pattern == "random":
+            self._random[:] = os.urandom(self.block_size)
+            return memoryview(self._random)
+        return memoryview(self._fixed[pattern])
+
+
+class FileProgress:
+    """파일 하나의 진행 상황"""
+
+    def __init__(self, path, size, passes):
+        self.path = path
+        self.size = size
+        self.total = size * passes  # 모든 회차를 합친 쓰기 바이트
+        self.written = 0
+        self.status = "pending"     # pending / running / done / cancelled / error
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def mb_per_sec(self):
+        return self.written / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def snapshot(self):
+        return {"path": self.path, "size": self.size, "written": self.written, "total": self.total,
+                "status": self.status, "error": self.error, "mb_per_sec": round(self.mb_per_sec, 1)}
+
+
+class WipeJob:
+    """
+    파일/폴더 여러 개를 안전하게 삭제하는 작업.
+    파일은 정해진 개수의 스레드로 동시에 지우고, 진행률은 파일별/전체로 집계합니다.
+    """
+
+    def __init__(self, targets, scheme="zero", block_size=DEFAULT_BLOCK_SIZE, workers=DEFAULT_WORKERS):
+        if scheme not in WIPE_SCHEMES:
+            raise ValueError(f"알 수 없는 삭제 방식: {scheme}")
+        self.passes = WIPE_SCHEMES[scheme]
+        self.block_size = max(ALIGNMENT, block_size // ALIGNMENT * ALIGNMENT)
+        self.workers = workers
+        self.files = []  # FileProgress 목록
+        self.dirs = []   # 파일을 다 지운 뒤 지울 폴더 (안쪽부터)
+        self.links = []  # 심볼릭 링크는 따라가지 않고 링크만 지움
+        self._collect(targets)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started = None
+        self.finished = None
+
+    def _collect(self, targets):
+        passes = len(self.passes)
+        for target in targets:
+            if os.path.islink(target):
+                self.links.append(target)
+            elif os.path.isdir(target):
+                for folder, dirnames, filenames in os.walk(target, topdown=False):
+                    for name in filenames:
+                        path = os.path.join(folder, name)
+                        if os.path.islink(path):
+                            self.links.append(path)
+                        else:
+                            self._add_file(path, passes)
+                    for name in dirnames:
+                        if os.path.islink(os.path.join(folder, name)):
+                            self.links.append(os.path.join(folder, name))
+                    self.dirs.append(folder)
+            elif os.path.isfile(target):
+                self._add_file(target, passes)
+
+    def _add_file(self, path, passes):
+        try:
+            self.files.append(FileProgress(path, os.path.getsize(path), passes))
+        except OSError as e:
+            progress = FileProgress(path, 0, passes)
+            progress.status, progress.error = "error", str(e)
+            self.files.append(progress)
+
+    # --- 집계 ---
+
+    @property
+    def total_bytes(self):
+        return sum(f.total for f in self.files)
+
+    @property
+    def written_bytes(self):
+        return sum(f.written for f in self.files)
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def snapshot(self):
+        """전체 진행 상황 (UI 표시용)"""
+        written, total = self.written_bytes, self.total_bytes
+        statuses = [f.status for f in self.files]
+        return {
+            "files": len(self.files), "done": statuses.count("done"), "failed": statuses.count("error"),
+            "cancelled": statuses.count("cancelled"), "written": written, "total": total,
+            "progress": written / total if total else 1.0, "elapsed": round(self.elapsed, 3),
+            "mb_per_sec": round(written / (1024 * 1024) / self.elapsed, 1) if self.elapsed > 0 else 0.0,
+            "running": [f.snapshot() for f in self.files if f.status == "running"],
+        }
+
+    # --- 실행 ---
+
+    def run(self, cancel_event=None, on_progress=None, progress_interval=0.2):
+        """
+        모든 대상을 지웁니다. (현재 스레드에서 끝날 때까지 기다림)
+        on_progress(snapshot)는 작업 스레드에서 progress_interval초마다 호출됩니다.
+        """
+        cancel_event = cancel_event or threading.Event()
+        self.started = time.perf_counter()
+        self._last_report = 0.0
+        self._on_progress = on_progress
+        self._progress_interval = progress_interval
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="wipe") as pool:
+                list(pool.map(lambda f: self._wipe_file(f, cancel_event), self.files))
+            if not cancel_event.is_set():
+                self._remove_links_and_dirs()
+        finally:
+            self.finished = time.perf_counter()
+        if on_progress:
+            on_progress(self.snapshot())
+        return self.snapshot()
+
+    def _buffers(self):
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = PatternBuffers(self.block_size)
+        return buffers
+
+    def _wipe_file(self, progress, cancel_event):
+        if progress.status == "error":
+            return
+        if cancel_event.is_set():
+            progress.status = "cancelled"
+            return
+        progress.status = "running"
+        progress.started = time.perf_counter()
+        try:
+            self._overwrite(progress, cancel_event)
+            if cancel_event.is_set():
+                progress.status = "cancelled" # 덮어쓰다 만 파일은 지우지 않고 남겨 둠
+            else:
+                self._remove(progress.path)
+                progress.status = "done"
+        except OSError as e:
+            progress.status = "error"
+            progress.error = str(e)
+        finally:
+            progress.finished = time.perf_counter()
+            self._report()
+
+    def _overwrite(self, progress, cancel_event):
+        path, size = progress.path, progress.size
+        if not os.access(path, os.W_OK):
+            os.chmod(path, stat.S_IWRITE | stat.S_IREAD) # 읽기 전용 파일
+        buffers = self._buffers()
+        fd = os.open(path, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+        try:
+            for pattern in self.passes:
+                view = buffers.for_pass(pattern)
+                batch_started, batch_bytes = time.perf_counter(), 0
+                for offset in range(0, size, self.block_size):
+                    if cancel_event.is_set():
+                        return
+                    length = min(self.block_size, size - offset)
+                    _write_at(fd, view[:length], offset)
+                    progress.written += length
+                    batch_bytes += length
+                    if batch_bytes >= TIMING_BATCH_BYTES:
+                        now = time.perf_counter()
+                        TELEMETRY.observe("wipe.block_batch", (now - batch_started) * 1000)
+                        batch_started, batch_bytes = now, 0
+                    self._report()
+                with TELEMETRY.span("wipe.fsync", path=path):
+                    os.fsync(fd) # 회차마다 실제 디스크에 기록되도록
+            TELEMETRY.count("wipe.bytes", progress.written)
+            os.ftruncate(fd, 0)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _remove(self, path):
+        # 파일 이름도 흔적이 남지 않도록 무작위 이름으로 바꾼 뒤 삭제
+        renamed = os.path.join(os.path.dirname(path), uuid.uuid4().hex)
+        os.replace(path, renamed)
+        os.remove(renamed)
+
+    def _remove_links_and_dirs(self):
+        for link in self.links:
+            try:
+                os.remove(link)
+            except OSError as e:
+                print(f"링크 삭제 오류: {e}")
+                TELEMETRY.event("wipe.remove_error", path=link, error=str(e))
+        for folder in self.dirs:
+            try:
+                os.rmdir(folder)
+            except OSError as e:
+                print(f"폴더 삭제 오류: {e}")
+                TELEMETRY.event("wipe.remove_error", path=folder, error=str(e))
+
+    def _report(self):
+        if self._on_progress is None:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if now - self._last_report < self._progress_interval:
+                return
+            self._last_report = now
+        self._on_progress(self.snapshot())
+
+
+# 테스트용 코드: python wipe_engine.py <파일 또는 폴더> [방식]
+if __name__ == "__main__":
+    import sys
+    job = WipeJob([sys.argv[1]], scheme=sys.argv[2] if len(sys.argv) > 2 else "zero")
+    print(job.run(on_progress=lambda s: print(f"{s['progress']:.0%}  {s['mb_per_sec']}MB/s")))